@@ -1,4 +1,7 @@
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+import hmac
+import threading
 import time
 import sys
 import os
@@ -8,15 +11,37 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
+# 첫 화면 경로의 import 시간 측정 (openai 등 무거운 의존성은 첫 조사 때 로드)
+_imports_started = time.perf_counter()
 try:
     from game_logic import TurtleSoupGame
     from episodes import EPISODE_TITLES, EPISODES
-    from config import GAME_TITLE, GAME_DESCRIPTION, API_KEY_VALID, API_KEY_ERROR
+    from config import GAME_TITLE, GAME_DESCRIPTION, STREAM_RESPONSES, OPENAI_WARMUP_ON_START, METRICS_PORT, ADMIN_TOKEN
+    from config import MAX_BATCH_QUESTIONS, CHAT_HISTORY_PAGE_SIZE
+    from episodes import get_prompt_token_report
+    from metrics import (
+        metrics, start_metrics_server, LLM_REQUEST_SECONDS, LLM_TOKENS, LLM_COST_USD,
+        CLUE_MATCH_SECONDS, PAGE_RENDER_SECONDS, VERDICT_CACHE_LOOKUPS, MODEL_CASCADE_ROUTES,
+        SESSION_RESUME_SECONDS, STARTUP_SECONDS, COALESCED_REQUESTS, PREWARM_RUNS, FIRST_LLM_CALL_SECONDS,
+        UPSTREAM_QUEUE_WAIT_SECONDS,
+        cascade_hit_rates, prewarm_connection_gap, record_startup_phase, startup_report,
+    )
+    from prompts import split_inputs
+    from chat_history import ChatHistory, transcript_archive
+    from session_memory import session_memory, peak_rss_bytes
+    from session_store import session_store, new_session_token, is_valid_token
+    from verdict_cache import verdict_cache
+    from single_flight import request_coalescer
+    from prewarm import episode_prewarmer
+    from upstream_scheduler import upstream_scheduler
+    from llm_backends import get_llm_backend
+    from llm_client import get_llm_health
     from security import check_api_security, security_manager
 except ImportError as e:
     st.error(f"모듈을 불러올 수 없습니다: {e}")
     st.error("파일 구조를 확인해주세요.")
     st.stop()
+record_startup_phase("imports", time.perf_counter() - _imports_started)
 
 # 페이지 설정
 st.set_page_config(
@@ -26,12 +51,403 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner=False)
+def init_llm_backend():
+    """프로세스당 한 번 공유 백엔드를 만들고 백그라운드에서 연결을 미리 연다"""
+    backend = get_llm_backend()
+    if backend.availability()[0] and OPENAI_WARMUP_ON_START:
+        threading.Thread(target=backend.warm_up, name="llm-warmup", daemon=True).start()
+    return backend
+
+@st.cache_resource(show_spinner=False)
+def init_metrics_exporter():
+    """METRICS_PORT가 설정된 경우 프로세스당 한 번 /metrics 엔드포인트 실행"""
+    if METRICS_PORT:
+        return start_metrics_server(METRICS_PORT)
+    return None
+
+def is_admin_request():
+    """?admin=<ADMIN_TOKEN> 으로 접근한 경우에만 관리자 페이지 표시"""
+    token = st.query_params.get("admin")
+    return bool(ADMIN_TOKEN and token and hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")))
+
+def render_admin_page(session_id):
+    """숨겨진 관리자 페이지 - 지연 시간/토큰/비용/캐시 지표"""
+    st.title("🛠️ 관리자 - 성능 지표")
+
+    st.subheader("⏱️ AI 호출 지연 시간 (초)")
+    st.dataframe(LLM_REQUEST_SECONDS.summary())
+
+    st.subheader("🪙 토큰 사용량")
+    st.dataframe(LLM_TOKENS.summary())
+
+    st.subheader("💵 추정 비용 (USD)")
+    cost_rows = LLM_COST_USD.summary()
+    st.metric("누적 추정 비용", f"${sum(row['value'] for row in cost_rows):.4f}")
+    st.dataframe(cost_rows)
+
+    st.subheader("🪜 모델 캐스케이드")
+    hit_rates = cascade_hit_rates()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        rate = hit_rates["small_tier_hit_rate"]
+        st.metric("작은 모델 확정 비율", "-" if rate is None else f"{rate:.0%}")
+    with col2:
+        share = hit_rates["small_tier_share"]
+        st.metric("전체 중 작은 모델 처리", "-" if share is None else f"{share:.0%}")
+    with col3:
+        share = hit_rates["local_share"]
+        st.metric("AI 호출 없이 로컬 판정", "-" if share is None else f"{share:.0%}")
+    st.dataframe(MODEL_CASCADE_ROUTES.summary())
+
+    st.subheader("🗄️ 판정 캐시")
+    st.json(verdict_cache.get_stats())
+    st.dataframe(VERDICT_CACHE_LOOKUPS.summary())
+
+    st.subheader("🔗 동일 요청 병합")
+    st.json(request_coalescer.get_stats())
+    st.dataframe(COALESCED_REQUESTS.summary())
+
+    st.subheader("🚦 AI 호출 대기열")
+    queue_stats = upstream_scheduler.get_stats()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("진행 중인 호출", f"{queue_stats['in_flight']}/{queue_stats['max_concurrent']}")
+    with col2:
+        st.metric("대기 중인 요청", f"{queue_stats['queue_depth']}개 ({queue_stats['waiting_sessions']}세션)")
+    with col3:
+        budget = queue_stats["tokens_per_minute"]
+        st.metric("최근 1분 토큰 (추정)", f"{queue_stats['tokens_last_minute']:,}" + (f" / {budget:,}" if budget else ""))
+    st.json(queue_stats)
+    st.dataframe(UPSTREAM_QUEUE_WAIT_SECONDS.summary())
+
+    st.subheader("🔥 에피소드 연결 사전 준비")
+    gap = prewarm_connection_gap()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        difference = gap["gap_seconds"]
+        st.metric("첫 AI 호출 평균 차이 (참고치)", "-" if difference is None else f"{difference * 1000:.0f} ms")
+    with col2:
+        mean = gap["warm_mean_seconds"]
+        st.metric("연결 준비된 첫 AI 호출", "-" if mean is None else f"{mean:.2f}초")
+    with col3:
+        mean = gap["cold_mean_seconds"]
+        st.metric("연결 준비 안 된 첫 AI 호출", "-" if mean is None else f"{mean:.2f}초")
+    st.caption("연결(DNS/TLS)만 미리 열고 프롬프트 캐시는 채우지 않습니다. 차이는 질문 구성이 다른 게임끼리의 비교입니다.")
+    st.json(episode_prewarmer.get_stats())
+    st.dataframe(PREWARM_RUNS.summary())
+    st.dataframe(FIRST_LLM_CALL_SECONDS.summary())
+
+    st.subheader("🔍 단서 판정 / 페이지 렌더 (초)")
+    st.dataframe(CLUE_MATCH_SECONDS.summary())
+    st.dataframe(PAGE_RENDER_SECONDS.summary())
+
+    st.subheader("📏 에피소드별 프롬프트 토큰")
+    st.dataframe(get_prompt_token_report())
+
+    st.subheader("🧠 세션 메모리")
+    memory_rows = session_memory.report()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("활성 세션", f"{len(memory_rows)}개")
+    with col2:
+        total_bytes = sum(row["total_bytes"] for row in memory_rows)
+        average_kb = total_bytes / len(memory_rows) / 1024 if memory_rows else 0
+        st.metric("세션당 평균", f"{average_kb:.1f} KB")
+    with col3:
+        peak_rss = peak_rss_bytes()
+        st.metric("프로세스 최대 RSS", f"{peak_rss / 1024 / 1024:.1f} MB" if peak_rss is not None else "측정 불가")
+    st.dataframe(memory_rows)
+
+    st.subheader("🔒 요청 제한")
+    st.write(f"추적 중인 세션: {security_manager.session_count()}개")
+    st.json(security_manager.get_session_stats(session_id))
+
+    st.subheader("🚀 프로세스 시작 시간 (초)")
+    st.dataframe(startup_report())
+    st.dataframe(STARTUP_SECONDS.summary())
+
+    with st.expander("Prometheus 텍스트"):
+        st.code(metrics.render(), language="text")
+
+def reset_chat_view():
+    """대화 기록 페이지를 최신 대화 기준으로 초기화"""
+    st.session_state.chat_visible_count = CHAT_HISTORY_PAGE_SIZE
+
+def rerun_play_area():
+    """플레이 영역 프래그먼트만 다시 실행 (전체 실행 중에 호출되면 전체 새로고침)"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+def resume_or_start_session():
+    """?session=<토큰>에 저장된 게임이 있으면 복원하고, 없으면 새 토큰으로 시작"""
+    started = time.perf_counter()
+    game = TurtleSoupGame()
+    token = st.query_params.get("session")
+    state = session_store.load(token) if session_store is not None and is_valid_token(token) else None
+    if state is not None and game.restore_state(state):
+        outcome = "restored"
+        if transcript_archive is not None:
+            history = ChatHistory.restore(transcript_archive, token)
+        else:
+            history = ChatHistory(transcript_id=token)
+    else:
+        outcome = "new"
+        token = new_session_token()
+        history = ChatHistory(transcript_archive, transcript_id=token)
+    
+    st.session_state.session_token = token
+    st.session_state.game = game
+    st.session_state.chat_history = history
+    st.session_state.saved_game_state = game.to_state() if outcome == "restored" else None
+    # 요청 제한도 토큰 기준으로 이어서 집계 (재접속으로 세션 한도가 초기화되지 않도록)
+    st.session_state.session_id = f"user_{token}"
+    st.query_params["session"] = token
+    SESSION_RESUME_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+
+def save_session():
+    """게임 상태가 바뀐 경우에만 저장 (대화는 ChatHistory가 메시지마다 기록)"""
+    if session_store is None:
+        return
+    state = st.session_state.game.to_state()
+    if state != st.session_state.get("saved_game_state"):
+        session_store.save(st.session_state.session_token, state)
+        st.session_state.saved_game_state = state
+
+def show_queue_position(placeholder):
+    """AI 호출 차례를 기다리는 동안 대기 순번을 placeholder에 표시 (with 블록 안의 조사에 적용)"""
+    return upstream_scheduler.position_listener(
+        lambda position: placeholder.info(f"⏳ 이용자가 많아 AI 응답 차례를 기다리고 있습니다. (대기 {position}번째)")
+    )
+
+def finish_turn(found_before):
+    """조사 처리 후 새로고침 - 단서 상태가 바뀐 경우에만 전체 페이지, 그 외에는 플레이 영역만"""
+    save_session()
+    game = st.session_state.game
+    if len(game.found_clues) != found_before or game.game_state != "playing":
+        st.rerun()
+    rerun_play_area()
+
+@st.fragment
+def render_sidebar_progress():
+    """사이드바 진행 상황 (단서 상태가 바뀔 때만 다시 그림)"""
+    episode_info = st.session_state.game.get_current_episode_info()
+    if episode_info:
+        st.subheader(f"📖 {episode_info['title']}")
+        st.write(f"**질문:** {episode_info['question']}")
+    
+    # 진행 상황
+    progress = st.session_state.game.get_game_progress()
+    if progress:
+        st.subheader("📊 진행 상황")
+        st.progress(progress['progress_percentage'] / 100)
+        st.write(f"단서: {progress['found_clues']}/{progress['total_clues']}")
+        
+        # 디버깅 정보 (개발 중에만 표시)
+        st.info(f"진행률: {progress['progress_percentage']:.1f}%")
+        
+        if progress['found_clues_list']:
+            st.write("**발견된 단서:**")
+            for clue in progress['found_clues_list']:
+                st.write(f"✅ {clue}")
+        
+        if progress['remaining_clues']:
+            st.write("**남은 단서:**")
+            for clue in progress['remaining_clues']:
+                st.write(f"❓ ")
+    
+    # 게임 리셋
+    if st.button("🔄 새 게임"):
+        st.session_state.game.reset_game()
+        st.session_state.chat_history.clear()
+        save_session()
+        reset_chat_view()
+        st.rerun()
+
+def render_chat_history():
+    """최근 대화만 표시하고 이전 대화는 요청할 때 페이지 단위로 표시"""
+    history = st.session_state.chat_history
+    visible_count = st.session_state.get("chat_visible_count", CHAT_HISTORY_PAGE_SIZE)
+    # 보관소 없이 메모리에서 밀려난 대화는 읽을 수 없으므로 세지 않음
+    hidden_count = max(0, history.loadable_count - visible_count)
+    if hidden_count:
+        if st.button(f"⬆️ 이전 대화 더 보기 ({hidden_count}개)", key="load_older_btn"):
+            st.session_state.chat_visible_count = visible_count + CHAT_HISTORY_PAGE_SIZE
+            rerun_play_area()
+    
+    # 메모리에서 밀려난 이전 대화는 보관소에서 읽어옴
+    for message in history.recent(visible_count):
+        if message.role == 'user':
+            st.chat_message("user").write(message.content)
+        else:
+            st.chat_message("assistant").write(message.content)
+
+@st.fragment
+def render_play_area(session_id):
+    """게임 진행 화면 - 조사/힌트/대화 페이지 이동은 이 영역만 다시 실행"""
+    render_started = time.perf_counter()
+    try:
+        _render_play_area(session_id)
+    finally:
+        PAGE_RENDER_SECONDS.observe(time.perf_counter() - render_started, state="play_fragment")
+
+def _render_play_area(session_id):
+    found_before = len(st.session_state.game.found_clues)
+    
+    # 게임 인터페이스 - 세로 배치
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # 에피소드 정보
+        episode_info = st.session_state.game.get_current_episode_info()
+        if episode_info:
+            st.subheader(f"📖 {episode_info['title']}")
+            st.write(f"**사건:** {episode_info['question']}")
+            st.divider()
+        
+        # 진행 상황
+        progress = st.session_state.game.get_game_progress()
+        if progress:
+            st.metric(
+                label="진행률",
+                value=f"{progress['found_clues']}/{progress['total_clues']}",
+                delta=f"{progress['progress_percentage']:.1f}%"
+            )
+            
+            # 디버깅: 조사 횟수 표시
+            question_count = getattr(st.session_state.game, 'question_count', 0)
+            st.info(f"🔍 조사 횟수: {question_count}회")
+            
+            if progress['found_clues_list']:
+                st.write("**발견된 단서:**")
+                for clue in progress['found_clues_list']:
+                    st.success(f"✅ {clue}")
+        
+        st.divider()
+        
+        # 채팅 히스토리 표시 (넓은 영역, 최근 대화만)
+        st.subheader("💬 대화 기록")
+        chat_container = st.container()
+        with chat_container:
+            render_chat_history()
+    
+    with col2:
+        # 게임 정보 표시 (토글)
+        if st.session_state.get('show_game_info', False):
+            with st.expander("📖 게임 정보", expanded=True):
+                episode_info = st.session_state.game.get_current_episode_info()
+                if episode_info:
+                    st.write(f"**에피소드:** {episode_info['title']}")
+                    st.write(f"**사건:** {episode_info['question']}")
+                    
+                    # 정답 미리보기 (게임 완료 시에만)
+                    if st.session_state.game.game_state == "finished":
+                        st.write(f"**정답:** {st.session_state.game.current_episode.answer}")
+                    else:
+                        st.write("**정답:** 게임 완료 후 확인 가능")
+                
+                st.divider()
+                
+                # 게임 방법 안내
+                st.write("**🎮 게임 방법:**")
+                st.write("1. **조사하기**: 질문이나 단서를 입력")
+                st.write("2. **질문 예시**: '남자는 왜 죽었을까요?'")
+                st.write("3. **단서 예시**: '금붕어가 물을 마셨다'")
+                st.write("4. **목표**: 모든 단서를 찾아 정답 도출")
+                
+                st.divider()
+                
+                # AI 응답 가이드
+                st.write("**🤖 AI 응답 가이드:**")
+                st.write("• **네.** - 맞는 방향")
+                st.write("• **네, 아주 중요한 질문입니다.** - 핵심 단서 발견")
+                st.write("• **아니오.** - 틀린 방향")
+                st.write("• **아니오. 중요하지 않습니다.** - 관련 없음")
+                st.write("• **예, 아니오로 대답할 수 없는 질문입니다.** - 재질문 필요")
+    
+    # 조사하기 섹션 - 전체 너비로 배치
+    st.subheader("🔍 조사하기")
+    
+    st.write("질문을 통해 사건을 조사하거나, 단서를 찾아보세요!")
+    st.info("💡 **팁**: '남성은 공포를 느꼈나요?' 같은 질문이나 '길을 잃었기 때문에 소원을 빌었다' 같은 단서를 입력해보세요!")
+    st.caption(f"여러 질문은 '?' 또는 ';'로 구분해 한 번에 {MAX_BATCH_QUESTIONS}개까지 입력할 수 있습니다. (질문마다 요청 1회로 집계)")
+    
+    investigation_input = st.text_input("조사 내용을 입력하세요:", key="investigation_input", placeholder="질문을 통해 정보를 수집하고, 단서를 찾아보세요!", max_chars=30 * MAX_BATCH_QUESTIONS)
+    
+    col1_btn, col2_btn, col3_btn = st.columns([1, 1, 1])
+    with col1_btn:
+        if st.button("🔍 조사하기", key="investigate_btn", type="primary"):
+            questions = split_inputs(investigation_input)[:MAX_BATCH_QUESTIONS]
+            if len(questions) > 1:
+                # 여러 질문은 AI 호출 1회로 판정 (조사 횟수는 investigate_batch가 항목별로 증가)
+                queue_notice = st.empty()
+                with st.spinner(f"질문 {len(questions)}개를 조사하고 있습니다..."), show_queue_position(queue_notice):
+                    ai_responses = st.session_state.game.investigate_batch(questions, session_id)
+                queue_notice.empty()
+                
+                # 질문별로 대화 기록에 추가 (공통 오류는 첫 질문에만 표시)
+                for question, ai_response in zip(questions, ai_responses):
+                    st.session_state.chat_history.append("user", f"🔍 {question}")
+                    st.session_state.chat_history.append("assistant", ai_response)
+                finish_turn(found_before)
+            elif investigation_input.strip():
+                # 사용자 메시지 추가
+                st.session_state.chat_history.append("user", f"🔍 {investigation_input}")
+                
+                # AI 응답 생성 (통합 프롬프트)
+                if STREAM_RESPONSES:
+                    # 응답을 생성되는 대로 대화 기록 영역에 표시
+                    with chat_container:
+                        st.chat_message("user").write(f"🔍 {investigation_input}")
+                        with st.chat_message("assistant"):
+                            queue_notice = st.empty()
+                            with show_queue_position(queue_notice):
+                                ai_response = st.write_stream(
+                                    st.session_state.game.investigate_stream(investigation_input, session_id)
+                                )
+                            queue_notice.empty()
+                else:
+                    queue_notice = st.empty()
+                    with st.spinner("사건을 조사하고 있습니다..."), show_queue_position(queue_notice):
+                        # 통합 조사 메서드 호출
+                        ai_response = st.session_state.game.investigate(investigation_input, session_id)
+                    queue_notice.empty()
+                
+                # AI 응답 추가
+                st.session_state.chat_history.append("assistant", ai_response)
+                
+                # 단서를 찾은 경우에만 사이드바 진행상황까지 새로고침
+                finish_turn(found_before)
+    
+    with col2_btn:
+        if st.button("💰 유료 힌트", key="paid_hint_btn", type="secondary"):
+            # 유료 힌트 제공
+            hint_response = st.session_state.game.get_paid_hint()
+            
+            # 힌트 응답 추가
+            st.session_state.chat_history.append("assistant", hint_response)
+            save_session()
+            
+            # 모든 유료 힌트 사용 완료 시 토스트 메시지
+            if "모든 유료 힌트를 사용했습니다" in hint_response:
+                st.warning("모든 유료 힌트를 사용했습니다")
+            
+            rerun_play_area()
+    
+    with col3_btn:
+        if st.button("🗑️ 대화 초기화", key="clear_btn"):
+            st.session_state.chat_history.clear()
+            reset_chat_view()
+            rerun_play_area()
+
 # 세션 상태 초기화
 try:
-    if 'game' not in st.session_state:
-        st.session_state.game = TurtleSoupGame()
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    if 'game' not in st.session_state or 'chat_history' not in st.session_state:
+        resume_or_start_session()
+    if 'chat_visible_count' not in st.session_state:
+        reset_chat_view()
 except Exception as e:
     st.error(f"게임 초기화 중 오류가 발생했습니다: {e}")
     st.error("페이지를 새로고침하거나 다시 시작해주세요.")
@@ -39,16 +455,19 @@ except Exception as e:
 
 def main():
     try:
-        # API 키 상태 확인
-        if not API_KEY_VALID:
+        # API 키 상태 확인 (스텁 백엔드는 키 없이 동작)
+        is_available, backend_error = get_llm_backend().availability()
+        if not is_available:
             st.error("🚫 API 키 설정 오류")
-            st.error(API_KEY_ERROR)
+            st.error(backend_error)
             st.info("💡 해결 방법:")
             st.info("1. 프로젝트 루트에 .env 파일을 생성하세요")
             st.info("2. .env 파일에 OPENAI_API_KEY=sk-your_key_here를 추가하세요")
             st.info("3. Streamlit Cloud에서는 환경 변수로 STREAMLIT_OPENAI_API_KEY를 설정하세요")
             st.info("4. 앱을 다시 시작하세요")
             st.stop()
+        
+        init_metrics_exporter()
     except Exception as e:
         st.error(f"설정 확인 중 오류가 발생했습니다: {e}")
         st.info("페이지를 새로고침하거나 다시 시작해주세요.")
@@ -56,11 +475,24 @@ def main():
     
     # 보안 검증
     session_id = check_api_security()
+    session_memory.track(session_id, st.session_state.game, st.session_state.chat_history)
+    
+    if is_admin_request():
+        render_admin_page(session_id)
+        return
     
     # 헤더
     st.title("🐢 " + GAME_TITLE)
     st.markdown(f"*{GAME_DESCRIPTION}*")
     
+    # AI 서비스 장애 배너
+    llm_health = get_llm_health()
+    if llm_health["state"] != "closed":
+        st.warning(
+            f"⚠️ AI 서비스 응답이 불안정하여 일시적으로 요청을 제한하고 있습니다. "
+            f"약 {llm_health['retry_in_seconds']:.0f}초 후 다시 시도해주세요."
+        )
+    
     # 사이드바
     with st.sidebar:
         st.header("🎮 게임 메뉴")
@@ -75,44 +507,16 @@ def main():
             
             if selected_episode != "에피소드를 선택하세요":
                 if st.button("게임 시작"):
-                    st.session_state.game.select_episode(selected_episode)
-                    st.session_state.chat_history = []
+                    # 사전 준비는 백그라운드로 시작하므로 다시 그리기를 막지 않음
+                    st.session_state.game.select_episode(selected_episode, session_id)
+                    st.session_state.chat_history.clear()
+                    save_session()
+                    reset_chat_view()
                     st.rerun()
         
         # 게임 진행 중일 때
         elif st.session_state.game.game_state == "playing":
-            episode_info = st.session_state.game.get_current_episode_info()
-            if episode_info:
-                st.subheader(f"📖 {episode_info['title']}")
-                st.write(f"**질문:** {episode_info['question']}")
-            
-            # 진행 상황
-            progress = st.session_state.game.get_game_progress()
-            if progress:
-                st.subheader("📊 진행 상황")
-                st.progress(progress['progress_percentage'] / 100)
-                st.write(f"단서: {progress['found_clues']}/{progress['total_clues']}")
-                
-                # 디버깅 정보 (개발 중에만 표시)
-                st.info(f"진행률: {progress['progress_percentage']:.1f}%")
-                
-                if progress['found_clues_list']:
-                    st.write("**발견된 단서:**")
-                    for clue in progress['found_clues_list']:
-                        st.write(f"✅ {clue}")
-                
-                if progress['remaining_clues']:
-                    st.write("**남은 단서:**")
-                    for clue in progress['remaining_clues']:
-                        st.write(f"❓ ")
-            
-            # 게임 리셋
-            if st.button("🔄 새 게임"):
-                st.session_state.game.reset_game()
-                st.session_state.chat_history = []
-                st.rerun()
-        
-        # 게임 완료 시
+            render_sidebar_progress()
         elif st.session_state.game.game_state == "finished":
             st.subheader("🎉 게임 완료!")
             st.success("모든 단서를 찾았습니다!")
@@ -124,7 +528,9 @@ def main():
             
             if st.button("🔄 새 게임"):
                 st.session_state.game.reset_game()
-                st.session_state.chat_history = []
+                st.session_state.chat_history.clear()
+                save_session()
+                reset_chat_view()
                 st.rerun()
         
         # 보안 정보 (간소화)
@@ -145,163 +551,14 @@ def main():
         
         # 에피소드 미리보기
         st.subheader("📚 에피소드 미리보기")
-        for i, title in enumerate(EPISODE_TITLES):
-            with st.expander(f"📖 {title}"):
-                # 에피소드 정보 찾기
-                for episode in EPISODES:
-                    if episode.title == title:
-                        st.write(f"**질문:** {episode.question}")
-                        st.write(f"**단서 개수:** {len(episode.clues)}개")
-                        break
+        for episode in EPISODES:
+            with st.expander(f"📖 {episode.title}"):
+                # 메타데이터만 사용 (본문은 게임 시작 시 로드)
+                st.write(f"**질문:** {episode.question}")
+                st.write(f"**단서 개수:** {episode.clue_count}개")
     
     elif st.session_state.game.game_state == "playing":
-        # 게임 인터페이스 - 세로 배치
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # 에피소드 정보
-            episode_info = st.session_state.game.get_current_episode_info()
-            if episode_info:
-                st.subheader(f"📖 {episode_info['title']}")
-                st.write(f"**사건:** {episode_info['question']}")
-                st.divider()
-            
-            # 진행 상황
-            progress = st.session_state.game.get_game_progress()
-            if progress:
-                st.metric(
-                    label="진행률",
-                    value=f"{progress['found_clues']}/{progress['total_clues']}",
-                    delta=f"{progress['progress_percentage']:.1f}%"
-                )
-                
-                # 디버깅: 조사 횟수 표시
-                question_count = getattr(st.session_state.game, 'question_count', 0)
-                st.info(f"🔍 조사 횟수: {question_count}회")
-                
-                if progress['found_clues_list']:
-                    st.write("**발견된 단서:**")
-                    for clue in progress['found_clues_list']:
-                        st.success(f"✅ {clue}")
-            
-            st.divider()
-            
-            # 채팅 히스토리 표시 (넓은 영역)
-            st.subheader("💬 대화 기록")
-            chat_container = st.container()
-            with chat_container:
-                for message in st.session_state.chat_history:
-                    if message['type'] == 'user':
-                        st.chat_message("user").write(message['content'])
-                    else:
-                        st.chat_message("assistant").write(message['content'])
-        
-        with col2:
-            # 게임 정보 표시 (토글)
-            if st.session_state.get('show_game_info', False):
-                with st.expander("📖 게임 정보", expanded=True):
-                    episode_info = st.session_state.game.get_current_episode_info()
-                    if episode_info:
-                        st.write(f"**에피소드:** {episode_info['title']}")
-                        st.write(f"**사건:** {episode_info['question']}")
-                        
-                        # 정답 미리보기 (게임 완료 시에만)
-                        if st.session_state.game.game_state == "finished":
-                            st.write(f"**정답:** {st.session_state.game.current_episode.answer}")
-                        else:
-                            st.write("**정답:** 게임 완료 후 확인 가능")
-                    
-                    st.divider()
-                    
-                    # 게임 방법 안내
-                    st.write("**🎮 게임 방법:**")
-                    st.write("1. **조사하기**: 질문이나 단서를 입력")
-                    st.write("2. **질문 예시**: '남자는 왜 죽었을까요?'")
-                    st.write("3. **단서 예시**: '금붕어가 물을 마셨다'")
-                    st.write("4. **목표**: 모든 단서를 찾아 정답 도출")
-                    
-                    st.divider()
-                    
-                    # AI 응답 가이드
-                    st.write("**🤖 AI 응답 가이드:**")
-                    st.write("• **네.** - 맞는 방향")
-                    st.write("• **네, 아주 중요한 질문입니다.** - 핵심 단서 발견")
-                    st.write("• **아니오.** - 틀린 방향")
-                    st.write("• **아니오. 중요하지 않습니다.** - 관련 없음")
-                    st.write("• **예, 아니오로 대답할 수 없는 질문입니다.** - 재질문 필요")
-        
-        # 조사하기 섹션 - 전체 너비로 배치
-        st.subheader("🔍 조사하기")
-        
-        st.write("질문을 통해 사건을 조사하거나, 단서를 찾아보세요!")
-        st.info("💡 **팁**: '남성은 공포를 느꼈나요?' 같은 질문이나 '길을 잃었기 때문에 소원을 빌었다' 같은 단서를 입력해보세요!")
-        
-        investigation_input = st.text_input("조사 내용을 입력하세요:", key="investigation_input", placeholder="질문을 통해 정보를 수집하고, 단서를 찾아보세요!", max_chars=30)
-        
-        col1_btn, col2_btn, col3_btn = st.columns([1, 1, 1])
-        with col1_btn:
-            if st.button("🔍 조사하기", key="investigate_btn", type="primary"):
-                if investigation_input.strip():
-                    # 사용자 메시지 추가
-                    st.session_state.chat_history.append({
-                        'type': 'user',
-                        'content': f"🔍 {investigation_input}"
-                    })
-                    
-                    # AI 응답 생성 (통합 프롬프트)
-                    with st.spinner("사건을 조사하고 있습니다..."):
-                        # 조사 횟수 증가 (안전하게 접근)
-                        if not hasattr(st.session_state.game, 'question_count'):
-                            st.session_state.game.question_count = 0
-                        st.session_state.game.question_count += 1
-                        # 통합 조사 메서드 호출
-                        ai_response = st.session_state.game.investigate(investigation_input, session_id)
-                    
-                    # AI 응답 추가
-                    st.session_state.chat_history.append({
-                        'type': 'assistant',
-                        'content': ai_response
-                    })
-                    
-                    # 단서 발견 시 즉시 페이지 새로고침하여 진행상황 업데이트
-                    if "단서를 찾았습니다!" in ai_response or "단서 발견!" in ai_response:
-                        # 발견된 단서 개수 확인
-                        progress = st.session_state.game.get_game_progress()
-                        if progress:
-                            before_count = progress['found_clues'] - 1  # 현재 추가된 단서 제외
-                            after_count = progress['found_clues']
-                            if after_count > before_count:
-                                st.success(f"🎉 {after_count - before_count}개의 단서를 발견했습니다!")
-                            else:
-                                st.success("🎉 단서를 발견했습니다!")
-                        else:
-                            st.success("🎉 단서를 발견했습니다!")
-                        st.rerun()
-                    else:
-                        st.rerun()
-        
-        with col2_btn:
-            if st.button("💰 유료 힌트", key="paid_hint_btn", type="secondary"):
-                # 유료 힌트 제공
-                hint_response = st.session_state.game.get_paid_hint()
-                
-                # 힌트 응답 추가
-                st.session_state.chat_history.append({
-                    'type': 'assistant',
-                    'content': hint_response
-                })
-                
-                # 모든 유료 힌트 사용 완료 시 토스트 메시지
-                if "모든 유료 힌트를 사용했습니다" in hint_response:
-                    st.warning("모든 유료 힌트를 사용했습니다")
-                
-                st.rerun()
-        
-        with col3_btn:
-            if st.button("🗑️ 대화 초기화", key="clear_btn"):
-                st.session_state.chat_history = []
-                st.rerun()
-    
+        render_play_area(session_id)
     elif st.session_state.game.game_state == "finished":
         st.success("🎉 축하합니다! 모든 단서를 찾았습니다!")
         
@@ -321,4 +578,14 @@ def main():
         st.info("👈 왼쪽 사이드바에서 새 게임을 시작할 수 있습니다!")
 
 if __name__ == "__main__":
-    main()
+    render_started = time.perf_counter()
+    try:
+        main()
+    finally:
+        # st.rerun()/st.stop()으로 중단된 실행도 포함해 렌더 시간 기록
+        render_seconds = time.perf_counter() - render_started
+        PAGE_RENDER_SECONDS.observe(render_seconds, state=st.session_state.game.game_state)
+        record_startup_phase("first_render", render_seconds)
+        # 첫 화면을 그린 뒤에 공유 백엔드 생성/연결 워밍업 시작 (openai 로드가 첫 화면을 막지 않도록)
+        init_llm_backend()
+        metrics.maybe_write_file()
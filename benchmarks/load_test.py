@@ -0,0 +1,328 @@
+"""다중 사용자 부하 테스트 - 여러 세션이 동시에 AppTest로 app.py를 실행 (AI 호출은 지연이 있는 스텁)
+
+세션마다 에피소드를 고르고 정해진 조사/유료 힌트 동작을 보낸다. 동작마다 재실행 시간을 재서
+p50/p95/p99, 처리량, 최대 RSS를 보고한다.
+
+사용법:
+    python benchmarks/load_test.py --sessions 200 --workers 50                 # 스레드 50개로 200세션
+    python benchmarks/load_test.py --sessions 200 --workers 25 --processes 4   # 프로세스 4개 x 스레드 25개
+    python benchmarks/load_test.py --latency-median-ms 1500 --error-rate 0.02 --output result.json
+"""
+import argparse
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 프로젝트 루트를 Python 경로에 추가하고 AI 호출은 스텁으로 고정
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("LLM_BACKEND", "stub")
+
+# 테스트 세션이 실제 게임 저장소/대화 보관소/요청 제한 저장소를 채우지 않도록 임시 경로 사용
+SCRATCH_DIR = tempfile.mkdtemp(prefix="turtle_load_test_")
+for _name, _file in (("TRANSCRIPT_DB_PATH", "transcripts.db"), ("SESSION_DB_PATH", "sessions.db"),
+                     ("RATE_LIMIT_DB_PATH", "rate_limit.db")):
+    os.environ.setdefault(_name, os.path.join(SCRATCH_DIR, _file))
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+APP_TIMEOUT_SECONDS = 120  # 재실행 1회 제한 시간 (스텁 지연 + 재시도 포함)
+
+# 조사 입력 (단서와 무관한 질문, 정답 시도가 섞이도록 - 단서 문장은 에피소드에서 뽑아 섞음)
+QUESTIONS = [
+    "남자는 조난을 당한 적이 있나요?",
+    "시간이 멈췄나요?",
+    "날씨가 맑았나요?",
+    "범인은 경찰인가요?",
+    "누군가 거짓말을 했나요?",
+    "사건은 밤에 일어났나요?",
+    "가족과 관련이 있나요?",
+    "돈 때문인가요?",
+    "거울에 비친 모습이 달랐다",
+    "그는 이미 죽어 있었다",
+]
+CLUE_INPUT_RATE = 0.1  # 조사 중 에피소드 단서 문장을 그대로 입력하는 비율
+
+ACTIONS = ("load", "select", "start", "investigate", "hint")
+
+
+def _script(rng, episode, investigations, hints):
+    """세션 1개의 동작 순서 (조사 사이사이에 같은 간격으로 유료 힌트, 힌트는 정확히 hints회)
+
+    k번째 힌트(0부터)는 round((k + 1) * investigations / (hints + 1))번째 조사 뒤에 요청한다
+    (조사 8회, 힌트 2회면 3번째와 5번째 조사 뒤). 조사보다 힌트가 많으면 같은 자리에 여러 번 요청한다.
+    """
+    hints_after = [0] * (investigations + 1)  # 조사 i회 뒤에 요청할 힌트 수
+    for k in range(hints):
+        hints_after[round((k + 1) * investigations / (hints + 1))] += 1
+    steps = [("hint", None)] * hints_after[0]
+    for i in range(1, investigations + 1):
+        if rng.random() < CLUE_INPUT_RATE:
+            steps.append(("investigate", rng.choice(episode.clues)))
+        else:
+            steps.append(("investigate", rng.choice(QUESTIONS)))
+        steps += [("hint", None)] * hints_after[i]
+    return steps
+
+
+def _classify(at):
+    """마지막 AI 응답으로 결과 분류 (요청 제한/오류 응답은 빠르게 끝나므로 따로 집계)"""
+    from game_logic import CIRCUIT_OPEN_MESSAGE, COALESCE_TIMEOUT_MESSAGE, UPSTREAM_BUSY_MESSAGE
+
+    recent = at.session_state["chat_history"].recent(1)
+    content = recent[-1].content if recent else ""
+    if content.startswith("🚫"):
+        return "rejected"
+    if content.startswith((CIRCUIT_OPEN_MESSAGE, COALESCE_TIMEOUT_MESSAGE, UPSTREAM_BUSY_MESSAGE, "AI 응답 생성 중 오류")):
+        return "error"
+    return "ok"
+
+
+def run_session(index, seed, investigations, hints, think_seconds):
+    """세션 1개 실행 후 (동작, 결과, 재실행 시간) 목록 반환"""
+    from streamlit.testing.v1 import AppTest
+    from episodes import EPISODE_TITLES, get_episode
+
+    rng = random.Random(seed * 100003 + index)
+    title = rng.choice(EPISODE_TITLES)
+    samples = []
+
+    def timed(action, run):
+        started = time.perf_counter()
+        try:
+            at = run()
+        except Exception:
+            samples.append((action, "exception", time.perf_counter() - started))
+            return None
+        elapsed = time.perf_counter() - started
+        if at.exception:
+            samples.append((action, "exception", elapsed))
+            return None
+        samples.append((action, _classify(at) if action == "investigate" else "ok", elapsed))
+        return at
+
+    at = AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT_SECONDS)
+    if timed("load", at.run) is None:
+        return samples
+    if timed("select", lambda: at.sidebar.selectbox[0].select(title).run()) is None:
+        return samples
+    if timed("start", lambda: at.sidebar.button[0].click().run()) is None:
+        return samples
+
+    for action, text in _script(rng, get_episode(title), investigations, hints):
+        if at.session_state["game"].game_state != "playing":
+            break  # 모든 단서를 찾아 게임이 끝남
+        if think_seconds:
+            time.sleep(rng.uniform(0.5, 1.5) * think_seconds)
+        if action == "investigate":
+            at.text_input(key="investigation_input").set_value(text)
+            result = timed(action, lambda: at.button(key="investigate_btn").click().run())
+        else:
+            result = timed(action, lambda: at.button(key="paid_hint_btn").click().run())
+        if result is None:
+            break
+    return samples
+
+
+def _patch_apptest_for_threads():
+    """AppTest를 한 프로세스의 여러 스레드에서 동시에 실행할 수 있도록 전역 상태 공유
+
+    - AppTest는 실행이 끝날 때마다 전역 Runtime을 지우므로, 동시에 실행 중인 다른 세션이 깨지지 않도록
+      마지막으로 본 mock Runtime을 계속 돌려준다.
+    - 실행마다 app.py를 다시 컴파일하지 않고 실제 서버처럼 컴파일 결과를 프로세스 전체에서 공유한다.
+      (Python 3.11은 여러 스레드에서 동시에 ast.parse를 하면 SystemError가 날 수 있음)
+    """
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+        if "runtime" not in last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last["runtime"]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in last)
+
+    compiled = {}
+    compile_lock = threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in compiled:
+                compiled[script_path] = get_bytecode(self, script_path)
+            return compiled[script_path]
+
+    ScriptCache.get_bytecode = shared_bytecode
+
+
+def _run_process(indices, args, queue):
+    """프로세스 1개 - 스레드 풀에서 세션 실행 후 결과를 큐로 전달"""
+    from llm_backends import StubBackend, set_llm_backend
+    from session_memory import peak_rss_bytes
+    from upstream_scheduler import upstream_scheduler
+
+    _patch_apptest_for_threads()
+    # 테스트 스레드에서 세션 상태를 읽을 때마다 나오는 "missing ScriptRunContext" 경고 숨김
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    set_llm_backend(StubBackend(
+        latency_distribution=args.latency_distribution,
+        latency_median_ms=args.latency_median_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ))
+    samples = []
+    lock = threading.Lock()
+
+    def worker(index):
+        session_samples = run_session(index, args.seed, args.investigations, args.hints, args.think_seconds)
+        with lock:
+            samples.extend(session_samples)
+
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="load-session") as pool:
+        list(pool.map(worker, indices))
+    queue.put({"samples": samples, "peak_rss_bytes": peak_rss_bytes(), "upstream": upstream_scheduler.get_stats()})
+
+
+def _percentiles(latencies):
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "count": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def run(args):
+    """부하 테스트 실행 후 결과 dict 반환"""
+    # 프로세스마다 세션을 나눠 맡김 (요청 제한 메모리 저장소는 프로세스 간 공유되지 않음)
+    indices = list(range(args.sessions))
+    shares = [indices[i::args.processes] for i in range(args.processes)]
+    queue = multiprocessing.Queue()
+    started = time.perf_counter()
+    if args.processes == 1:
+        _run_process(shares[0], args, queue)
+        results = [queue.get()]
+    else:
+        workers = [
+            multiprocessing.Process(target=_run_process, args=(share, args, queue))
+            for share in shares if share
+        ]
+        for worker in workers:
+            worker.start()
+        results = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    elapsed = time.perf_counter() - started
+
+    samples = [sample for result in results for sample in result["samples"]]
+    outcomes = {}
+    for action, outcome, _ in samples:
+        outcomes.setdefault(action, {}).setdefault(outcome, 0)
+        outcomes[action][outcome] += 1
+    latency = {"all": _percentiles([seconds for _, _, seconds in samples])}
+    for action in ACTIONS:
+        action_latencies = [seconds for name, _, seconds in samples if name == action]
+        if action_latencies:
+            latency[action] = _percentiles(action_latencies)
+    investigations = sum(1 for action, outcome, _ in samples if action == "investigate" and outcome == "ok")
+    # 최대 RSS를 측정할 수 없는 플랫폼(Windows)이면 None
+    peak_rss = [result["peak_rss_bytes"] for result in results if result["peak_rss_bytes"] is not None]
+
+    return {
+        "sessions": args.sessions,
+        "processes": args.processes,
+        "workers_per_process": args.workers,
+        "elapsed_seconds": elapsed,
+        "reruns": len(samples),
+        "reruns_per_second": len(samples) / elapsed,
+        "investigations_per_second": investigations / elapsed,
+        "latency": latency,
+        "outcomes": outcomes,
+        "peak_rss_bytes_max": max(peak_rss) if peak_rss else None,
+        "peak_rss_bytes_total": sum(peak_rss) if peak_rss else None,
+        "upstream_queue": [result["upstream"] for result in results],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50, help="동시 세션 수")
+    parser.add_argument("--workers", type=int, default=50, help="프로세스당 스레드 수")
+    parser.add_argument("--processes", type=int, default=1, help="프로세스 수 (세션을 나눠 실행)")
+    parser.add_argument("--investigations", type=int, default=8, help="세션당 조사 횟수")
+    parser.add_argument("--hints", type=int, default=2, help="세션당 유료 힌트 횟수")
+    parser.add_argument("--think-seconds", type=float, default=0.0, help="동작 사이 평균 대기 시간")
+    parser.add_argument("--latency-distribution", default="lognormal", choices=("lognormal", "uniform", "fixed"))
+    parser.add_argument("--latency-median-ms", type=float, default=800.0, help="스텁 AI 응답 지연 중앙값")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="스텁 AI 일시적 오류 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate-limit-backend", choices=("memory", "sqlite"),
+                        help="요청 제한 저장소 (여러 프로세스가 한도를 공유하려면 sqlite)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/load-<시각>.json)")
+    args = parser.parse_args()
+    if args.rate_limit_backend:
+        os.environ["RATE_LIMIT_BACKEND"] = args.rate_limit_backend  # 프로젝트 모듈은 이후에 import
+
+    try:
+        result = run(args)
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+    for action, stats in result["latency"].items():
+        print(f"{action:<12} {stats['count']:>6}회  p50 {stats['p50_ms']:>9.1f}ms  p95 {stats['p95_ms']:>9.1f}ms  "
+              f"p99 {stats['p99_ms']:>9.1f}ms  max {stats['max_ms']:>9.1f}ms")
+    print(f"처리량: 재실행 {result['reruns_per_second']:.1f}회/s, 조사 {result['investigations_per_second']:.1f}회/s "
+          f"({result['elapsed_seconds']:.1f}초)")
+    if result["peak_rss_bytes_max"] is not None:
+        print(f"최대 RSS: {result['peak_rss_bytes_max'] / 1024 / 1024:.1f} MB (프로세스 합계 "
+              f"{result['peak_rss_bytes_total'] / 1024 / 1024:.1f} MB)")
+    else:
+        print("최대 RSS: 측정 불가 (이 플랫폼은 지원하지 않음)")
+    print(f"결과: {json.dumps(result['outcomes'], ensure_ascii=False)}")
+    for stats in result["upstream_queue"]:
+        print(f"AI 호출 대기열: 바로 {stats['immediate']}회, 대기 후 {stats['queued']}회, 시간 초과 {stats['timeouts']}회")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "result": result,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, "load-" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
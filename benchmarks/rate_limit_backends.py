@@ -0,0 +1,136 @@
+"""요청 제한 저장소 벤치마크 - 여러 프로세스/스레드가 동시에 check_and_record 호출
+
+사용법:
+    python benchmarks/rate_limit_backends.py --processes 4 --threads 4 --seconds 3
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from rate_limit_store import RateLimits, create_rate_limit_backend
+
+# 제한에 걸리지 않도록 충분히 큰 값 (저장소 자체 비용만 측정)
+LIMITS = RateLimits(max_requests_per_session=10**9, max_requests_per_minute=10**9)
+
+
+def _writer(backend, sessions, deadline, latencies, counts):
+    rng = random.Random()
+    done = 0
+    while time.perf_counter() < deadline:
+        session_id = rng.choice(sessions)
+        start = time.perf_counter()
+        backend.check_and_record(session_id, time.time(), LIMITS)
+        latencies.append(time.perf_counter() - start)
+        counts[session_id] = counts.get(session_id, 0) + 1
+        done += 1
+    return done
+
+
+def _run_process(backend_name, db_path, threads, seconds, session_count, queue):
+    backend = create_rate_limit_backend(backend_name, db_path)
+    sessions = [f"bench_{i}" for i in range(session_count)]
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    per_thread_counts = [dict() for _ in range(threads)]
+    workers = [
+        threading.Thread(target=_writer, args=(backend, sessions, deadline, latencies, per_thread_counts[i]))
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    counts = {}
+    for thread_counts in per_thread_counts:
+        for session_id, count in thread_counts.items():
+            counts[session_id] = counts.get(session_id, 0) + count
+    queue.put((latencies, counts))
+
+
+def run(backend_name, processes, threads, seconds, session_count):
+    """저장소 하나를 측정해 결과 dict 반환"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix="rate_limit_bench_"), "rate_limit.db")
+    if backend_name == "memory" and processes > 1:
+        processes = 1  # 메모리 저장소는 프로세스 간 공유가 되지 않음
+
+    create_rate_limit_backend(backend_name, db_path)  # 테이블 생성
+    queue = multiprocessing.Queue()
+    started = time.perf_counter()
+    workers = [
+        multiprocessing.Process(
+            target=_run_process,
+            args=(backend_name, db_path, threads, seconds, session_count, queue),
+        )
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    expected = {}
+    for _, counts in results:
+        for session_id, count in counts.items():
+            expected[session_id] = expected.get(session_id, 0) + count
+
+    # 원자성 확인: 저장소에 기록된 합계가 호출 수와 같아야 함 (공유 저장소만 의미 있음)
+    lost_updates = 0
+    if backend_name != "memory":
+        backend = create_rate_limit_backend(backend_name, db_path)
+        for session_id, count in expected.items():
+            state = backend.get_state(session_id)
+            lost_updates += count - (state.total if state else 0)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    return {
+        "backend": backend_name,
+        "processes": processes,
+        "threads_per_process": threads,
+        "operations": len(latencies),
+        "ops_per_second": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "lost_updates": lost_updates,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="memory,sqlite")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--sessions", type=int, default=1000)
+    args = parser.parse_args()
+
+    for backend_name in args.backends.split(","):
+        result = run(backend_name, args.processes, args.threads, args.seconds, args.sessions)
+        print(
+            f"{result['backend']:>7}  {result['processes']}p x {result['threads_per_process']}t  "
+            f"{result['ops_per_second']:>9.0f} ops/s  "
+            f"p50 {result['p50_ms']:.3f}ms  p95 {result['p95_ms']:.3f}ms  p99 {result['p99_ms']:.3f}ms  "
+            f"lost {result['lost_updates']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
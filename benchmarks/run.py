@@ -0,0 +1,352 @@
+"""게임 엔진/요청 제한/페이지 렌더 벤치마크 (오프라인, AI 호출은 스텁)
+
+사용법:
+    python benchmarks/run.py                                   # 전체 실행, benchmarks/results/에 JSON 저장
+    python benchmarks/run.py --only local_verdict,rate_limit_10k  # 일부만 실행
+    python benchmarks/run.py --baseline benchmarks/results/base.json  # 기준 결과와 비교
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+# 프로젝트 루트를 Python 경로에 추가하고 AI 호출은 스텁으로 고정
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("LLM_BACKEND", "stub")
+
+# 벤치마크가 실제 게임 저장소/대화 보관소/요청 제한 저장소를 채우지 않도록 임시 경로 사용
+SCRATCH_DIR = tempfile.mkdtemp(prefix="turtle_bench_")
+for _name, _file in (("TRANSCRIPT_DB_PATH", "transcripts.db"), ("SESSION_DB_PATH", "sessions.db"),
+                     ("RATE_LIMIT_DB_PATH", "rate_limit.db")):
+    os.environ.setdefault(_name, os.path.join(SCRATCH_DIR, _file))
+# 판정 캐시는 메모리만 사용 (디스크 캐시가 있으면 캐시 미스 경로를 잴 수 없음)
+os.environ.pop("VERDICT_CACHE_DB_PATH", None)
+
+from llm_backends import StubBackend, set_llm_backend
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+REGRESSION_THRESHOLD = 0.10  # 기준 대비 10% 이상 느려지면 경고
+
+# 벤치마크용 입력 (질문, 정답 시도, 무관한 입력이 섞이도록)
+SAMPLE_INPUTS = [
+    "남자는 조난을 당한 적이 있나요?",
+    "인육 수프를 먹었다",
+    "아이는 손이 하나 더 있었나요?",
+    "시간이 멈췄나요?",
+    "날씨가 맑았나요?",
+    "범인은 경찰인가요?",
+    "거울에 비친 모습이 달랐다",
+    "할아버지는 목걸이를 잃어버렸나요?",
+]
+
+
+def measure(fn, iterations, warmup=3):
+    """fn을 반복 실행해 ms 단위 통계 반환"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+    }
+
+
+@contextmanager
+def _unlimited_security():
+    """요청 제한 없는 보안 관리자로 잠시 교체 (끝나면 원래 관리자로 복원)"""
+    import game_logic
+    from security import SecurityManager
+
+    previous = game_logic.security_manager
+    game_logic.security_manager = SecurityManager(max_requests_per_session=10**9, max_requests_per_minute=10**9)
+    try:
+        yield
+    finally:
+        game_logic.security_manager = previous
+
+
+def bench_local_verdict():
+    """AI 호출 전 로컬 판정 경로 - 유사도 단축 판정과 모델 캐스케이드 라우팅 (모든 에피소드 x 샘플 입력)"""
+    from config import SIMILARITY_MATCH_THRESHOLD, SIMILARITY_MATCH_MARGIN
+    from episodes import EPISODES
+    from model_router import model_router
+
+    episodes = list(EPISODES)
+    # 단서 문장도 섞어 유사도 단축 판정이 성공하는 경로까지 포함
+    inputs = SAMPLE_INPUTS + [episode.clues[0] for episode in episodes]
+    for episode in episodes:
+        episode.similarity_index  # 색인 준비 비용은 제외
+
+    def run():
+        for episode in episodes:
+            index = episode.similarity_index
+            for text in inputs:
+                if index is not None and index.confident_match(text, SIMILARITY_MATCH_THRESHOLD, SIMILARITY_MATCH_MARGIN):
+                    continue
+                model_router.first_tier(episode, text)
+
+    return measure(run, iterations=200)
+
+
+def bench_clue_index_build():
+    """에피소드 단서 색인 생성"""
+    from clue_matcher import ClueIndex
+    from episodes import EPISODES
+
+    clue_lists = [episode.clues for episode in EPISODES]
+    return measure(lambda: [ClueIndex(clues) for clues in clue_lists], iterations=200)
+
+
+def bench_investigate():
+    """investigate 전체 경로 (캐시 미스, 지연 없는 스텁)"""
+    from game_logic import TurtleSoupGame
+    from verdict_cache import verdict_cache
+
+    game = TurtleSoupGame()
+    game.select_episode("바다거북수프")
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        verdict_cache.clear()
+        game.found_clues = set()
+        game.game_state = "playing"
+        game.question_count = counter[0]
+        game.investigate(SAMPLE_INPUTS[counter[0] % len(SAMPLE_INPUTS)], "bench_session")
+
+    with _unlimited_security():
+        return measure(run, iterations=500)
+
+
+def bench_investigate_cached():
+    """investigate 캐시 적중 경로"""
+    from game_logic import TurtleSoupGame
+
+    game = TurtleSoupGame()
+    game.select_episode("바다거북수프")
+    with _unlimited_security():
+        game.investigate("날씨가 맑았나요?", "bench_session")
+        return measure(lambda: game.investigate("날씨가 맑았나요?", "bench_session"), iterations=2000)
+
+
+def bench_game_progress():
+    """get_game_progress (단서 일부 발견 상태)"""
+    from game_logic import TurtleSoupGame
+
+    game = TurtleSoupGame()
+    game.select_episode("바다거북수프")
+    game.found_clues = {game.current_episode.clues[0]}
+    return measure(game.get_game_progress, iterations=5000)
+
+
+def bench_rate_limit_10k():
+    """10k 세션 check_and_record (메모리 저장소)"""
+    from security import SecurityManager
+
+    manager = SecurityManager(max_requests_per_session=10**9, max_requests_per_minute=10**9)
+    sessions = [f"bench_{i}" for i in range(10_000)]
+
+    def run():
+        for session_id in sessions:
+            manager.check_and_record(session_id)
+
+    result = measure(run, iterations=20, warmup=1)
+    result["per_call_us"] = result["mean_ms"] * 1000 / len(sessions)
+    return result
+
+
+def bench_episode_lookup():
+    """제목으로 에피소드 조회"""
+    from episodes import EPISODE_TITLES, get_episode
+
+    def run():
+        for title in EPISODE_TITLES:
+            get_episode(title)
+
+    return measure(run, iterations=5000)
+
+
+def bench_episode_catalog_load():
+    """에피소드 목록(메타데이터) 로드"""
+    from config import EPISODE_DATA_DIR
+    from episodes import EpisodeRepository
+
+    return measure(lambda: EpisodeRepository(EPISODE_DATA_DIR), iterations=200)
+
+
+def bench_episode_compiled_load():
+    """컴파일된 산출물로 에피소드 로드 후 첫 프롬프트/색인 준비"""
+    import tempfile
+    from config import EPISODE_DATA_DIR
+    from episode_artifact import build_artifact
+    from episodes import EpisodeRepository
+
+    artifact_path = os.path.join(tempfile.mkdtemp(), "episodes.json")
+    build_artifact(EPISODE_DATA_DIR, artifact_path)
+
+    def run():
+        repository = EpisodeRepository(EPISODE_DATA_DIR, artifact_path)
+        episode = repository.get(repository.titles()[0])
+        episode.system_prompt
+        episode.clue_index
+
+    return measure(run, iterations=200)
+
+
+def _app_rerun(history_length):
+    from streamlit.testing.v1 import AppTest
+    from chat_history import ChatHistory, transcript_archive
+    from game_logic import TurtleSoupGame
+
+    game = TurtleSoupGame()
+    game.select_episode("바다거북수프")
+    history = ChatHistory(transcript_archive)
+    for i in range(history_length // 2):
+        history.append("user", f"🔍 {SAMPLE_INPUTS[i % len(SAMPLE_INPUTS)]}")
+        history.append("assistant", "아니오.")
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.session_state["game"] = game
+    at.session_state["chat_history"] = history
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return measure(at.run, iterations=10, warmup=1)
+
+
+def bench_app_rerun_0():
+    """app.py 재실행 (대화 0개)"""
+    return _app_rerun(0)
+
+
+def bench_app_rerun_50():
+    """app.py 재실행 (대화 50개)"""
+    return _app_rerun(50)
+
+
+def bench_app_rerun_200():
+    """app.py 재실행 (대화 200개)"""
+    return _app_rerun(200)
+
+
+def bench_cold_import():
+    """새 프로세스에서 첫 화면 경로 모듈 import (인터프리터 시작과 streamlit import 포함)"""
+    command = [sys.executable, "-c", "import game_logic, security, session_store, chat_history, metrics"]
+    return measure(lambda: subprocess.run(command, cwd=ROOT_DIR, check=True), iterations=10, warmup=1)
+
+
+BENCHMARKS = {
+    "local_verdict": bench_local_verdict,
+    "clue_index_build": bench_clue_index_build,
+    "investigate": bench_investigate,
+    "investigate_cached": bench_investigate_cached,
+    "game_progress": bench_game_progress,
+    "rate_limit_10k": bench_rate_limit_10k,
+    "episode_lookup": bench_episode_lookup,
+    "episode_catalog_load": bench_episode_catalog_load,
+    "episode_compiled_load": bench_episode_compiled_load,
+    "app_rerun_0": bench_app_rerun_0,
+    "app_rerun_50": bench_app_rerun_50,
+    "app_rerun_200": bench_app_rerun_200,
+    "cold_import": bench_cold_import,
+}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """기준 결과 대비 평균 시간 변화 출력, 회귀가 있으면 True"""
+    regressed = False
+    print("\n기준 대비 (mean_ms):")
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"  {name:<22} (기준 없음)")
+            continue
+        change = (result["mean_ms"] - base["mean_ms"]) / base["mean_ms"] if base["mean_ms"] else 0.0
+        flag = ""
+        if change > REGRESSION_THRESHOLD:
+            flag = "  ⚠️ 느려짐"
+            regressed = True
+        print(f"  {name:<22} {base['mean_ms']:>10.3f} → {result['mean_ms']:>10.3f}  ({change:+.1%}){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="쉼표로 구분한 벤치마크 이름")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본값: benchmarks/results/<시각>.json)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"알 수 없는 벤치마크: {', '.join(unknown)}")
+
+    # 지연 없는 스텁 - 측정 대상은 앱 자체 비용
+    set_llm_backend(StubBackend(latency_distribution="fixed", latency_median_ms=0))
+
+    results = {}
+    try:
+        for name in names:
+            result = BENCHMARKS[name]()
+            results[name] = result
+            print(f"{name:<22} mean {result['mean_ms']:>10.3f}ms  p50 {result['p50_ms']:>10.3f}ms  "
+                  f"p95 {result['p95_ms']:>10.3f}ms  ({result['iterations']}회)")
+    finally:
+        shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
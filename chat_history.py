@@ -0,0 +1,135 @@
+import sys
+import time
+import uuid
+from collections import deque
+from typing import NamedTuple
+
+from config import (
+    CHAT_HISTORY_MAX_IN_MEMORY,
+    TRANSCRIPT_DB_PATH,
+    TRANSCRIPT_TTL_SECONDS,
+)
+from sqlite_store import open_database
+
+
+class ChatMessage(NamedTuple):
+    """대화 메시지 1개 (role: "user" 또는 "assistant")"""
+    role: str
+    content: str
+
+
+class TranscriptArchive:
+    """대화를 메시지마다 추가 기록하는 SQLite(WAL) 보관소 (모든 세션이 공유)"""
+
+    def __init__(self, db_path: str, ttl_seconds: float = TRANSCRIPT_TTL_SECONDS):
+        self.db_path = db_path
+        self._db = open_database(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            " transcript_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " role TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (transcript_id, seq))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS transcripts_created_at ON transcripts (created_at)")
+        # 재시작 후 남은 오래된 대화 정리
+        self._db.execute("DELETE FROM transcripts WHERE created_at < ?", (time.time() - ttl_seconds,))
+
+    def append(self, transcript_id: str, seq: int, message: ChatMessage):
+        self._db.execute(
+            "INSERT OR REPLACE INTO transcripts (transcript_id, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+            (transcript_id, seq, message.role, message.content, time.time()),
+        )
+
+    def count(self, transcript_id: str) -> int:
+        """저장된 메시지 수 (seq는 0부터 빈틈없이 증가)"""
+        row = self._db.fetchone("SELECT MAX(seq) FROM transcripts WHERE transcript_id = ?", (transcript_id,))
+        return 0 if row[0] is None else row[0] + 1
+
+    def load(self, transcript_id: str, start: int, end: int) -> list[ChatMessage]:
+        """seq가 [start, end) 범위인 메시지를 순서대로 반환"""
+        rows = self._db.fetchall(
+            "SELECT role, content FROM transcripts WHERE transcript_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+            (transcript_id, start, end),
+        )
+        return [ChatMessage(role, content) for role, content in rows]
+
+    def delete(self, transcript_id: str):
+        self._db.execute("DELETE FROM transcripts WHERE transcript_id = ?", (transcript_id,))
+
+
+class ChatHistory:
+    """최근 대화만 메모리에 두는 링 버퍼 (모든 메시지는 보관소에 바로 기록하고, 밀려난 대화는 필요할 때 읽음)"""
+    __slots__ = ("transcript_id", "archive", "_recent", "_total", "__weakref__")
+
+    def __init__(self, archive=None, max_in_memory: int = CHAT_HISTORY_MAX_IN_MEMORY, transcript_id=None):
+        self.transcript_id = transcript_id or uuid.uuid4().hex
+        self.archive = archive
+        self._recent = deque(maxlen=max_in_memory)
+        self._total = 0  # 전체 메시지 수 (= 다음 메시지의 seq)
+
+    @classmethod
+    def restore(cls, archive, transcript_id: str, max_in_memory: int = CHAT_HISTORY_MAX_IN_MEMORY) -> "ChatHistory":
+        """보관소에서 최근 메시지만 읽어 대화 기록 복원"""
+        history = cls(archive, max_in_memory, transcript_id)
+        history._total = archive.count(transcript_id)
+        history._recent.extend(archive.load(transcript_id, max(0, history._total - max_in_memory), history._total))
+        return history
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        return iter(self.recent(len(self)))
+
+    def append(self, role: str, content: str):
+        message = ChatMessage(role, content)
+        # 턴마다 보관소에 추가 기록 (재접속/재시작 시 복원용)
+        if self.archive is not None:
+            self.archive.append(self.transcript_id, self._total, message)
+        self._recent.append(message)  # 가득 차면 가장 오래된 메시지는 메모리에서만 빠짐
+        self._total += 1
+
+    def recent(self, count: int) -> list[ChatMessage]:
+        """최근 count개 메시지 (메모리에 없는 부분은 보관소에서 읽음)"""
+        count = min(count, len(self))
+        in_memory = list(self._recent)
+        if count <= len(in_memory):
+            return in_memory[len(in_memory) - count:]
+        if self.archive is None:
+            return in_memory
+        start = len(self) - count
+        return self.archive.load(self.transcript_id, start, self.archived_count) + in_memory
+
+    def clear(self):
+        if self.archive is not None and self._total:
+            self.archive.delete(self.transcript_id)
+        self._recent.clear()
+        self._total = 0
+
+    @property
+    def in_memory_count(self) -> int:
+        return len(self._recent)
+
+    @property
+    def loadable_count(self) -> int:
+        """다시 표시할 수 있는 메시지 수 (보관소가 없으면 메모리에서 밀려난 메시지는 읽을 수 없음)"""
+        return self._total if self.archive is not None else len(self._recent)
+
+    @property
+    def archived_count(self) -> int:
+        """메모리에서 밀려나 보관소에만 있는 메시지 수"""
+        return self._total - len(self._recent)
+
+    def memory_footprint(self) -> int:
+        """메모리에 있는 대화가 차지하는 대략적인 바이트 수"""
+        size = sys.getsizeof(self) + sys.getsizeof(self._recent)
+        for message in self._recent:
+            size += sys.getsizeof(message) + sys.getsizeof(message.content)
+        return size
+
+
+# 프로세스 전역 대화 보관소
+transcript_archive = TranscriptArchive(TRANSCRIPT_DB_PATH) if TRANSCRIPT_DB_PATH else None
@@ -0,0 +1,140 @@
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+# 어절 끝에서 떼어낼 조사/어미 (긴 것부터 검사)
+_SUFFIXES = sorted([
+    # 조사
+    "은", "는", "이", "가", "을", "를", "에", "에서", "에게", "한테", "께서", "의",
+    "와", "과", "도", "로", "으로", "만", "까지", "부터", "처럼", "보다", "이나", "나",
+    "이랑", "랑", "하고",
+    # 서술/의문 어미
+    "이다", "였다", "이었다", "었다", "았다", "했다", "다",
+    "인가요", "나요", "까요", "었나요", "았나요", "했나요", "습니까", "습니다", "니다",
+    "어요", "아요", "해요", "예요", "이에요", "요",
+], key=len, reverse=True)
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+# 어느 이야기에나 나오는 인물 지칭어 (이것만 겹쳐서는 단서를 가리킨다고 볼 수 없음)
+_COMMON_STEMS = frozenset(["남자", "여자", "사람", "아이", "남성", "여성", "그녀", "자신"])
+
+NGRAM_SIZE = 2
+MIN_SCORE = 0.4          # 단서로 인정할 최소 점수
+MIN_SHARED_STEMS = 2     # 단서와 겹쳐야 하는 최소 어간 수 (흔한 단어 하나로는 인정하지 않음)
+RELATIVE_CUTOFF = 0.9    # 최고 점수 대비 이 비율 이상인 단서만 함께 인정
+
+
+def normalize_text(text: str) -> str:
+    """유니코드/대소문자/문장부호 정규화"""
+    text = unicodedata.normalize("NFC", text).lower()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def strip_suffix(token: str) -> str:
+    """어절 끝의 조사/어미 하나를 제거 (어간이 한 글자 이상 남는 경우만)"""
+    for suffix in _SUFFIXES:
+        if len(token) > len(suffix) and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """정규화 후 조사/어미를 뗀 어간 목록"""
+    return [strip_suffix(token) for token in normalize_text(text).split()]
+
+
+def stem_ngrams(text: str, n: int = NGRAM_SIZE) -> list[set[str]]:
+    """어간별 문자 n-gram 집합 목록 (n보다 짧은 어간과 흔한 인물 지칭어는 제외)"""
+    stems = []
+    for stem in tokenize(text):
+        if len(stem) >= n and stem not in _COMMON_STEMS:
+            stems.append({stem[i:i + n] for i in range(len(stem) - n + 1)})
+    return stems
+
+
+def char_ngrams(text: str, n: int = NGRAM_SIZE) -> set[str]:
+    """입력 전체의 문자 n-gram 집합"""
+    return set().union(*stem_ngrams(text, n))
+
+
+class ClueIndex:
+    """에피소드 단서용 n-gram 역색인 (한 번 만들고 매 판정마다 재사용)"""
+
+    def __init__(self, clues: list[str]):
+        self.clues = list(clues)
+        self._postings = defaultdict(list)  # n-gram -> 단서 인덱스 목록
+        self._idf = {}
+        self._norms = []
+
+        clue_grams = [char_ngrams(clue) for clue in self.clues]
+        for index, grams in enumerate(clue_grams):
+            for gram in grams:
+                self._postings[gram].append(index)
+
+        # 여러 단서에 공통으로 나오는 n-gram일수록 가중치를 낮춤
+        total = len(self.clues)
+        for gram, indices in self._postings.items():
+            self._idf[gram] = math.log(1 + total / len(indices))
+        self._norms = [sum(self._idf[gram] for gram in grams) for grams in clue_grams]
+
+    def to_dict(self) -> dict:
+        """직렬화 (컴파일된 에피소드 산출물용)"""
+        return {"postings": dict(self._postings), "idf": self._idf, "norms": self._norms}
+
+    @classmethod
+    def from_dict(cls, clues: list[str], data: dict) -> "ClueIndex":
+        """to_dict 결과로 복원 (n-gram 재계산 없음)"""
+        index = cls.__new__(cls)
+        index.clues = list(clues)
+        index._postings = defaultdict(list, data["postings"])
+        index._idf = data["idf"]
+        index._norms = data["norms"]
+        return index
+
+    def score(self, text: str) -> list[tuple[int, float]]:
+        """입력과 각 단서의 유사도 점수를 높은 순으로 반환 (겹치는 어간이 MIN_SHARED_STEMS개 미만인 단서는 제외)"""
+        query_stems = stem_ngrams(text)
+        query_grams = set().union(*query_stems)
+        if not query_grams:
+            return []
+
+        shared = defaultdict(float)
+        query_norm = 0.0
+        for gram in query_grams:
+            idf = self._idf.get(gram)
+            if idf is None:
+                # 단서에 없는 n-gram은 가장 희귀한 단어로 취급
+                query_norm += math.log(1 + len(self.clues))
+                continue
+            query_norm += idf
+            for index in self._postings[gram]:
+                shared[index] += idf
+
+        # 한 어간의 n-gram이 여러 개 겹쳐도 한 번만 셈
+        shared_stems = defaultdict(int)
+        for grams in query_stems:
+            for index in {index for gram in grams for index in self._postings.get(gram, ())}:
+                shared_stems[index] += 1
+
+        scores = [
+            (index, weight / math.sqrt(query_norm * self._norms[index]))
+            for index, weight in shared.items()
+            if self._norms[index] > 0 and shared_stems[index] >= MIN_SHARED_STEMS
+        ]
+        # 점수가 같으면 단서 순서대로 (결정적 결과)
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores
+
+    def match(self, text: str, exclude=(), min_score: float = MIN_SCORE) -> list[str]:
+        """입력이 가리키는 단서 목록 (이미 찾은 단서는 제외)"""
+        candidates = [
+            (index, score) for index, score in self.score(text)
+            if self.clues[index] not in exclude and score >= min_score
+        ]
+        if not candidates:
+            return []
+
+        best = candidates[0][1]
+        return [self.clues[index] for index, score in candidates if score >= best * RELATIVE_CUTOFF]
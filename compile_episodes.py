@@ -0,0 +1,52 @@
+"""에피소드 컴파일 - 검증 후 토큰 수/단서 색인/미리보기 메타데이터를 산출물로 저장
+
+사용법:
+    python compile_episodes.py            # 검증 후 EPISODE_ARTIFACT_PATH에 저장
+    python compile_episodes.py --check    # 산출물이 최신인지만 확인 (배포 전 점검용)
+
+앱은 시작할 때 산출물을 읽고, 원본 데이터나 빌드 코드의 크기/수정 시각이 다르고 내용 해시도 다르면 무시한다.
+--check는 항상 전체 내용 해시로 확인한다.
+"""
+import argparse
+import os
+import sys
+
+# 현재 디렉토리를 Python 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from config import EPISODE_DATA_DIR, EPISODE_ARTIFACT_PATH
+from episode_artifact import build_artifact, load_artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=EPISODE_DATA_DIR, help="에피소드 데이터 디렉토리")
+    parser.add_argument("--output", default=EPISODE_ARTIFACT_PATH, help="산출물 목록 경로 (.json, 에피소드별 색인은 같은 이름의 디렉토리)")
+    parser.add_argument("--check", action="store_true", help="다시 만들지 않고 산출물이 최신인지만 확인")
+    args = parser.parse_args()
+
+    if args.check:
+        if load_artifact(args.data_dir, args.output, verify_content=True) is None:
+            print(f"❌ 산출물이 없거나 원본과 다릅니다: {args.output}")
+            return 1
+        print(f"✅ 산출물이 최신입니다: {args.output}")
+        return 0
+
+    report = build_artifact(args.data_dir, args.output)
+    for row in report["episodes"]:
+        print(f"{row['prompt_tokens']:>6} tokens  {row['title']}")
+    for message in report["warnings"]:
+        print(f"⚠️ {message}")
+    for message in report["errors"]:
+        print(f"❌ {message}")
+    if report["errors"]:
+        print("검증 오류가 있어 산출물을 저장하지 않았습니다.")
+        return 1
+    print(f"저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # .env 파일 로드 (선택적)
@@ -10,13 +11,111 @@ except Exception:
 # OpenAI API 키 설정 (Streamlit Cloud 환경 변수도 확인)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or os.getenv("STREAMLIT_OPENAI_API_KEY")
 
+# AI 백엔드 설정
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")  # "openai" 또는 "stub"(오프라인 부하 테스트용)
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-5")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # 로컬 스텁 서버 등 호환 API 주소 (기본값: OpenAI)
+# 판정 1건당 최대 출력 토큰 (추론 모델은 추론 토큰 포함, 판정 JSON 자체는 30토큰 안팎)
+LLM_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "2048"))
+
+# 모델 캐스케이드 설정 (쉬운 질문은 작은 모델이 먼저 판정하고, 확신이 낮으면 LLM_MODEL로 넘김)
+LLM_CASCADE_ENABLED = os.getenv("LLM_CASCADE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "gpt-5-mini")
+LLM_SMALL_REASONING_EFFORT = os.getenv("LLM_SMALL_REASONING_EFFORT", "minimal")
+CASCADE_CLUE_SCORE_THRESHOLD = float(os.getenv("CASCADE_CLUE_SCORE_THRESHOLD", "0.2"))  # 단서 유사도가 이 이상이면 바로 큰 모델
+# 작은 모델 판정 중 그대로 받아들일 판정 코드 (중요도가 high이거나 그 외 판정/형식 오류는 큰 모델로 다시 판정)
+CASCADE_ACCEPTED_VERDICTS = ("yes", "no", "irrelevant", "likely", "unlikely")
+
+# 로컬 유사도 판정 (단서를 거의 그대로 입력한 경우/이미 찾은 단서 반복은 AI 호출 없이 처리, NumPy 필요)
+SIMILARITY_SHORTCUT_ENABLED = os.getenv("SIMILARITY_SHORTCUT_ENABLED", "true").lower() in ("1", "true", "yes")
+SIMILARITY_MATCH_THRESHOLD = float(os.getenv("SIMILARITY_MATCH_THRESHOLD", "0.75"))  # 단서와의 최소 코사인 유사도
+SIMILARITY_MATCH_MARGIN = 0.25  # 다음으로 가까운 단서/힌트보다 이만큼 더 가까워야 확정
+
+# 스텁 백엔드 설정 (LLM_BACKEND=stub 또는 stub_server.py)
+STUB_LATENCY_DISTRIBUTION = os.getenv("STUB_LATENCY_DISTRIBUTION", "lognormal")  # fixed / uniform / lognormal
+STUB_LATENCY_MEDIAN_MS = float(os.getenv("STUB_LATENCY_MEDIAN_MS", "800"))
+STUB_LATENCY_SIGMA = float(os.getenv("STUB_LATENCY_SIGMA", "0.5"))
+STUB_ERROR_RATE = float(os.getenv("STUB_ERROR_RATE", "0"))
+STUB_SEED = int(os.environ["STUB_SEED"]) if os.getenv("STUB_SEED") else None
+
+# OpenAI 커넥션 풀 설정 (프로세스 전역 클라이언트 하나를 모든 세션이 공유)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))              # 최대 동시 연결 수
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))  # 유지할 유휴 연결 수
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))          # 유휴 연결 유지 시간 (초)
+OPENAI_WARMUP_ON_START = True  # 서버 시작 시 연결 미리 열기
+
+# 에피소드 선택 시 사전 준비 (백그라운드에서 상위 연결만 미리 열어 둠 - 프롬프트는 보내지 않으므로 제공자 측 프롬프트 캐시는 채우지 않음)
+PREWARM_ON_SELECT = os.getenv("PREWARM_ON_SELECT", "true").lower() in ("1", "true", "yes")
+PREWARM_MAX_CONCURRENT = 2               # 동시에 진행하는 사전 준비 수
+PREWARM_MAX_PER_MINUTE = 10              # 프로세스 전체의 분당 사전 준비 호출 수 (세션 요청 한도와 별도로 상위 호출량 제한)
+PREWARM_EPISODE_COOLDOWN_SECONDS = 300.0  # 같은 에피소드를 다시 준비하지 않는 시간 (유휴 연결이 풀에 남아 있는 시간 정도)
+
+# AI 호출 복원력 설정
+LLM_CALL_DEADLINE_SECONDS = 30.0      # 재시도를 포함한 호출 1회의 제한 시간
+LLM_MAX_ATTEMPTS = 3                  # 일시적 오류 시 최대 시도 횟수
+LLM_RETRY_BASE_DELAY_SECONDS = 0.5    # 재시도 대기 기본값 (지수 증가 + 지터)
+LLM_RETRY_MAX_DELAY_SECONDS = 4.0     # 재시도 대기 최댓값
+CIRCUIT_FAILURE_THRESHOLD = 5         # 연속 실패가 이 횟수에 도달하면 회로 열림
+CIRCUIT_RESET_TIMEOUT_SECONDS = 30.0  # 회로가 열린 뒤 시험 요청까지 대기 시간
+
+# 상위 AI 호출 스케줄러 (프로세스 전체의 동시 호출 수와 분당 토큰을 제한하고, 대기 요청은 세션별로 돌아가며 처리)
+UPSTREAM_MAX_CONCURRENT = int(os.getenv("UPSTREAM_MAX_CONCURRENT", "16"))        # 동시에 진행하는 AI 호출 수
+UPSTREAM_TOKENS_PER_MINUTE = int(os.getenv("UPSTREAM_TOKENS_PER_MINUTE", "0"))   # 분당 토큰 예산 (제공자 TPM 한도보다 약간 낮게, 0이면 제한 없음)
+UPSTREAM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT_SECONDS", "60"))  # 차례를 기다리는 최대 시간
+
+# 동일 요청 병합 (여러 세션이 같은 상태에서 같은 질문을 동시에 하면 AI 호출 1회를 공유)
+REQUEST_COALESCING_ENABLED = os.getenv("REQUEST_COALESCING_ENABLED", "true").lower() in ("1", "true", "yes")
+COALESCE_WAIT_TIMEOUT_SECONDS = UPSTREAM_QUEUE_TIMEOUT_SECONDS + LLM_CALL_DEADLINE_SECONDS + 5.0  # 기다리는 쪽 제한 시간 (리더의 대기열 대기 + 호출 제한 시간보다 약간 길게)
+
+# 에피소드 데이터 경로
+EPISODE_DATA_DIR = os.getenv("EPISODE_DATA_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "episodes")
+
 # 게임 설정
 GAME_TITLE = "터틀셔틀"
 GAME_DESCRIPTION = "사건을 해결해보자!"
+STREAM_RESPONSES = True  # AI 응답을 생성되는 대로 표시
+MAX_BATCH_QUESTIONS = 3  # 한 번에 입력해 AI 호출 1회로 판정할 수 있는 최대 질문 수
+FREE_HINT_INTERVAL = 4  # 이 횟수의 조사마다 무료 힌트 1개 제공
+CHAT_HISTORY_PAGE_SIZE = 20  # 대화 기록에 한 번에 표시할 메시지 수 ("이전 대화 더 보기"마다 추가)
+CHAT_HISTORY_MAX_IN_MEMORY = 40  # 세션 메모리에 두는 최근 메시지 수 (넘치면 보관소로 이동)
+# 오래된 대화 보관소 (SQLite, 비우면 메모리에서 밀려난 대화는 버림)
+TRANSCRIPT_DB_PATH = os.getenv("TRANSCRIPT_DB_PATH", os.path.join(tempfile.gettempdir(), "turtle_shuttle_transcripts.db"))
+TRANSCRIPT_TTL_SECONDS = 60 * 60 * 24  # 보관한 대화 유지 시간 (재시작 시 정리)
+# 게임 저장/이어하기 (?session=<토큰> 으로 재접속/재시작 후 복원, 비우면 저장하지 않음)
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", os.path.join(tempfile.gettempdir(), "turtle_shuttle_sessions.db"))
+SESSION_TTL_SECONDS = TRANSCRIPT_TTL_SECONDS  # 저장한 게임 유지 시간 (대화 보관 기간과 같게 유지)
 
 # 보안 설정
 MAX_REQUESTS_PER_SESSION = 50  # 세션당 최대 요청 수
 MAX_REQUESTS_PER_MINUTE = 10   # 분당 최대 요청 수
+RATE_LIMIT_IDLE_TTL_SECONDS = 60 * 60      # 이 시간 동안 요청이 없는 세션은 정리
+RATE_LIMIT_SWEEP_INTERVAL_SECONDS = 60     # 유휴 세션 정리 주기
+# 요청 제한 저장소: "memory"(프로세스별) 또는 "sqlite"(같은 호스트의 여러 프로세스가 공유)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH") or os.path.join(tempfile.gettempdir(), "turtle_shuttle_rate_limit.db")
+
+# 지표/관리자 설정
+METRICS_FILE = os.getenv("METRICS_FILE")  # 설정 시 Prometheus 텍스트 형식 지표 파일을 주기적으로 갱신
+METRICS_FILE_INTERVAL_SECONDS = 10.0
+METRICS_PORT = int(os.environ["METRICS_PORT"]) if os.getenv("METRICS_PORT") else None  # 설정 시 로컬 /metrics 엔드포인트
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # 설정 시 ?admin=<토큰> 으로 관리자 페이지 접근
+
+# 비용 추정 단가 (USD / 100만 토큰, gpt-5 기준)
+LLM_PRICE_INPUT_PER_MTOK = float(os.getenv("LLM_PRICE_INPUT_PER_MTOK", "1.25"))
+LLM_PRICE_CACHED_INPUT_PER_MTOK = float(os.getenv("LLM_PRICE_CACHED_INPUT_PER_MTOK", "0.125"))
+LLM_PRICE_OUTPUT_PER_MTOK = float(os.getenv("LLM_PRICE_OUTPUT_PER_MTOK", "10.0"))
+# 작은 모델 단가 (gpt-5-mini 기준)
+LLM_SMALL_PRICE_INPUT_PER_MTOK = float(os.getenv("LLM_SMALL_PRICE_INPUT_PER_MTOK", "0.25"))
+LLM_SMALL_PRICE_CACHED_INPUT_PER_MTOK = float(os.getenv("LLM_SMALL_PRICE_CACHED_INPUT_PER_MTOK", "0.025"))
+LLM_SMALL_PRICE_OUTPUT_PER_MTOK = float(os.getenv("LLM_SMALL_PRICE_OUTPUT_PER_MTOK", "2.0"))
+
+# 판정 캐시 설정
+VERDICT_CACHE_MAX_ENTRIES = 5000        # 메모리 캐시 최대 항목 수 (LRU)
+VERDICT_CACHE_TTL_SECONDS = 60 * 60 * 6  # 캐시 유효 시간 (초)
+VERDICT_CACHE_DB_PATH = os.getenv("VERDICT_CACHE_DB_PATH")  # 설정 시 SQLite 디스크 캐시 사용
+
+# 컴파일된 에피소드 산출물 (python compile_episodes.py 로 생성, 없거나 원본과 내용 해시가 다르면 런타임에 계산)
+EPISODE_ARTIFACT_PATH = os.getenv("EPISODE_ARTIFACT_PATH") or os.path.join(EPISODE_DATA_DIR, "compiled", "episodes.json")
 
 # API 키 검증 함수
 def validate_api_key():
@@ -29,5 +128,10 @@ def validate_api_key():
     
     return True, ""
 
-# API 키 상태 확인
-API_KEY_VALID, API_KEY_ERROR = validate_api_key()
+# API 키 상태 확인 (import 시점이 아니라 처음 사용할 때 한 번 검증, PEP 562)
+def __getattr__(name):
+    if name in ("API_KEY_VALID", "API_KEY_ERROR"):
+        valid, error = validate_api_key()
+        globals().update(API_KEY_VALID=valid, API_KEY_ERROR=error)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
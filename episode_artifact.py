@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import time
+
+import clue_matcher
+import prompts
+from config import FREE_HINT_INTERVAL, MAX_REQUESTS_PER_SESSION
+
+# 산출물 형식 버전 (구조가 바뀌면 올림)
+ARTIFACT_FORMAT = "turtle-episodes"
+ARTIFACT_VERSION = 2
+
+# 산출물 내용에 영향을 주는 코드 (원본 데이터와 함께 내용 해시에 포함, NumPy를 불러오지 않도록 파일로 지정)
+_BUILD_SOURCES = ("prompts.py", "clue_matcher.py", "similarity_index.py")
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _source_paths(data_dir: str) -> list[tuple[str, str]]:
+    """산출물 내용에 영향을 주는 파일 (이름, 경로) - 에피소드 데이터 파일과 빌드 코드"""
+    names = sorted(name for name in os.listdir(data_dir) if name.endswith(".json"))
+    sources = [(name, os.path.join(data_dir, name)) for name in names]
+    return sources + [(name, os.path.join(_MODULE_DIR, name)) for name in _BUILD_SOURCES]
+
+
+def source_hash(data_dir: str) -> str:
+    """에피소드 데이터 파일과 빌드 코드의 내용 해시 (하나라도 바뀌면 산출물 무효)"""
+    digest = hashlib.sha256(f"{ARTIFACT_FORMAT}/{ARTIFACT_VERSION}".encode("utf-8"))
+    for name, path in _source_paths(data_dir):
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(name.encode("utf-8") + b"\0" + hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def source_stats(data_dir: str) -> dict:
+    """파일별 [크기, 수정 시각(ns)] - 본문을 읽지 않고 시작할 때 산출물이 최신인지 확인하는 용도"""
+    stats = {}
+    for name, path in _source_paths(data_dir):
+        stat = os.stat(path)
+        stats[name] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def validate_episode(meta: dict, body: dict) -> tuple[list[str], list[str]]:
+    """에피소드 1개 검증 - (오류 목록, 경고 목록)"""
+    errors, warnings = [], []
+    clues = body.get("clues") or []
+    if not clues:
+        errors.append("단서가 없습니다.")
+    if any(not isinstance(clue, str) or not clue.strip() for clue in clues):
+        errors.append("빈 단서가 있습니다.")
+    if len(set(clues)) != len(clues):
+        errors.append("중복된 단서가 있습니다.")
+    if not str(body.get("answer", "")).strip():
+        errors.append("줄거리(answer)가 없습니다.")
+    for field in ("title", "question"):
+        if field in body and body[field] != meta.get(field):
+            errors.append(f"index.json의 {field}가 본문과 다릅니다.")
+    if meta.get("clue_count") != len(clues):
+        errors.append(f"index.json의 clue_count({meta.get('clue_count')})가 단서 수({len(clues)})와 다릅니다.")
+
+    # 무료 힌트는 FREE_HINT_INTERVAL번째 조사마다 하나씩, 세션 요청 한도 안에서만 제공됨
+    hint_free = body.get("hint_free", [])
+    reachable = MAX_REQUESTS_PER_SESSION // FREE_HINT_INTERVAL
+    if not hint_free:
+        warnings.append("무료 힌트가 없습니다.")
+    elif len(hint_free) > reachable:
+        warnings.append(f"무료 힌트 {len(hint_free)}개 중 {len(hint_free) - reachable}개는 요청 한도 안에서 제공되지 않습니다.")
+    if not body.get("hint_paid"):
+        warnings.append("유료 힌트가 없습니다.")
+    return errors, warnings
+
+
+def payload_dir(artifact_path: str) -> str:
+    """에피소드별 산출물 디렉토리 (목록 파일과 같은 이름)"""
+    return os.path.splitext(artifact_path)[0]
+
+
+def _write_atomic(path: str, write):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: str, data):
+    _write_atomic(path, lambda f: f.write(json.dumps(data, ensure_ascii=False).encode("utf-8")))
+
+
+def build_artifact(data_dir: str, artifact_path: str) -> dict:
+    """에피소드 검증 후 토큰 수/색인/미리보기 메타데이터를 계산해 산출물 저장
+
+    목록 파일에는 미리보기와 토큰 수만 두고, 색인은 에피소드별 파일에 나눠 본문과 함께 처음 접근할 때 읽는다.
+    시스템 프롬프트는 저장하지 않는다 (공통 규칙 + 본문으로 런타임에 바로 조립).
+    반환값의 errors가 비어 있지 않으면 산출물을 쓰지 않는다.
+    """
+    import similarity_index
+
+    with open(os.path.join(data_dir, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+
+    report = {"episodes": [], "errors": [], "warnings": []}
+    compiled, payloads = [], {}
+    seen_ids, seen_titles = set(), set()
+    for meta in index["episodes"]:
+        label = f"{meta.get('id')} {meta.get('title')}"
+        if meta["id"] in seen_ids or meta["title"] in seen_titles:
+            report["errors"].append(f"{label}: 중복된 ID 또는 제목입니다.")
+        seen_ids.add(meta["id"])
+        seen_titles.add(meta["title"])
+
+        with open(os.path.join(data_dir, f"{meta['id']}.json"), encoding="utf-8") as f:
+            body = json.load(f)
+        errors, warnings = validate_episode(meta, body)
+        report["errors"] += [f"{label}: {message}" for message in errors]
+        report["warnings"] += [f"{label}: {message}" for message in warnings]
+        if errors:
+            continue
+
+        clues = body["clues"]
+        hints = body.get("hint_free", []) + body.get("hint_paid", [])
+        system_prompt = prompts.compile_system_prompt(meta["question"], body["answer"], clues)
+        entry = {
+            "id": meta["id"],
+            "title": meta["title"],
+            "question": meta["question"],
+            "clue_count": len(clues),
+            "hint_free_count": len(body.get("hint_free", [])),
+            "hint_paid_count": len(body.get("hint_paid", [])),
+            "prompt_tokens": prompts.count_tokens(system_prompt),
+        }
+        payloads[meta["id"]] = {
+            "clue_index": clue_matcher.ClueIndex(clues).to_dict(),
+            "similarity": (
+                similarity_index.SimilarityIndex(clues, hints).to_dict() if similarity_index.is_available() else None
+            ),
+        }
+        compiled.append(entry)
+        report["episodes"].append({"title": meta["title"], "prompt_tokens": entry["prompt_tokens"]})
+
+    if report["errors"]:
+        return report
+
+    directory = payload_dir(artifact_path)
+    os.makedirs(directory, exist_ok=True)
+    for episode_id, payload in payloads.items():
+        _write_json(os.path.join(directory, f"{episode_id}.json"), payload)
+    for name in os.listdir(directory):
+        if name.endswith(".json") and name[:-len(".json")] not in payloads:
+            os.remove(os.path.join(directory, name))  # 삭제된 에피소드의 산출물 정리
+
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "source_hash": source_hash(data_dir),
+        "source_stats": source_stats(data_dir),
+        "built_at": time.time(),
+        "token_count_exact": prompts.is_token_count_exact(),
+        "episodes": compiled,
+    }
+    # 목록 파일은 에피소드별 파일 다음에 써서, 해시가 맞는 목록은 항상 완성된 에피소드 파일을 가리키게 함
+    _write_json(artifact_path, artifact)
+    return report
+
+
+def load_artifact(data_dir: str, artifact_path: str, verify_content: bool = False) -> dict | None:
+    """컴파일된 산출물 목록 로드 (없거나 형식 버전/원본이 다르면 None)
+
+    기본은 파일 크기/수정 시각만 비교해 에피소드 본문을 읽지 않는다 (지연 로딩 유지).
+    크기/수정 시각이 다르거나 verify_content이면 전체 내용 해시로 확인한다.
+    """
+    try:
+        with open(artifact_path, encoding="utf-8") as f:
+            artifact = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if artifact.get("format") != ARTIFACT_FORMAT or artifact.get("version") != ARTIFACT_VERSION:
+        return None
+    try:
+        unchanged = not verify_content and artifact.get("source_stats") == source_stats(data_dir)
+        if not unchanged and artifact.get("source_hash") != source_hash(data_dir):
+            return None
+    except OSError:
+        return None
+    artifact["payload_dir"] = payload_dir(artifact_path)
+    return artifact
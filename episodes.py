@@ -1,283 +1,185 @@
+import hashlib
+import json
+import os
+import threading
+from functools import cached_property
+
+from clue_matcher import ClueIndex
+from config import EPISODE_DATA_DIR, EPISODE_ARTIFACT_PATH
+from episode_artifact import load_artifact
+from prompts import compile_system_prompt, count_tokens
+
 # 에피소드 데이터 구조
 class Episode:
-    def __init__(self, title, question, clues, answer, hint_free=None, hint_paid=None):
+    """에피소드 메타데이터 (본문은 처음 접근할 때 데이터 파일에서 로드)"""
+
+    def __init__(self, episode_id, title, question, clue_count, path, compiled=None, payload_path=None):
+        self.id = episode_id
         self.title = title
         self.question = question
-        self.clues = clues  # 단서 리스트
-        self.answer = answer
-        self.hint_free = hint_free or []  # 무료 힌트 리스트
-        self.hint_paid = hint_paid or []  # 유료 힌트 리스트
-
-EPISODES = [
-    Episode(
-        title="바다거북수프",
-        question="""한 남자가 바닷가에 있는 고급 레스토랑에 들어간다. 그는 바다거북 수프를 주문한다.
-            바다거북 수프를 한 숟갈 떠먹은 그는 주방장을 불러 말한다.
-            "이거 정말로 바다거북 수프인가요?"
-            "네, 틀림없는 바다거북 수프 맞습니다."
-            남자는 계산을 마친 뒤 집에 돌아가서 자살한다.
-            왜 그랬을까?""",
-        clues=[
-            "남자는 과거에 조난을 당한 적이 있었다.",
-            "조난 상황에서 그는 '바다거북 수프'라 속은 인육 수프를 먹고 살아남았다.",
-            "레스토랑에서 진짜 바다거북 수프를 맛본 뒤, 과거 자신이 먹은 것이 인육임을 깨달았다."
-        ],
-        answer="""남자는 배를 타고 있었는데 남자가 탄 배가 조난되었다. 몇 명의 다른 사람들과 함께 구명보트를 타서 죽음은 면했지만, 작은 섬에 표류하는 처지가 되었다.
-식재료가 떨어진 일행은 체력이 떨어지는 사람부터 죽어가기 시작했다. 결국, 살아남은 사람들은 살기 위하여 시체의 살을 먹기 시작했지만, 단 한 남자만이 이 식인 행위를 강력하게 거부했다. 당연히 그 남자는 서서히 죽어가게 되었다.
-죽어가는 그를 그냥 두고 볼 수 없었던 다른 사람들은 인육으로 수프를 끓인 뒤, 남자에게 말했다.
-"바다거북을 사냥했어. 고기로 수프를 끓였으니 먹어봐. 당분간은 바다거북 수프로 연명하자."
-수프를 먹고 기력을 차린 남자는 구조될 때까지 살아남을 수 있었다.
-그 뒤 레스토랑에서 명백하게 맛이 전혀 다른 진짜 바다거북 수프를 직면하게 된 남자는 자신이 인육을 먹었다는 진실을 알게 된 뒤 죄책감에 목숨을 끊었다.""",
-        hint_free=["남자는 바다거북 수프를 이전에도 먹어본 적이 있습니다.",
-        "그에게 이 수프는 평범한 음식이 아닌 특별한 기억을 담고 있습니다.",
-        "남자의 과거에는 생존을 위한 절박한 순간이 있었습니다.",
-        "레스토랑에서 수프를 먹자마자 무언가 이상함을 느꼈습니다.",
-        "그는 과거에 극한의 상황에서 동료들과 함께 있었습니다."
-        ],
-        hint_paid=[
-            "맛의 차이가 그에게 충격적인 깨달음을 주었습니다.",
-            "과거에 누군가가 그를 살리기 위해 필요한 거짓을 말했습니다.",
-            "생존 상황에서 그가 모르는 사이에 선을 넘은 일이 있었습니다.",
-            "진실을 알게 된 그는 과거의 행동을 받아들일 수 없었습니다.",
-            "그가 믿었던 것과 실제는 완전히 다른 것이었습니다."
-        ]
-    ),
-   
-    
-    Episode(
-        title="손발을 자르는 산타",
-        question="""크리스마스의 밤, 어떤 아이가 산타에게 친구가 가지고 싶다는 소원을 빌며 잠들었습니다.
-다음 날 눈을 떠보니 아이의 오른손과 왼발이 절단된 채 침대에는 피 웅덩이가 생겨있었습니다.
-
-아이는 바로 병원으로 이송되어 어떻게든 목숨을 건질 수는 있었습니다.
-
-어째서 이런 일이 일어나게 된 걸까요?""",
-        clues=[
-            "아이는 태어날 때부터 오른손과 왼발이 하나씩 더 있는 기형이었다",
-            "소원을 계기로 산타가 밤사이 추가된 손과 발을 절단했다."
-        ],
-        answer="""아이는 선천적으로 오른손과 왼발을 하나 더 많은 기형아였다. 
-        주위의 아이들은 그 하나 더 많은 오른손과 왼손을 징그럽게 여겨 친구가 한 명도 없었다. 
-        그것을 해결하기 위해 절제 수술을 하고 싶었으나, 가난했기 때문에 수술 비용을 마련하지 못해 그대로 살 수밖에 없었다. 
-        그런 중에 크리스마스에 산타가 선물을 가지고 찾아온다는 이야기를 듣고 친구가 생겼으면 좋겠다고 소원을 빌었다. 
-        그러자 다음 날 아침, 그 아이의 오른손과 왼발이 절단되어 있었던 것이다. 
-        병원으로 옮겨져 목숨을 구한 그 아이는 주위의 아이들과 같은 신체가 될 수 있었으며, 그 후 친구도 많이 사귀게 되었습니다.""",
-        hint_free=[
-            "아이에게는 친구가 한 명도 없었습니다.",
-            "산타의 선물은 때로 우리가 예상하지 못한 형태로 옵니다.",
-            "아이가 친구를 사귀지 못한 이유는 외모와 관련이 있었습니다.",
-            "절단된 부위는 아이에게 있어서는 없어져도 되는 것이었습니다.",
-            "아이의 몸은 다른 아이들과 달랐고, 그것이 문제의 원인이었습니다."
-        ],
-        hint_paid=[
-            "아이는 태어날 때부터 특별한 신체적 특징을 가지고 있었습니다.",
-            "부모는 경제적 사정으로 아이를 위한 의료적 조치를 할 수 없었습니다.",
-            "절단 수술은 아이에게는 오히려 정상이 되는 길이었습니다.",
-            "오른손과 왼발이 잘린 것은 아이의 소원을 들어주는 방법이었습니다.",
-            "아이는 원래 일반적인 숫자보다 많은 것을 가지고 있었습니다."
-        ],
-    ),
-    Episode(
-        title="과학 실험",
-        question="""한 과학자가 중대한 실험을 했다. 결과는 대성공이었지만 다른 학자들이 전혀 반응을 하지 않았다. 왜그랬을까""",
-        clues=[
-            "과학자는 시간을 멈추는 실험에 성공했다."
-        ],
-        answer="""과학자가 진행한 실험은 '시간을 멈추는 것'이었다. 
-실험은 실제로 완벽하게 성공했기 때문에, 그 순간 세상의 모든 것이 정지했다. 
-즉 다른 학자들도 숨 쉬는 것조차 멈춘 상태였으므로, 실험이 성공했다는 사실을 인식하거나 반응할 수 없었던 것이다. 
-따라서 실험은 대성공이었지만, 그 성공을 알아줄 사람은 아무도 없었다.""",
-        hint_free=[
-            "실험의 성공과 반응의 부재는 직접적으로 연결되어 있습니다.",
-            "다른 학자들이 반응하지 '못한' 것일 수도 있습니다.",
-            "실험의 효과가 너무나 완벽했기 때문에 생긴 아이러니입니다.",
-            "실험이 성공한 순간, 과학자 외에는 아무도 움직일 수 없었습니다.",
-            "실험의 대상은 모든 것에 영향을 미치는 근본적인 요소였습니다."
-        ],
-        hint_paid=[
-            "이 실험은 물리학의 가장 기본적인 차원과 관련이 있습니다.",
-            "성공의 증거는 바로 '아무 일도 일어나지 않는 것'이었습니다.",
-            "과학자만이 실험 결과를 관찰할 수 있는 유일한 존재였습니다.",
-            "만약 실험 효과를 해제한다면, 그제서야 반응을 볼 수 있을 것입니다.",
-            "실험은 흐름을 멈추는 것과 관련이 있으며, 그것은 모든 존재에게 적용되었습니다."
-        ]
-    ),
-    Episode(
-        title="(생성)사라진 코드 리뷰",
-        question="""개발자 원석은 회사에서 중요한 프로젝트를 맡아 진행하고 있었습니다. 
-        그는 마감 기한 전에 열심히 코드를 작성했지만, 이상하게도 아무도 그의 작업에 대해 피드백을 주지 않았습니다.
-원석은 분명 코드 리뷰를 요청했는데도, 동료들은 전혀 반응을 보이지 않았습니다.
-왜 아무도 코드 리뷰를 하지 않았을까요?""",
-        clues=[
-            "원석은 코드를 로컬 저장소에만 커밋했다."
-        ],
-        answer="""원석은 깃허브에 코드를 올렸다고 착각했지만, 실제로는 로컬 저장소에만 커밋해 둔 상태였다. 
-        그래서 동료들은 그의 코드를 확인할 수 없었고, 당연히 코드 리뷰도 이뤄지지 않았다. 
-        결국 아무도 반응하지 않은 이유는 원석이 푸시를 하지 않았기 때문이다.""",
-        hint_free=[
-            "원석은 자신이 모든 절차를 제대로 했다고 믿고 있었습니다.",
-            "동료들은 원석의 코드를 보고 싶어도 볼 수 없는 상황이었습니다.",
-            "개발자라면 누구나 한 번쯤 겪는 실수와 관련이 있습니다.",
-            "원석의 작업은 분명 저장되어 있었지만, 다른 사람들과 공유되지 않았습니다.",
-            "원석은 버전 관리 시스템의 중요한 단계를 놓쳤습니다."
-        ],
-        hint_paid=[
-            "코드는 원석의 컴퓨터에만 존재하고 있었습니다.",
-            "원석은 'commit'은 했지만 더 중요한 것을 잊었습니다.",
-            "'저장소'라는 키워드가 문제의 핵심입니다.",
-            "동료들이 접근할 수 있는 곳에 코드가 업로드되지 않았습니다.",
-            "Git의 기본 명령어 중 하나를 실행하지 않은 것이 원인입니다."
-        ]
-    ),
-    Episode(
-        title="(생성)도망치는 아이",
-        question="""한 아이가 가만히 서서 무언가를 빤히 바라보더니, 갑자기 긴장한 얼굴을 한 채 곧장 반대편으로 전속력으로 달려가기 시작했습니다.
-        무슨 일이 있었던 걸까요?""",
-        clues=[
-            "아이는 계주 경기중이었다."
-        ],
-        answer="""아이의 시선 끝에는 같은 반 친구가 들고 있던 바통이 있었다.
-앞선 주자가 전력을 다해 달려와 바통을 내밀자, 그 순간을 기다리던 아이가 긴장된 얼굴로 뚫어져라 바라보다가, 드디어 바통을 받자마자 자기 구간을 전속력으로 달려나간 것이었다.
-즉, 아이는 계주 경기 중이었던 것이다.""",
-        hint_free=[
-            "아이는 도망친 것이 아니라 목적을 가지고 달렸습니다.",
-            "아이가 바라보던 것은 곧 자신에게 올 무언가였습니다.",
-            "이 상황에는 다른 사람들도 함께 참여하고 있었습니다.",   
-            "아이의 달리기는 규칙이 있는 활동의 일부였습니다.",
-            "아이는 자신의 차례를 기다리고 있었던 것입니다.",
-        ],
-        hint_paid=[
-            "주변에는 아이와 같은 목적으로 달리는 다른 아이들도 있었습니다.",
-            "아이가 받은 것은 다음 사람에게 전달해야 하는 것이었습니다.",
-            "이것은 팀으로 하는 스포츠 경기의 한 장면입니다.",
-            "아이는 무언가를 이어받아 달리기 시작했습니다.",
-            "여러 명이 순서대로 무엇을 하는 경기였습니다."
-        ]
-    ),
-    Episode(
-        title="(생성)거울",
-        question="""한 여자가 매일 아침 회사에 가기 전에 거울 앞에서 꼭 5분 이상을 서 있곤 했다.
-하지만 어느 날은 거울을 보자마자 바로 집 밖으로 뛰쳐나갔다.
-무슨 일이 있었던 걸까?""",
-        clues=[
-            "여자는 얼굴에 화상 흉터가 있었다",
-            "흉터가 사라져서 기쁜 나머지 집 밖으로 뛰쳐나갔다."
-        ],
-        answer="""여자는 매일 아침 화상을 입은 얼굴을 가리기 위해 정성스럽게 화장을 했다.
-그런데 그날 아침, 거울에 비친 자신의 얼굴에 화상이 전혀 보이지 않았던 것이다.
-그 순간, 치료약 실험에 참여했던 약이 드디어 효과를 낸 것을 깨닫고, 화장이 필요 없게 되었다는 사실이 너무 기뻐, 여자는 곧장 집 밖으로 뛰쳐나갔다.""",
-        hint_free=[
-            "여자가 매일 거울 앞에서 보낸 시간에는 특별한 이유가 있었습니다.",
-            "그날은 거울에 비친 모습이 평소와 달랐습니다.",
-            "여자는 오랫동안 숨기고 싶었던 것이 있었습니다.",
-            "거울을 보고 뛰쳐나간 것은 기쁨 때문이었습니다.",
-            "평소 5분이 걸리던 일이 더 이상 필요 없게 되었습니다."      
-          ],
-        hint_paid=[
-            "여자는 외모와 관련된 고민을 가지고 있었습니다.",
-            "매일 아침 거울 앞에서 하던 일은 무언가를 감추기 위한 것이었습니다.",
-            "여자의 얼굴에는 남들에게 보이고 싶지 않은 흔적이 있었습니다.",
-            "그날 아침, 오랫동안 기다려온 변화가 일어났습니다.",
-            "치료의 결과가 드디어 나타난 순간이었습니다."
-        ]
-    ),
-    Episode(
-        title="(생성)버스 정류장",
-        question="""한 남자가 버스 정류장에서 버스를 기다리다가, 버스가 오자 갑자기 표정이 굳더니 탑승하지 않고 걸어가 버렸다. 무슨 일이 있었던 걸까?""",
-        clues=[
-            "남자의 아내가 낯선 남자와 다정히 같은 버스에 있었다."
-        ],
-        answer="""남자는 매일 같은 버스를 타고 회사로 출근했다. 
-        하지만 그날 아침, 다가온 버스의 창문에 그의 아내와 낯선 남자가 다정하게 앉아 있는 모습이 비쳤다. 
-        그 사실을 확인한 순간, 남자는 차마 버스를 탈 수 없었고 그냥 걸어서 떠나버렸다.""",
-        hint_free=[
-            "남자는 버스 안에서 충격적인 무언가를 목격했습니다.",
-            "버스를 타지 않은 것은 누군가를 피하기 위해서였습니다.",
-            "남자가 본 것은 그가 알고 있는 사람과 관련이 있었습니다.",
-            "버스 안에는 남자와 가까운 사람이 타고 있었습니다.",
-            "그 사람은 남자가 생각했던 곳에 있어야 할 사람이 아니었습니다.",
-        ],
-        hint_paid=[
-            "버스 안의 두 사람이 함께 있는 모습이 문제였습니다.",
-            "남자에게 가장 소중한 사람이 예상치 못한 상황에 있었습니다.",
-            "남자는 배신감을 느낀 순간이었습니다.",
-            "버스 안의 두 사람은 너무나 친밀해 보였습니다.",
-            "남자의 가족이 다른 이성과 함께 있는 장면을 목격한 것입니다.",
-        ]
-    ),
-    Episode(
-        title="경찰의 죽음",
-        question="""경찰들이 살인마를 쫓고 있었다. 
-        그는 쫓기다가 결국 옥상에서 자의로 떨어져 죽었다. 
-        3일 뒤, 추격에 참여한 경찰 중 한 명이 죽었다. 
-        그러나 경찰을 죽인 자는 처벌받지 못했다. 
-        왜 그랬을까?""",
-        clues=[
-            "쫓기던 사람은 실제로는 무고한 사람이었다.",
-            "경찰을 죽인 사람은 죽은 사람과 가족 관계였다.",
-            "경찰들은 범인을 알고 있지만 자신들의 실수를 숨기기 위해 사건을 덮었다."
-        ],
-        answer="""살인자는 누명을 썼다. 
-        경찰들은 선임의 실적을 위해 부실한 단서로 그를 범인으로 몰아세웠다. 
-        그는 경찰에게 쫓기다가 죽었고, 그 이후에 범인이 아니라는 사실이 경찰 내부에서 밝혀졌다. 
-        누명쓴 자의 아버지는 그가 누명을 썼다는 것을 알았다. 
-        오랫동안 자신의 아들은 살인마가 아니라고 주장해왔지만 모든 의견은 묵살되었다. 
-        결국 그는 자신의 아들을 잃었다. 
-        3일동안 장례식을 한 후 자신의 아들을 살인마로 누명씌운 결정적 원인인 담당 경찰을 죽였다.
-        경찰들은 범인을 알지만, 그 사건을 들추면 자신들의 무지한 수사로 선량한 시민 한명을 죽음으로 몰아넣었다는 것이 밝혀지게 된다. 
-        그들은 자신들이 받을 피해와 비방이 두려워 사건을 덮기로 결심했다.""",
-        hint_free=[    
-        "죽은 살인마에 대한 진실이 숨겨져 있습니다.",
-        "경찰들이 사건을 해결하지 못한 데는 특별한 이유가 있었습니다.",
-        "3일이라는 시간은 특별한 의미를 가지고 있습니다.",
-        "경찰을 죽인 사람은 깊은 원한을 품고 있었습니다.",
-        "경찰들은 과거에 자신들이 저지른 잘못이 있었습니다."
-        ],
-        hint_paid=[
-        "첫 번째 죽은 사람의 정체에 의문을 가져볼 필요가 있습니다.",
-        "누군가는 억울한 죽음에 대한 복수를 했습니다.",
-        "경찰들은 범인을 알면서도 침묵을 선택했습니다.",
-        "경찰들의 침묵은 조직의 치부를 감추기 위한 것이었습니다.",
-        "경찰의 죽음은 개인적인 원한에서 비롯되었습니다."
-        ]
-    ),
-    Episode(
-        title="할아버지의 목걸이",
-        question="""어린아이는 독실한 기독교 집안에서 자랐다.
-할아버지 생신을 맞아 집을 방문한 아이는, 보물창고에서 반짝이는 목걸이를 발견하고 아버지에게 물었다.
-
-“아빠, 할아버지는 불교신자예요?”
-
-그날 이후, 아이는 다시는 할아버지를 볼 수 없었다.
-
-왜 그랬을까?""",
-        clues=[
-            "목걸이는 나치 문양이 새겨진 훈장이었다.",
-            "할아버지는 사실 나치 전범이었다.",
-            "할아버지는 아버지에게 잡혀갔다.",
-            "아버지는 국제 경찰이었다."
-        ],
-        answer="""그 반짝이는 목걸이는 불교 장신구가 아니었다. 정교하게 새겨진 문양은 다름 아닌 나치의 상징이었다.
-그리고 아빠는 사실 숨겨진 나치 전범을 찾는 국제 경찰이었다.
-아무 뜻 없이 던진 아이의 질문은 곧 의심의 불씨가 되었고, 숨죽여 살아오던 할아버지의 과거는 순식간에 드러났다.
-그날 이후, 오랫동안 은신해온 그는 더 이상 가족 곁으로 돌아오지 못했다.""",
-        hint_free=[    
-        "아이가 본 문양은 불교와는 전혀 관련이 없었습니다.",
-        "아버지는 평범한 직업을 가진 사람이 아니었습니다.",
-        "할아버지와 아버지 사이에는 숨겨진 긴장감이 있었습니다.",
-        "아이의 질문이 아버지에게 결정적인 단서를 제공했습니다.",
-        "할아버지는 가족조차 모르는 어두운 과거를 가지고 있었습니다."
-        ],
-        hint_paid=[
-        "아버지의 진짜 직업은 정의를 추구하는 일과 관련이 있었습니다.",
-        "아버지는 오랫동안 추적해온 대상이 가족 안에 있다는 것을 깨달았습니다.",
-        "목걸이의 문양은 20세기 최악의 전쟁 범죄와 연결되어 있었습니다.",
-        "할아버지는 국제적으로 수배 중인 인물이었습니다.",
-        "아버지의 임무와 가족에 대한 애정 사이에서 선택해야 하는 순간이 왔습니다."
-        ]
-    ),
-
-]
-
-# 에피소드 제목 리스트 (선택용)
-EPISODE_TITLES = [episode.title for episode in EPISODES]
+        self.clue_count = clue_count  # 본문을 읽지 않고 미리보기에 표시할 단서 개수
+        self._path = path
+        self._body = None
+        self._lock = threading.Lock()
+        self._compiled = compiled  # 컴파일된 산출물 목록의 미리 계산한 값 (없으면 런타임에 계산)
+        self._payload_path = payload_path  # 컴파일된 색인 파일 (본문처럼 처음 필요할 때 로드)
+        self._payload = None
+
+    def _load_body(self):
+        """긴 본문(단서/정답/힌트) 로드"""
+        if self._body is None:
+            with self._lock:
+                if self._body is None:
+                    with open(self._path, encoding="utf-8") as f:
+                        self._body = json.load(f)
+        return self._body
+
+    def _load_payload(self):
+        """컴파일된 색인 로드 (산출물이 없으면 None)"""
+        if self._payload is None and self._payload_path is not None:
+            with self._lock:
+                if self._payload is None and self._payload_path is not None:
+                    try:
+                        with open(self._payload_path, encoding="utf-8") as f:
+                            self._payload = json.load(f)
+                    except (OSError, json.JSONDecodeError):
+                        self._payload_path = None  # 색인 파일이 없으면 런타임에 계산
+        return self._payload
+
+    @property
+    def is_loaded(self):
+        return self._body is not None
+
+    @property
+    def clues(self):
+        return self._load_body()["clues"]  # 단서 리스트
+
+    @property
+    def answer(self):
+        return self._load_body()["answer"]
+
+    @property
+    def hint_free(self):
+        return self._load_body().get("hint_free", [])  # 무료 힌트 리스트
+
+    @property
+    def hint_paid(self):
+        return self._load_body().get("hint_paid", [])  # 유료 힌트 리스트
+
+    # 시스템 프롬프트는 본문 로드 후 한 번만 생성 (요청마다 같은 바이트 → 프롬프트 캐시 적중)
+    @cached_property
+    def system_prompt(self):
+        return compile_system_prompt(self.question, self.answer, self.clues)
+
+    @cached_property
+    def prompt_hash(self):
+        """시스템 프롬프트 내용 해시 (판정 캐시 키용)"""
+        return hashlib.sha256(self.system_prompt.encode("utf-8")).hexdigest()
+
+    @cached_property
+    def prompt_tokens(self):
+        if self._compiled is not None:
+            return self._compiled["prompt_tokens"]
+        return count_tokens(self.system_prompt)
+
+    @cached_property
+    def clue_index(self):
+        payload = self._load_payload()
+        if payload is not None:
+            return ClueIndex.from_dict(self.clues, payload["clue_index"])
+        return ClueIndex(self.clues)  # 단서 매칭용 색인
+
+    @cached_property
+    def similarity_index(self):
+        """단서/힌트 해시 n-gram 벡터 색인 (NumPy가 없으면 None)"""
+        # NumPy는 첫 화면에 필요 없으므로 처음 조사할 때 로드
+        from similarity_index import SimilarityIndex, is_available
+
+        if not is_available():
+            return None
+        payload = self._load_payload()
+        if payload is not None and payload["similarity"] is not None:
+            return SimilarityIndex.from_dict(self.clues, payload["similarity"])
+        return SimilarityIndex(self.clues, self.hint_free + self.hint_paid)
+
+
+class EpisodeRepository:
+    """에피소드 저장소 - 목록 파일의 메타데이터만 미리 읽고 제목으로 O(1) 조회
+
+    컴파일된 산출물이 원본과 같으면 그 메타데이터와 미리 계산한 토큰 수를 쓰고, 색인은 에피소드별 파일에서 처음 필요할 때 읽는다.
+    """
+
+    def __init__(self, data_dir, artifact_path=None):
+        self.data_dir = data_dir
+        self._episodes = []
+        self._by_title = {}
+        self._by_id = {}
+
+        artifact = load_artifact(data_dir, artifact_path) if artifact_path else None
+        self.compiled = artifact is not None
+        if artifact is not None:
+            entries = artifact["episodes"]
+        else:
+            with open(os.path.join(data_dir, "index.json"), encoding="utf-8") as f:
+                entries = json.load(f)["episodes"]
+
+        for meta in entries:
+            episode = Episode(
+                episode_id=meta["id"],
+                title=meta["title"],
+                question=meta["question"],
+                clue_count=meta["clue_count"],
+                path=os.path.join(data_dir, f"{meta['id']}.json"),
+                compiled=meta if artifact is not None else None,
+                payload_path=os.path.join(artifact["payload_dir"], f"{meta['id']}.json") if artifact is not None else None,
+            )
+            self._episodes.append(episode)
+            self._by_title[episode.title] = episode
+            self._by_id[episode.id] = episode
+
+    def __len__(self):
+        return len(self._episodes)
+
+    def __iter__(self):
+        return iter(self._episodes)
+
+    def all(self):
+        """전체 에피소드 목록 (목록 파일 순서)"""
+        return list(self._episodes)
+
+    def titles(self):
+        """에피소드 제목 목록"""
+        return [episode.title for episode in self._episodes]
+
+    def get(self, title):
+        """제목으로 에피소드 조회 (없으면 None)"""
+        return self._by_title.get(title)
+
+    def get_by_id(self, episode_id):
+        """ID로 에피소드 조회 (없으면 None)"""
+        return self._by_id.get(episode_id)
+
+
+# 전역 에피소드 저장소
+episode_repository = EpisodeRepository(EPISODE_DATA_DIR, EPISODE_ARTIFACT_PATH)
+
+EPISODES = episode_repository.all()
+EPISODE_TITLES = episode_repository.titles()
+
+
+def get_episode(title):
+    """제목으로 에피소드 조회"""
+    return episode_repository.get(title)
+
+
+def get_episode_by_id(episode_id):
+    """ID로 에피소드 조회 (저장된 게임 복원용)"""
+    return episode_repository.get_by_id(episode_id)
+
+
+def get_prompt_token_report():
+    """에피소드별 시스템 프롬프트 토큰 수 반환"""
+    return [
+        {"title": episode.title, "prompt_tokens": episode.prompt_tokens}
+        for episode in EPISODES
+    ]
@@ -0,0 +1,307 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+from config import (
+    LLM_BACKEND,
+    LLM_CALL_DEADLINE_SECONDS,
+    LLM_MAX_ATTEMPTS,
+    LLM_RETRY_BASE_DELAY_SECONDS,
+    LLM_RETRY_MAX_DELAY_SECONDS,
+    STUB_LATENCY_DISTRIBUTION,
+    STUB_LATENCY_MEDIAN_MS,
+    STUB_LATENCY_SIGMA,
+    STUB_ERROR_RATE,
+    STUB_SEED,
+)
+from llm_client import (
+    create_chat_completion,
+    get_client_status,
+    is_retryable_error,
+    llm_breaker,
+    warm_up_client,
+)
+from metrics import record_llm_usage, record_openai_usage
+from prompts import count_tokens
+from resilience import DeadlineExceededError, call_with_retry
+from verdicts import Verdict
+
+
+class LLMBackend:
+    """investigate가 호출하는 AI 백엔드 인터페이스"""
+
+    name = "base"
+
+    def availability(self) -> tuple[bool, str]:
+        """사용 가능 여부와 불가능한 이유"""
+        return True, ""
+
+    def complete(self, messages, *, model, episode=None, reasoning_effort=None,
+                 response_format=None, max_output_tokens=None) -> str:
+        """전체 응답 텍스트 반환 (reasoning_effort는 지원하는 모델에만 전달)"""
+        raise NotImplementedError
+
+    def stream(self, messages, *, model, episode=None, reasoning_effort=None,
+               response_format=None, max_output_tokens=None):
+        """응답 텍스트 조각을 생성되는 대로 반환 (제너레이터를 닫으면 상위 스트림도 닫힘)"""
+        raise NotImplementedError
+
+    def warm_up(self) -> bool:
+        """연결 미리 열기 (필요 없는 백엔드는 아무것도 하지 않음)"""
+        return True
+
+
+class OpenAIBackend(LLMBackend):
+    """공유 클라이언트를 쓰는 OpenAI 백엔드"""
+
+    name = "openai"
+
+    def availability(self):
+        # 클라이언트(openai 패키지)는 첫 AI 호출 때 만들므로 여기서는 키 설정만 확인
+        return get_client_status()
+
+    def complete(self, messages, *, model, episode=None, reasoning_effort=None,
+                 response_format=None, max_output_tokens=None):
+        response = create_chat_completion(
+            model=model,
+            messages=messages,
+            **_request_options(reasoning_effort, response_format, max_output_tokens),
+        )
+        record_openai_usage(_episode_label(episode), model, response.usage)
+        return response.choices[0].message.content
+
+    def stream(self, messages, *, model, episode=None, reasoning_effort=None,
+               response_format=None, max_output_tokens=None):
+        # 제한 시간은 연결부터 마지막 조각까지 전체에 적용 (조각이 조금씩 계속 와도 끝없이 기다리지 않음)
+        deadline = time.monotonic() + LLM_CALL_DEADLINE_SECONDS
+        stream = create_chat_completion(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **_request_options(reasoning_effort, response_format, max_output_tokens),
+        )
+        # 읽기 제한 시간은 스트림을 열 때 정해지므로, 조각 사이에서 멈춘 읽기는 남은 시간이 지나면 스트림을 닫아 끊음
+        expired = threading.Event()
+        timeout_message = f"{LLM_CALL_DEADLINE_SECONDS:.0f}초 안에 응답을 받지 못했습니다."
+
+        def expire():
+            expired.set()
+            stream.close()
+
+        watchdog = threading.Timer(max(0.0, deadline - time.monotonic()), expire)
+        watchdog.daemon = True
+        watchdog.start()
+        chunks = []
+        usage_recorded = False
+        failed = False
+        try:
+            for chunk in stream:
+                if expired.is_set() or time.monotonic() > deadline:
+                    expired.set()
+                    break
+                if chunk.usage is not None:
+                    record_openai_usage(_episode_label(episode), model, chunk.usage)
+                    usage_recorded = True
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            if expired.is_set():
+                failed = True
+                raise DeadlineExceededError(timeout_message)
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            if expired.is_set():
+                # 감시 타이머가 닫은 스트림의 읽기 오류는 제한 시간 초과로 보고
+                failed = True
+                raise DeadlineExceededError(timeout_message) from e
+            failed = is_retryable_error(e)
+            raise
+        finally:
+            watchdog.cancel()
+            stream.close()
+            # 회로 차단기는 스트림을 연 시점이 아니라 끝난 시점에 기록 (전송 중 끊기거나 시간을 넘기면 실패)
+            if failed:
+                llm_breaker.record_failure()
+            else:
+                llm_breaker.record_success()
+            # 판정 문구 완성 후 조기 종료하면 usage 청크를 받지 못하므로 추정치로 기록
+            if not usage_recorded:
+                _record_estimated_usage(episode, model, messages, "".join(chunks))
+
+    def warm_up(self):
+        return warm_up_client()
+
+
+def _request_options(reasoning_effort, response_format, max_output_tokens):
+    """설정된 선택 인자만 API 요청에 포함"""
+    options = {}
+    if reasoning_effort:
+        options["reasoning_effort"] = reasoning_effort
+    if response_format:
+        options["response_format"] = response_format
+    if max_output_tokens:
+        options["max_completion_tokens"] = max_output_tokens
+    return options
+
+
+def _episode_label(episode):
+    return episode.title if episode is not None else ""
+
+
+def _record_estimated_usage(episode, model, messages, text):
+    if episode is not None:
+        # 시스템 프롬프트 토큰 수는 에피소드에 미리 계산되어 있음
+        prompt_tokens = episode.prompt_tokens + count_tokens(messages[-1]["content"])
+    else:
+        prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+    record_llm_usage(_episode_label(episode), model, prompt_tokens=prompt_tokens, completion_tokens=count_tokens(text))
+
+
+class StubUpstreamError(Exception):
+    """스텁 백엔드가 흉내 내는 일시적 상위 서비스 오류"""
+
+
+# 단서와 일치하지 않는 입력에 돌려줄 판정 코드 (입력 해시로 결정적으로 선택)
+_STUB_VERDICTS = ("yes", "no", "irrelevant", "likely", "unlikely", "ambiguous")
+
+
+# 묶음 판정 입력의 항목 ("[1] 질문")
+_STUB_BATCH_ITEM = re.compile(r"^\[(\d+)\] (.+)$", re.MULTILINE)
+
+
+class StubBackend(LLMBackend):
+    """네트워크 없이 동작하는 결정적 스텁 (부하 테스트/벤치마크용)
+
+    응답은 에피소드 단서 색인으로 규칙 기반 생성하고, 지연 시간과 오류율은 설정값을 따른다.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency_distribution="lognormal", latency_median_ms=800.0,
+                 latency_sigma=0.5, error_rate=0.0, seed=None):
+        self.latency_distribution = latency_distribution
+        self.latency_median_ms = latency_median_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def sample_latency(self) -> float:
+        """설정된 분포에서 응답 지연(초) 추출"""
+        with self._rng_lock:
+            if self.latency_distribution == "fixed":
+                latency_ms = self.latency_median_ms
+            elif self.latency_distribution == "uniform":
+                spread = self.latency_median_ms * self.latency_sigma
+                latency_ms = self._rng.uniform(self.latency_median_ms - spread, self.latency_median_ms + spread)
+            else:  # lognormal - 긴 꼬리를 가진 실제 API 지연과 비슷
+                latency_ms = self._rng.lognormvariate(0.0, self.latency_sigma) * self.latency_median_ms
+            return max(0.0, latency_ms) / 1000
+
+    def maybe_fail(self):
+        """설정된 오류율에 따라 일시적 오류 발생"""
+        with self._rng_lock:
+            failed = self._rng.random() < self.error_rate
+        if failed:
+            raise StubUpstreamError("스텁 백엔드 임의 오류")
+
+    @staticmethod
+    def verdict(user_input, episode) -> Verdict:
+        """단서 색인 기반 규칙 판정"""
+        if episode is not None:
+            clues = episode.clue_index.match(user_input)
+            if clues:
+                return Verdict("clue_found", "high", [episode.clues.index(clue) + 1 for clue in clues])
+        digest = hashlib.sha1(user_input.encode("utf-8")).digest()
+        return Verdict(_STUB_VERDICTS[digest[0] % len(_STUB_VERDICTS)])
+
+    @staticmethod
+    def answer(user_input, episode) -> str:
+        """판정 JSON 응답 (번호 목록 입력이면 묶음 판정)"""
+        items = _STUB_BATCH_ITEM.findall(user_input)
+        if items:
+            return json.dumps(
+                {"items": [StubBackend.verdict(item, episode).to_dict() for _, item in items]},
+                ensure_ascii=False,
+            )
+        return StubBackend.verdict(user_input, episode).to_json()
+
+    def _call(self, fn):
+        return call_with_retry(
+            lambda remaining: fn(),
+            breaker=llm_breaker,
+            deadline_seconds=LLM_CALL_DEADLINE_SECONDS,
+            max_attempts=LLM_MAX_ATTEMPTS,
+            base_delay=LLM_RETRY_BASE_DELAY_SECONDS,
+            max_delay=LLM_RETRY_MAX_DELAY_SECONDS,
+            is_retryable=lambda e: isinstance(e, StubUpstreamError),
+        )
+
+    def complete(self, messages, *, model, episode=None, reasoning_effort=None,
+                 response_format=None, max_output_tokens=None):
+        def attempt():
+            time.sleep(self.sample_latency())
+            self.maybe_fail()
+            return self.answer(messages[-1]["content"], episode)
+
+        text = self._call(attempt)
+        _record_estimated_usage(episode, model, messages, text)
+        return text
+
+    def stream(self, messages, *, model, episode=None, reasoning_effort=None,
+               response_format=None, max_output_tokens=None):
+        # 첫 토큰까지의 지연(연결+추론)은 재시도 대상, 이후 조각은 짧은 간격으로 전송
+        total = self.sample_latency()
+
+        def attempt():
+            time.sleep(total * 0.8)
+            self.maybe_fail()
+            return self.answer(messages[-1]["content"], episode)
+
+        text = self._call(attempt)
+        _record_estimated_usage(episode, model, messages, text)
+        pieces = [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+        for piece in pieces:
+            time.sleep(total * 0.2 / len(pieces))
+            yield piece
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_llm_backend(name: str) -> LLMBackend:
+    """설정 이름으로 백엔드 생성 ("openai" 또는 "stub")"""
+    if name == "openai":
+        return OpenAIBackend()
+    if name == "stub":
+        return StubBackend(
+            latency_distribution=STUB_LATENCY_DISTRIBUTION,
+            latency_median_ms=STUB_LATENCY_MEDIAN_MS,
+            latency_sigma=STUB_LATENCY_SIGMA,
+            error_rate=STUB_ERROR_RATE,
+            seed=STUB_SEED,
+        )
+    raise ValueError(f"알 수 없는 AI 백엔드입니다: {name}")
+
+
+def get_llm_backend() -> LLMBackend:
+    """프로세스 전역 백엔드 반환 (LLM_BACKEND 설정)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_llm_backend(LLM_BACKEND)
+    return _backend
+
+
+def set_llm_backend(backend: LLMBackend):
+    """백엔드 교체 (벤치마크/부하 테스트에서 스텁 주입용)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import config
+from config import (
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_KEEPALIVE_EXPIRY,
+    LLM_MODEL,
+    LLM_CALL_DEADLINE_SECONDS,
+    LLM_MAX_ATTEMPTS,
+    LLM_RETRY_BASE_DELAY_SECONDS,
+    LLM_RETRY_MAX_DELAY_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT_SECONDS,
+)
+from metrics import record_startup_phase
+from resilience import CircuitBreaker, call_with_retry
+
+# 프로세스 전역 OpenAI 클라이언트 (모든 세션이 하나의 커넥션 풀을 공유)
+_client = None
+_client_error = None
+_client_lock = threading.Lock()
+
+# 상위 서비스 상태 (모든 세션이 공유)
+llm_breaker = CircuitBreaker(
+    failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout_seconds=CIRCUIT_RESET_TIMEOUT_SECONDS,
+)
+
+# 재시도해도 되는 오류 (일시적인 연결/시간 초과/과부하, openai 로드 후 채움)
+_retryable_errors = ()
+
+
+def _import_openai():
+    """openai 패키지 로드 (import에 수백 ms가 걸리므로 첫 클라이언트 생성 때까지 미룸)"""
+    global _retryable_errors
+    started = time.perf_counter()
+    import openai
+
+    _retryable_errors = (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+    record_startup_phase("openai_import", time.perf_counter() - started)
+    return openai
+
+
+def get_client():
+    """공유 OpenAI 클라이언트 반환 (최초 호출 시 생성, 사용 불가하면 None)"""
+    global _client, _client_error
+
+    if _client is not None or _client_error is not None:
+        return _client
+
+    with _client_lock:
+        if _client is not None or _client_error is not None:
+            return _client
+
+        if not config.API_KEY_VALID:
+            _client_error = config.API_KEY_ERROR
+            return None
+
+        try:
+            openai = _import_openai()
+            import httpx
+
+            http_client = openai.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+                ),
+            )
+            # 재시도는 create_chat_completion에서 직접 처리
+            _client = openai.OpenAI(
+                api_key=OPENAI_API_KEY,
+                base_url=OPENAI_BASE_URL,
+                http_client=http_client,
+                max_retries=0,
+            )
+        except Exception as e:
+            _client_error = str(e)
+        return _client
+
+
+def get_client_status() -> tuple[bool, str]:
+    """클라이언트를 만들지 않고 사용 가능 여부 확인 (생성에 이미 실패했으면 그 이유)"""
+    if _client_error is not None:
+        return False, _client_error
+    if not config.API_KEY_VALID:
+        return False, config.API_KEY_ERROR
+    return True, ""
+
+
+def get_client_error() -> str | None:
+    """클라이언트를 만들 수 없었던 이유 반환"""
+    get_client()
+    return _client_error
+
+
+def warm_up_client() -> bool:
+    """가벼운 요청으로 DNS/TLS 연결을 미리 열어 풀에 유지"""
+    client = get_client()
+    if client is None:
+        return False
+
+    try:
+        client.with_options(timeout=10.0, max_retries=0).models.retrieve(LLM_MODEL)
+        return True
+    except Exception:
+        return False  # 워밍업 실패는 첫 요청이 조금 느려질 뿐 치명적이지 않음
+
+
+def is_retryable_error(error: Exception) -> bool:
+    return isinstance(error, _retryable_errors)
+
+
+def create_chat_completion(**kwargs):
+    """제한 시간/재시도/회로 차단기를 거쳐 chat.completions.create 호출"""
+    client = get_client()
+    if client is None:
+        raise RuntimeError(get_client_error())
+    return call_with_retry(
+        lambda remaining: client.chat.completions.create(timeout=remaining, **kwargs),
+        breaker=llm_breaker,
+        deadline_seconds=LLM_CALL_DEADLINE_SECONDS,
+        max_attempts=LLM_MAX_ATTEMPTS,
+        base_delay=LLM_RETRY_BASE_DELAY_SECONDS,
+        max_delay=LLM_RETRY_MAX_DELAY_SECONDS,
+        is_retryable=is_retryable_error,
+        record_success=not kwargs.get("stream"),  # 스트림은 끝까지 받은 뒤 호출자가 기록
+    )
+
+
+def get_llm_health() -> dict:
+    """AI 호출 계층 상태 반환 (app.py 장애 배너용)"""
+    return llm_breaker.get_state()
@@ -0,0 +1,351 @@
+import os
+import threading
+import time
+
+from config import (
+    METRICS_FILE,
+    METRICS_FILE_INTERVAL_SECONDS,
+    LLM_PRICE_INPUT_PER_MTOK,
+    LLM_PRICE_CACHED_INPUT_PER_MTOK,
+    LLM_PRICE_OUTPUT_PER_MTOK,
+    LLM_SMALL_MODEL,
+    LLM_SMALL_PRICE_INPUT_PER_MTOK,
+    LLM_SMALL_PRICE_CACHED_INPUT_PER_MTOK,
+    LLM_SMALL_PRICE_OUTPUT_PER_MTOK,
+)
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """증가만 하는 카운터 (레이블별)"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return dict(self._values)
+
+    def summary(self):
+        """레이블별 값 목록 (관리자 페이지용)"""
+        return [
+            dict(zip(self.label_names, key), value=value)
+            for key, value in sorted(self.samples().items())
+        ]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.samples().items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """현재 값을 기록하는 게이지 (레이블별)"""
+
+    def set(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    """누적 구간 히스토그램 (레이블별)"""
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._values = {}  # 레이블 -> [구간별 개수, 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        """레이블별 (구간별 개수, 합계, 개수)"""
+        with self._lock:
+            return {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+
+    def summary(self):
+        """레이블별 개수/평균/근사 p95 (관리자 페이지용)"""
+        rows = []
+        for key, (counts, total, count) in sorted(self.samples().items()):
+            p95 = float("inf")
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                if cumulative >= count * 0.95:
+                    p95 = bound
+                    break
+            row = dict(zip(self.label_names, key))
+            row.update({"count": count, "mean": total / count if count else 0.0, "p95_le": p95})
+            rows.append(row)
+        return rows
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.samples().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """프로세스 전역 지표 모음 (Prometheus 텍스트 형식으로 내보내기)"""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+        self._last_file_write = 0.0
+
+    def counter(self, name, help_text, label_names=()):
+        metric = Counter(name, help_text, label_names)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, label_names=()):
+        metric = Gauge(name, help_text, label_names)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help_text, label_names, buckets)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str):
+        """지표 파일 원자적 갱신 (node_exporter textfile collector 등에서 수집)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def maybe_write_file(self):
+        """METRICS_FILE이 설정된 경우 일정 간격으로만 파일 갱신"""
+        if not METRICS_FILE:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_file_write < METRICS_FILE_INTERVAL_SECONDS:
+                return
+            self._last_file_write = now
+        try:
+            self.write_file(METRICS_FILE)
+        except OSError:
+            pass  # 지표 내보내기 실패는 게임 진행에 영향을 주지 않음
+
+
+metrics = MetricsRegistry()
+
+# 핫패스 지표
+LLM_REQUEST_SECONDS = metrics.histogram(
+    "turtle_llm_request_seconds", "AI 호출 지연 시간", ("episode", "backend", "model", "outcome"))
+LLM_TOKENS = metrics.counter(
+    "turtle_llm_tokens_total", "AI 호출 토큰 수", ("episode", "model", "kind"))
+LLM_COST_USD = metrics.counter(
+    "turtle_llm_cost_usd_total", "추정 AI 비용 (USD)", ("episode", "model"))
+CLUE_MATCH_SECONDS = metrics.histogram(
+    "turtle_clue_match_seconds", "단서 판정 처리 시간", ("episode",))
+PAGE_RENDER_SECONDS = metrics.histogram(
+    "turtle_page_render_seconds", "app.py 스크립트 실행 시간", ("state",))
+VERDICT_CACHE_LOOKUPS = metrics.counter(
+    "turtle_verdict_cache_lookups_total", "판정 캐시 조회", ("episode", "result"))
+MODEL_CASCADE_ROUTES = metrics.counter(
+    "turtle_model_cascade_routes_total", "모델 캐스케이드 경로별 판정 수", ("episode", "tier", "route"))
+SESSION_RESUME_SECONDS = metrics.histogram(
+    "turtle_session_resume_seconds", "저장된 게임 복원/새 세션 시작 시간", ("outcome",))
+COALESCED_REQUESTS = metrics.counter(
+    "turtle_coalesced_requests_total", "다른 세션의 진행 중인 AI 호출을 공유한 판정 수", ("episode", "outcome"))
+PREWARM_RUNS = metrics.counter(
+    "turtle_prewarm_runs_total", "에피소드 선택 시 사전 준비 결과", ("episode", "outcome"))
+FIRST_LLM_CALL_SECONDS = metrics.histogram(
+    "turtle_first_llm_call_seconds", "게임의 첫 AI 호출 지연 시간 (호출 시작 시점의 연결 사전 준비 상태별)", ("prewarm",))
+UPSTREAM_QUEUE_DEPTH = metrics.gauge(
+    "turtle_upstream_queue_depth", "AI 호출 차례를 기다리는 요청 수")
+UPSTREAM_IN_FLIGHT = metrics.gauge(
+    "turtle_upstream_in_flight", "진행 중인 AI 호출 수")
+UPSTREAM_TOKENS_LAST_MINUTE = metrics.gauge(
+    "turtle_upstream_tokens_last_minute", "최근 1분 동안 예약한 AI 호출 토큰 수 (추정)")
+UPSTREAM_QUEUE_WAIT_SECONDS = metrics.histogram(
+    "turtle_upstream_queue_wait_seconds", "AI 호출 차례를 기다린 시간", ("outcome",))
+STARTUP_SECONDS = metrics.histogram(
+    "turtle_startup_seconds", "프로세스 시작 단계별 소요 시간 (단계마다 프로세스당 1회)", ("phase",))
+
+# 프로세스 시작 단계 -> 소요 시간 (관리자 페이지 리포트용)
+_startup_phases = {}
+_startup_lock = threading.Lock()
+
+
+def estimate_cost(prompt_tokens, completion_tokens, cached_tokens=0, model=None) -> float:
+    """토큰 수로 비용(USD) 추정 (추론 토큰은 completion_tokens에 포함되어 출력 단가로 과금)"""
+    if model == LLM_SMALL_MODEL:
+        prices = (LLM_SMALL_PRICE_INPUT_PER_MTOK, LLM_SMALL_PRICE_CACHED_INPUT_PER_MTOK, LLM_SMALL_PRICE_OUTPUT_PER_MTOK)
+    else:
+        prices = (LLM_PRICE_INPUT_PER_MTOK, LLM_PRICE_CACHED_INPUT_PER_MTOK, LLM_PRICE_OUTPUT_PER_MTOK)
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (uncached * prices[0] + cached_tokens * prices[1] + completion_tokens * prices[2]) / 1_000_000
+
+
+def record_llm_usage(episode, model, prompt_tokens=0, completion_tokens=0, reasoning_tokens=0, cached_tokens=0):
+    """AI 호출 1회의 토큰 사용량과 추정 비용 기록"""
+    LLM_TOKENS.inc(prompt_tokens, episode=episode, model=model, kind="prompt")
+    LLM_TOKENS.inc(cached_tokens, episode=episode, model=model, kind="cached_prompt")
+    LLM_TOKENS.inc(completion_tokens, episode=episode, model=model, kind="completion")
+    LLM_TOKENS.inc(reasoning_tokens, episode=episode, model=model, kind="reasoning")
+    LLM_COST_USD.inc(estimate_cost(prompt_tokens, completion_tokens, cached_tokens, model), episode=episode, model=model)
+
+
+def record_startup_phase(phase, seconds):
+    """시작 단계 소요 시간 기록 (같은 단계는 프로세스당 처음 한 번만)"""
+    with _startup_lock:
+        if phase in _startup_phases:
+            return
+        _startup_phases[phase] = seconds
+    STARTUP_SECONDS.observe(seconds, phase=phase)
+
+
+def startup_report() -> list[dict]:
+    """이 프로세스의 시작 단계별 소요 시간 (기록된 순서)"""
+    with _startup_lock:
+        return [{"phase": phase, "seconds": seconds} for phase, seconds in _startup_phases.items()]
+
+
+def record_openai_usage(episode, model, usage):
+    """OpenAI 응답의 usage 객체 기록 (없으면 무시)"""
+    if usage is None:
+        return
+    completion_details = getattr(usage, "completion_tokens_details", None)
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    record_llm_usage(
+        episode,
+        model,
+        prompt_tokens=usage.prompt_tokens or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        reasoning_tokens=getattr(completion_details, "reasoning_tokens", 0) or 0,
+        cached_tokens=getattr(prompt_details, "cached_tokens", 0) or 0,
+    )
+
+
+def cascade_hit_rates() -> dict:
+    """계층별 판정 비율 (작은 모델이 확정한 비율로 라우팅 기준 조정)"""
+    totals = {}
+    for (episode, tier, route), value in MODEL_CASCADE_ROUTES.samples().items():
+        totals[route] = totals.get(route, 0) + value
+    small_total = totals.get("accepted", 0) + totals.get("escalated", 0) + totals.get("error", 0)
+    all_total = sum(totals.values())
+    local_total = totals.get("local_hit", 0) + totals.get("local_duplicate", 0)
+    return {
+        "routes": totals,
+        "small_tier_hit_rate": totals.get("accepted", 0) / small_total if small_total else None,
+        "small_tier_share": totals.get("accepted", 0) / all_total if all_total else None,
+        "local_share": local_total / all_total if all_total else None,
+    }
+
+
+def prewarm_connection_gap() -> dict:
+    """연결을 미리 연 게임과 그렇지 않은 게임의 첫 AI 호출 평균 지연 차이
+
+    두 그룹은 질문/모델/경로가 섞여 있으므로 절약 시간의 정확한 측정이 아니라 연결 재사용 효과의 참고치다.
+    """
+    means = {row["prewarm"]: row for row in FIRST_LLM_CALL_SECONDS.summary()}
+    warm, cold = means.get("warm"), means.get("cold")
+    return {
+        "warm_mean_seconds": warm["mean"] if warm else None,
+        "cold_mean_seconds": cold["mean"] if cold else None,
+        "gap_seconds": cold["mean"] - warm["mean"] if warm and cold else None,
+        "samples": {state: row["count"] for state, row in means.items()},
+    }
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """로컬 /metrics 엔드포인트를 백그라운드 스레드로 실행 (http.server는 이때 로드)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,62 @@
+import re
+
+from clue_matcher import normalize_text
+from config import (
+    LLM_MODEL,
+    LLM_CASCADE_ENABLED,
+    LLM_SMALL_MODEL,
+    LLM_SMALL_REASONING_EFFORT,
+    CASCADE_CLUE_SCORE_THRESHOLD,
+    CASCADE_ACCEPTED_VERDICTS,
+)
+
+TIER_SMALL = "small"
+TIER_LARGE = "large"
+TIER_LOCAL = "local"  # AI 호출 없이 로컬 유사도 색인으로 확정
+
+# 의문문 어미 ("?" 없이 입력한 질문도 구분)
+_QUESTION_ENDING = re.compile(r"(나요|까요|니까|가요|인가|는가|은가|던가|죠|지요|냐|니|래요|을까)$")
+
+
+def is_question(text: str) -> bool:
+    """입력이 질문인지 확인 (질문이 아니면 정답 시도로 봄)"""
+    if text.strip().endswith("?"):
+        return True
+    words = normalize_text(text).split()
+    return bool(words) and _QUESTION_ENDING.search(words[-1]) is not None
+
+
+class ModelRouter:
+    """입력마다 작은 모델/큰 모델 중 첫 시도 계층을 고르는 라우터 (모델 캐스케이드)
+
+    단서와 겹치는 입력이나 정답 시도는 바로 큰 모델로 보내고, 나머지 단순 질문은
+    작은 모델이 먼저 판정한다. 작은 모델의 판정이 확신할 수 있는 판정 코드가 아니면 큰 모델로 넘긴다.
+    """
+
+    def __init__(self, small_model=LLM_SMALL_MODEL, large_model=LLM_MODEL, enabled=LLM_CASCADE_ENABLED,
+                 clue_score_threshold=CASCADE_CLUE_SCORE_THRESHOLD, accepted_verdicts=CASCADE_ACCEPTED_VERDICTS,
+                 small_reasoning_effort=LLM_SMALL_REASONING_EFFORT):
+        self.small_model = small_model
+        self.large_model = large_model
+        self.enabled = enabled
+        self.clue_score_threshold = clue_score_threshold
+        self.accepted_verdicts = frozenset(accepted_verdicts)
+        self.small_reasoning_effort = small_reasoning_effort
+
+    def first_tier(self, episode, user_input) -> tuple[str, str]:
+        """첫 시도 계층과 그 이유"""
+        if not self.enabled or self.small_model == self.large_model:
+            return TIER_LARGE, "disabled"
+        if not is_question(user_input):
+            return TIER_LARGE, "answer_attempt"
+        scores = episode.clue_index.score(user_input)
+        if scores and scores[0][1] >= self.clue_score_threshold:
+            return TIER_LARGE, "clue_overlap"
+        return TIER_SMALL, "simple_question"
+
+    def accepts(self, verdict) -> bool:
+        """작은 모델 판정을 그대로 써도 되는지 확인 (중요한 질문으로 본 판정은 큰 모델이 다시 판정)"""
+        return verdict.verdict in self.accepted_verdicts and verdict.importance == "normal"
+
+
+model_router = ModelRouter()
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque
+
+from config import (
+    PREWARM_ON_SELECT,
+    PREWARM_MAX_CONCURRENT,
+    PREWARM_MAX_PER_MINUTE,
+    PREWARM_EPISODE_COOLDOWN_SECONDS,
+)
+from llm_backends import get_llm_backend
+from llm_client import get_llm_health
+from metrics import PREWARM_RUNS, FIRST_LLM_CALL_SECONDS
+from security import security_manager
+
+
+class EpisodePrewarmer:
+    """에피소드 선택 시 백그라운드에서 상위 연결을 미리 열어 첫 질문의 DNS/TLS 연결 지연을 줄임
+
+    연결만 열고 프롬프트는 보내지 않는다 (시스템 프롬프트가 제공자의 프롬프트 캐시 최소 길이보다 짧아 채울 수 없음).
+    사전 준비는 플레이어의 요청 수에 포함하지 않는다. 대신 요청 한도에 걸린 세션은 준비를 시작할 수 없고,
+    프로세스 전체의 동시 실행 수/분당 횟수와 에피소드별 재준비 간격으로 상위 호출량을 제한한다.
+    """
+
+    def __init__(self, enabled=PREWARM_ON_SELECT, max_concurrent=PREWARM_MAX_CONCURRENT,
+                 max_per_minute=PREWARM_MAX_PER_MINUTE, cooldown_seconds=PREWARM_EPISODE_COOLDOWN_SECONDS):
+        self.enabled = enabled
+        self.max_concurrent = max_concurrent
+        self.max_per_minute = max_per_minute
+        self.cooldown_seconds = cooldown_seconds
+        self._running = 0
+        self._recent = deque()  # 최근 1분 동안 시작한 시각
+        self._episodes = {}  # 에피소드 제목 -> [시작 시각, 완료 시각(진행 중이면 None), 성공 여부]
+        self._lock = threading.Lock()
+
+    def schedule(self, episode, session_id) -> bool:
+        """사전 준비를 백그라운드로 시작 (제한에 걸리거나 이미 준비된 에피소드면 False)"""
+        if not self.enabled:
+            return False
+        reason = self._check_caller(session_id)
+        if reason is None:
+            reason = self._reserve(episode.title, time.perf_counter())
+        if reason is not None:
+            PREWARM_RUNS.inc(episode=episode.title, outcome=reason)
+            return False
+        threading.Thread(target=self._run, args=(episode,), name="episode-prewarm", daemon=True).start()
+        return True
+
+    @staticmethod
+    def _check_caller(session_id):
+        """요청 한도에 걸린 세션이나 회로가 열린 상태에서는 준비하지 않음 (요청 수는 기록하지 않고 확인만)"""
+        is_allowed, _ = security_manager.check_rate_limit(session_id)
+        if not is_allowed:
+            return "skipped_rate_limit"
+        if get_llm_health()["state"] != "closed":
+            return "skipped_circuit"
+        return None
+
+    def _reserve(self, title, now):
+        with self._lock:
+            entry = self._episodes.get(title)
+            if entry is not None and (entry[1] is None or (entry[2] and now - entry[1] < self.cooldown_seconds)):
+                return "skipped_warm"
+            if self._running >= self.max_concurrent:
+                return "skipped_busy"
+            while self._recent and now - self._recent[0] >= 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_per_minute:
+                return "skipped_budget"
+            self._recent.append(now)
+            self._running += 1
+            self._episodes[title] = [now, None, False]
+            return None
+
+    def _run(self, episode):
+        backend = get_llm_backend()
+        outcome = "failed"
+        try:
+            if backend.warm_up():
+                outcome = "connected"
+        except Exception:
+            pass  # 준비 실패는 첫 질문이 조금 느려질 뿐 치명적이지 않음
+        finally:
+            with self._lock:
+                self._running -= 1
+                entry = self._episodes.get(episode.title)
+                if entry is not None:
+                    entry[1] = time.perf_counter()
+                    entry[2] = outcome == "connected"
+            PREWARM_RUNS.inc(episode=episode.title, outcome=outcome)
+
+    def state_at(self, title, at) -> str:
+        """perf_counter 시각 at에 에피소드의 연결이 준비된 상태였는지 ("warm", "pending", "cold")"""
+        with self._lock:
+            entry = self._episodes.get(title)
+            entry = list(entry) if entry is not None else None
+        if entry is None or entry[0] > at:
+            return "cold"
+        if entry[1] is None or entry[1] > at:
+            return "pending"
+        if entry[2] and at - entry[1] < self.cooldown_seconds:
+            return "warm"
+        return "cold"
+
+    def observe_first_call(self, title, started, seconds):
+        """게임의 첫 AI 호출 지연을 호출 시작 시점의 준비 상태별로 기록 (절약한 지연 계산용)"""
+        FIRST_LLM_CALL_SECONDS.observe(seconds, prewarm=self.state_at(title, started))
+
+    def get_stats(self) -> dict:
+        now = time.perf_counter()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "running": self._running,
+                "started_last_minute": sum(1 for started in self._recent if now - started < 60),
+                "episodes": len(self._episodes),
+            }
+
+
+# 프로세스 전역 사전 준비기 (모든 세션이 공유)
+episode_prewarmer = EpisodePrewarmer()
@@ -0,0 +1,233 @@
+import threading
+import time
+
+from sqlite_store import open_database
+
+# 제한 초과 사유 코드 (메시지는 SecurityManager가 만든다)
+BLOCKED = "blocked"
+SESSION_LIMIT = "session_limit"
+MINUTE_LIMIT = "minute_limit"
+
+
+class SessionWindow:
+    """세션별 요청 상태 (고정 버킷 2개로 근사한 슬라이딩 윈도우, 세션당 상수 메모리)"""
+    __slots__ = ("total", "window_start", "current", "previous", "last_seen", "blocked")
+
+    def __init__(self, now, total=0, window_start=None, current=0, previous=0, last_seen=None, blocked=False):
+        self.total = total                     # 세션 전체 요청 수
+        self.window_start = now if window_start is None else window_start  # 현재 버킷 시작 시각
+        self.current = current                 # 현재 버킷 요청 수
+        self.previous = previous               # 직전 버킷 요청 수
+        self.last_seen = now if last_seen is None else last_seen  # 마지막 요청 시각 (유휴 세션 정리용)
+        self.blocked = blocked
+
+    def roll(self, now, window_seconds):
+        """현재 시각 기준으로 버킷 이동"""
+        elapsed = int((now - self.window_start) // window_seconds)
+        if elapsed >= 1:
+            self.previous = self.current if elapsed == 1 else 0
+            self.current = 0
+            self.window_start += elapsed * window_seconds
+
+    def window_count(self, now, window_seconds):
+        """최근 1분 요청 수 추정 (직전 버킷은 겹치는 비율만큼 반영)"""
+        overlap = 1.0 - (now - self.window_start) / window_seconds
+        return self.previous * overlap + self.current
+
+    def evaluate(self, now, limits, count=1):
+        """count건을 더 받을 수 있는지 확인해 제한 초과 사유 코드 반환 (허용이면 None)"""
+        if self.blocked:
+            return BLOCKED
+        if self.total >= limits.max_requests_per_session:
+            self.blocked = True
+            return SESSION_LIMIT
+        # 묶음 요청은 마지막 건까지 한도 안에 들어와야 허용
+        if self.total + count - 1 >= limits.max_requests_per_session:
+            return SESSION_LIMIT
+        self.roll(now, limits.window_seconds)
+        if self.window_count(now, limits.window_seconds) + count - 1 >= limits.max_requests_per_minute:
+            return MINUTE_LIMIT
+        return None
+
+    def record(self, now, window_seconds, count=1):
+        self.roll(now, window_seconds)
+        self.total += count
+        self.current += count
+        self.last_seen = now
+
+
+class RateLimits:
+    """요청 제한 값 묶음"""
+    __slots__ = ("max_requests_per_session", "max_requests_per_minute", "window_seconds")
+
+    def __init__(self, max_requests_per_session, max_requests_per_minute, window_seconds=60.0):
+        self.max_requests_per_session = max_requests_per_session
+        self.max_requests_per_minute = max_requests_per_minute
+        self.window_seconds = window_seconds
+
+
+class RateLimitBackend:
+    """요청 제한 저장소 인터페이스"""
+
+    def check(self, session_id: str, now: float, limits: RateLimits) -> str | None:
+        """제한 확인만 (사유 코드 또는 None)"""
+        raise NotImplementedError
+
+    def record(self, session_id: str, now: float, limits: RateLimits, count: int = 1):
+        """요청 기록만"""
+        raise NotImplementedError
+
+    def check_and_record(self, session_id: str, now: float, limits: RateLimits, count: int = 1) -> str | None:
+        """확인과 기록을 하나의 원자적 연산으로 수행 (count건을 한 번에)"""
+        raise NotImplementedError
+
+    def get_state(self, session_id: str) -> SessionWindow | None:
+        """세션 상태 조회 (없으면 None)"""
+        raise NotImplementedError
+
+    def reset(self, session_id: str):
+        """세션 상태 삭제"""
+        raise NotImplementedError
+
+    def sweep(self, cutoff: float) -> int:
+        """cutoff 이전부터 요청이 없는 세션 삭제 후 삭제 수 반환"""
+        raise NotImplementedError
+
+    def session_count(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """프로세스 내부 메모리 저장소 (기본값)"""
+
+    def __init__(self):
+        self._sessions = {}  # 세션 ID -> SessionWindow
+        self._lock = threading.Lock()
+
+    def check(self, session_id, now, limits):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            return state.evaluate(now, limits) if state is not None else None
+
+    def record(self, session_id, now, limits, count=1):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = SessionWindow(now)
+            state.record(now, limits.window_seconds, count)
+
+    def check_and_record(self, session_id, now, limits, count=1):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = SessionWindow(now)
+            reason = state.evaluate(now, limits, count)
+            if reason is None:
+                state.record(now, limits.window_seconds, count)
+            return reason
+
+    def get_state(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def reset(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def sweep(self, cutoff):
+        with self._lock:
+            idle = [session_id for session_id, state in self._sessions.items() if state.last_seen < cutoff]
+            for session_id in idle:
+                del self._sessions[session_id]
+            return len(idle)
+
+    def session_count(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """여러 Streamlit 프로세스가 공유하는 SQLite(WAL) 저장소"""
+
+    _COLUMNS = "total, window_start, current, previous, last_seen, blocked"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = open_database(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " session_id TEXT PRIMARY KEY,"
+            " total INTEGER NOT NULL,"
+            " window_start REAL NOT NULL,"
+            " current INTEGER NOT NULL,"
+            " previous INTEGER NOT NULL,"
+            " last_seen REAL NOT NULL,"
+            " blocked INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS rate_limits_last_seen ON rate_limits (last_seen)")
+
+    def _load(self, conn, session_id, now):
+        row = conn.execute(
+            f"SELECT {self._COLUMNS} FROM rate_limits WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        total, window_start, current, previous, last_seen, blocked = row
+        return SessionWindow(now, total, window_start, current, previous, last_seen, bool(blocked))
+
+    def _save(self, conn, session_id, state):
+        conn.execute(
+            f"INSERT OR REPLACE INTO rate_limits (session_id, {self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (session_id, state.total, state.window_start, state.current,
+             state.previous, state.last_seen, int(state.blocked)),
+        )
+
+    def _transaction(self, session_id, now, limits, check, record, count=1):
+        """BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아 프로세스 간에도 확인+기록이 원자적"""
+        with self._db.transaction() as conn:
+            state = self._load(conn, session_id, now)
+            reason = None
+            if check and state is not None:
+                blocked_before = state.blocked
+                reason = state.evaluate(now, limits, count)
+                if state.blocked != blocked_before:
+                    self._save(conn, session_id, state)
+            if record and reason is None:
+                if state is None:
+                    state = SessionWindow(now)
+                state.record(now, limits.window_seconds, count)
+                self._save(conn, session_id, state)
+            return reason
+
+    def check(self, session_id, now, limits):
+        return self._transaction(session_id, now, limits, check=True, record=False)
+
+    def record(self, session_id, now, limits, count=1):
+        self._transaction(session_id, now, limits, check=False, record=True, count=count)
+
+    def check_and_record(self, session_id, now, limits, count=1):
+        return self._transaction(session_id, now, limits, check=True, record=True, count=count)
+
+    def get_state(self, session_id):
+        with self._db.connection() as conn:
+            return self._load(conn, session_id, time.time())
+
+    def reset(self, session_id):
+        self._db.execute("DELETE FROM rate_limits WHERE session_id = ?", (session_id,))
+
+    def sweep(self, cutoff):
+        return self._db.execute("DELETE FROM rate_limits WHERE last_seen < ?", (cutoff,))
+
+    def session_count(self):
+        return self._db.fetchone("SELECT COUNT(*) FROM rate_limits")[0]
+
+
+def create_rate_limit_backend(name: str, db_path: str | None = None) -> RateLimitBackend:
+    """설정 이름으로 저장소 생성 ("memory" 또는 "sqlite")"""
+    if name == "memory":
+        return MemoryRateLimitBackend()
+    if name == "sqlite":
+        if not db_path:
+            raise ValueError("sqlite 저장소에는 RATE_LIMIT_DB_PATH가 필요합니다.")
+        return SQLiteRateLimitBackend(db_path)
+    raise ValueError(f"알 수 없는 요청 제한 저장소입니다: {name}")
@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+
+# 회로 차단기 상태
+CLOSED = "closed"        # 정상
+OPEN = "open"            # 상위 서비스 장애 - 요청을 바로 거절
+HALF_OPEN = "half_open"  # 복구 확인 중 - 시험 요청 하나만 허용
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청을 보내지 않음"""
+
+
+class DeadlineExceededError(Exception):
+    """호출 제한 시간 안에 응답을 받지 못함"""
+
+
+class CircuitBreaker:
+    """연속 실패가 누적되면 일정 시간 동안 요청을 바로 실패시키는 회로 차단기"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """요청을 보내도 되는지 확인 (열린 상태에서 대기 시간이 지나면 시험 요청 1개 허용)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def get_state(self) -> dict:
+        """현재 상태 반환 (UI 배너/모니터링용)"""
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.reset_timeout_seconds - (time.monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in_seconds": retry_in,
+            }
+
+
+def call_with_retry(fn, *, breaker: CircuitBreaker, deadline_seconds: float, max_attempts: int,
+                    base_delay: float, max_delay: float, is_retryable, record_success: bool = True):
+    """제한 시간 안에서 지수 백오프(full jitter)로 재시도
+
+    fn은 남은 시간(초)을 인자로 받아 그 안에 끝나도록 호출해야 한다.
+    재시도 가능한 오류만 회로 차단기의 실패로 집계한다.
+    record_success가 False이면 성공한 호출의 결과 기록은 호출자가 맡는다 (스트림처럼 연 뒤에도 실패할 수 있는 호출).
+    """
+    deadline = time.monotonic() + deadline_seconds
+    attempt = 0
+    while True:
+        if not breaker.allow_request():
+            raise CircuitOpenError("AI 서비스가 일시적으로 불안정합니다.")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError(f"{deadline_seconds:.0f}초 안에 응답을 받지 못했습니다.")
+
+        attempt += 1
+        try:
+            result = fn(remaining)
+        except Exception as e:
+            if not is_retryable(e):
+                # 요청 오류(인증/형식 등)는 상위 서비스가 응답한 것이므로 정상으로 본다
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+            if attempt >= max_attempts or time.monotonic() + delay >= deadline:
+                raise
+            time.sleep(delay)
+            continue
+
+        if record_success:
+            breaker.record_success()
+        return result
@@ -4,6 +4,9 @@ echo.
 echo 필요한 패키지를 설치합니다...
 pip install -r requirements.txt
 echo.
+echo 에피소드 데이터를 컴파일합니다...
+python compile_episodes.py
+echo.
 echo 애플리케이션을 실행합니다...
 streamlit run app.py
 pause
@@ -1,63 +1,104 @@
+import threading
 import time
-from collections import defaultdict
-from datetime import datetime, timedelta
 import streamlit as st
 
+from config import (
+    MAX_REQUESTS_PER_SESSION,
+    MAX_REQUESTS_PER_MINUTE,
+    RATE_LIMIT_IDLE_TTL_SECONDS,
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_DB_PATH,
+)
+from rate_limit_store import (
+    BLOCKED,
+    SESSION_LIMIT,
+    MINUTE_LIMIT,
+    RateLimits,
+    create_rate_limit_backend,
+)
+
 class SecurityManager:
-    def __init__(self):
-        self.request_counts = defaultdict(int)  # 세션별 요청 수
-        self.request_timestamps = defaultdict(list)  # 세션별 요청 타임스탬프
-        self.blocked_sessions = set()  # 차단된 세션
-        
+    def __init__(self, backend=None,
+                 max_requests_per_session=MAX_REQUESTS_PER_SESSION,
+                 max_requests_per_minute=MAX_REQUESTS_PER_MINUTE,
+                 idle_ttl_seconds=RATE_LIMIT_IDLE_TTL_SECONDS,
+                 sweep_interval_seconds=RATE_LIMIT_SWEEP_INTERVAL_SECONDS):
+        self.backend = backend or create_rate_limit_backend("memory")  # 요청 상태 저장소
+        self.limits = RateLimits(max_requests_per_session, max_requests_per_minute)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._sweep_lock = threading.Lock()
+        self._next_sweep = time.time() + sweep_interval_seconds
+
+    def _message(self, reason) -> str:
+        if reason == BLOCKED:
+            return "🚫 이 세션은 API 남용으로 인해 차단되었습니다."
+        if reason == SESSION_LIMIT:
+            return f"🚫 세션당 최대 요청 수({self.limits.max_requests_per_session}회)를 초과했습니다."
+        if reason == MINUTE_LIMIT:
+            return f"🚫 분당 최대 요청 수({self.limits.max_requests_per_minute}회)를 초과했습니다. 잠시 후 다시 시도해주세요."
+        return ""
+
+    def _maybe_sweep(self, now):
+        """일정 간격마다 호출 경로에서 유휴 세션 정리 (분할 상환)"""
+        if now < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = now + self.sweep_interval_seconds
+            self.backend.sweep(now - self.idle_ttl_seconds)
+        finally:
+            self._sweep_lock.release()
+
     def check_rate_limit(self, session_id: str) -> tuple[bool, str]:
         """요청 제한 확인"""
-        current_time = time.time()
-        
-        # 차단된 세션인지 확인
-        if session_id in self.blocked_sessions:
-            return False, "🚫 이 세션은 API 남용으로 인해 차단되었습니다."
-        
-        # 세션당 최대 요청 수 확인
-        if self.request_counts[session_id] >= 200:
-            self.blocked_sessions.add(session_id)
-            return False, "🚫 세션당 최대 요청 수(200회)를 초과했습니다."
-        
-        # 분당 최대 요청 수 확인
-        timestamps = self.request_timestamps[session_id]
-        current_minute = current_time - 60
-        
-        # 1분 이전의 타임스탬프 제거
-        timestamps = [ts for ts in timestamps if ts > current_minute]
-        self.request_timestamps[session_id] = timestamps
-        
-        if len(timestamps) >= 100:
-            return False, "🚫 분당 최대 요청 수(100회)를 초과했습니다. 잠시 후 다시 시도해주세요."
-        
-        return True, ""
+        now = time.time()
+        self._maybe_sweep(now)
+        reason = self.backend.check(session_id, now, self.limits)
+        return reason is None, self._message(reason)
     
-    def record_request(self, session_id: str):
+    def record_request(self, session_id: str, count: int = 1):
         """요청 기록"""
-        current_time = time.time()
-        self.request_counts[session_id] += 1
-        self.request_timestamps[session_id].append(current_time)
+        self.backend.record(session_id, time.time(), self.limits, count)
+
+    def check_and_record(self, session_id: str, count: int = 1) -> tuple[bool, str]:
+        """요청 제한 확인 후 허용되면 바로 기록 (저장소에서 원자적으로 처리, 묶음 질문은 count건)"""
+        now = time.time()
+        self._maybe_sweep(now)
+        reason = self.backend.check_and_record(session_id, now, self.limits, count)
+        return reason is None, self._message(reason)
+
+    def is_blocked(self, session_id: str) -> bool:
+        """차단된 세션인지 확인"""
+        state = self.backend.get_state(session_id)
+        return state is not None and state.blocked
     
     def get_session_stats(self, session_id: str) -> dict:
         """세션 통계 반환"""
+        state = self.backend.get_state(session_id)
+        total = state.total if state else 0
         return {
-            "total_requests": self.request_counts[session_id],
-            "remaining_requests": max(0, 50 - self.request_counts[session_id]),
-            "is_blocked": session_id in self.blocked_sessions
+            "total_requests": total,
+            "remaining_requests": max(0, self.limits.max_requests_per_session - total),
+            "is_blocked": bool(state and state.blocked)
         }
     
     def reset_session(self, session_id: str):
         """세션 초기화"""
-        self.request_counts[session_id] = 0
-        self.request_timestamps[session_id] = []
-        if session_id in self.blocked_sessions:
-            self.blocked_sessions.remove(session_id)
+        self.backend.reset(session_id)
+
+    def sweep_idle_sessions(self) -> int:
+        """유휴 세션 즉시 정리 후 정리한 세션 수 반환"""
+        now = time.time()
+        self._next_sweep = now + self.sweep_interval_seconds
+        return self.backend.sweep(now - self.idle_ttl_seconds)
+
+    def session_count(self) -> int:
+        """추적 중인 세션 수"""
+        return self.backend.session_count()
 
 # 전역 보안 관리자 인스턴스
-security_manager = SecurityManager()
+security_manager = SecurityManager(create_rate_limit_backend(RATE_LIMIT_BACKEND, RATE_LIMIT_DB_PATH))
 
 def check_api_security():
     """API 보안 상태 확인"""
@@ -66,14 +107,9 @@ def check_api_security():
     
     session_id = st.session_state.session_id
     
-    # 요청 제한 확인
-    is_allowed, message = security_manager.check_rate_limit(session_id)
-    
-    if not is_allowed:
-        st.error(message)
+    # 차단 여부만 확인 (요청 수는 실제 AI 호출 시 check_and_record로 집계)
+    if security_manager.is_blocked(session_id):
+        st.error("🚫 이 세션은 API 남용으로 인해 차단되었습니다.")
         st.stop()
     
-    # 요청 기록
-    security_manager.record_request(session_id)
-    
     return session_id
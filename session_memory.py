@@ -0,0 +1,54 @@
+import sys
+import threading
+import weakref
+
+try:
+    import resource  # Unix 전용 (Windows에서는 최대 RSS를 보고하지 않음)
+except ImportError:
+    resource = None
+
+
+class SessionMemoryTracker:
+    """활성 세션의 게임 상태/대화 기록을 약한 참조로 추적해 메모리 사용량 리포트 생성"""
+
+    def __init__(self):
+        self._sessions = {}  # session_id -> (게임 약한 참조, 대화 기록 약한 참조)
+        self._lock = threading.Lock()
+
+    def track(self, session_id: str, game, chat_history):
+        with self._lock:
+            self._sessions[session_id] = (weakref.ref(game), weakref.ref(chat_history))
+
+    def report(self) -> list[dict]:
+        """세션별 추정 메모리 사용량 (종료된 세션은 정리)"""
+        rows = []
+        with self._lock:
+            for session_id, (game_ref, history_ref) in list(self._sessions.items()):
+                game, history = game_ref(), history_ref()
+                if game is None or history is None:
+                    del self._sessions[session_id]
+                    continue
+                game_bytes = game.memory_footprint()
+                chat_bytes = history.memory_footprint()
+                rows.append({
+                    "session_id": session_id,
+                    "game_bytes": game_bytes,
+                    "chat_bytes": chat_bytes,
+                    "total_bytes": game_bytes + chat_bytes,
+                    "messages_in_memory": history.in_memory_count,
+                    "messages_archived": history.archived_count,
+                })
+        rows.sort(key=lambda row: row["total_bytes"], reverse=True)
+        return rows
+
+
+def peak_rss_bytes() -> int | None:
+    """프로세스 최대 RSS (Linux는 KB, macOS는 바이트 단위로 보고됨, 측정할 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# 프로세스 전역 세션 메모리 추적기
+session_memory = SessionMemoryTracker()
@@ -0,0 +1,62 @@
+import json
+import re
+import secrets
+import time
+
+from config import SESSION_DB_PATH, SESSION_TTL_SECONDS
+from sqlite_store import open_database
+
+# 이어하기 토큰 형식 (secrets.token_urlsafe 출력)
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+
+def new_session_token() -> str:
+    """추측할 수 없는 이어하기 토큰 생성"""
+    return secrets.token_urlsafe(16)
+
+
+def is_valid_token(token) -> bool:
+    return isinstance(token, str) and _TOKEN_PATTERN.fullmatch(token) is not None
+
+
+class SessionStore:
+    """이어하기 토큰별 게임 상태를 압축 JSON 한 행으로 저장하는 SQLite(WAL) 저장소"""
+
+    def __init__(self, db_path: str, ttl_seconds: float = SESSION_TTL_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self._db = open_database(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " token TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        # 재시작 후 남은 오래된 게임 정리
+        self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - ttl_seconds,))
+
+    def save(self, token: str, state: dict):
+        self._db.execute(
+            "INSERT OR REPLACE INTO sessions (token, state, updated_at) VALUES (?, ?, ?)",
+            (token, json.dumps(state, ensure_ascii=False, separators=(",", ":")), time.time()),
+        )
+
+    def load(self, token: str) -> dict | None:
+        """저장된 게임 상태 (없거나 만료되었으면 None)"""
+        row = self._db.fetchone(
+            "SELECT state FROM sessions WHERE token = ? AND updated_at >= ?",
+            (token, time.time() - self.ttl_seconds),
+        )
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            return None
+
+    def delete(self, token: str):
+        self._db.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+
+# 프로세스 전역 게임 저장소
+session_store = SessionStore(SESSION_DB_PATH) if SESSION_DB_PATH else None
@@ -0,0 +1,115 @@
+import re
+import zlib
+
+from clue_matcher import tokenize
+
+# 유사도 색인은 NumPy가 설치된 경우에만 사용 (없으면 모든 입력을 AI가 판정)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HASH_DIMENSIONS = 4096  # 해시 n-gram 벡터 차원 (2의 거듭제곱)
+NGRAM_SIZES = (2, 3)
+
+# 부정 표현 (입력과 단서의 부정 여부가 다르면 유사해 보여도 확신하지 않음)
+_NEGATION = re.compile(r"않|없|못|아니|아닌|\b안\b")
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+def _features(text: str) -> list[str]:
+    """어간별 문자 n-gram (어절 경계 표시 포함)"""
+    grams = []
+    for stem in tokenize(text):
+        padded = f"<{stem}>"
+        for size in NGRAM_SIZES:
+            grams.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return grams
+
+
+def hash_vector(text: str, dimensions: int = HASH_DIMENSIONS):
+    """해시 트릭으로 만든 n-gram 빈도 벡터 (crc32라 프로세스가 달라도 같은 값)"""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for gram in _features(text):
+        code = zlib.crc32(gram.encode("utf-8"))
+        # 상위 비트로 부호를 정해 해시 충돌이 한쪽으로 쌓이지 않도록 함
+        vector[code % dimensions] += 1.0 if code & 0x80000000 else -1.0
+    return vector
+
+
+def has_negation(text: str) -> bool:
+    return _NEGATION.search(text) is not None
+
+
+class SimilarityIndex:
+    """에피소드 단서와 힌트의 해시 n-gram 벡터 색인 (코사인 유사도)
+
+    힌트는 단서가 아닌 비교 대상으로만 쓰인다. 입력이 단서보다 힌트에 더 가깝거나
+    두 단서 사이에서 애매하면 확신하지 않는다.
+    """
+
+    def __init__(self, clues: list[str], hints: list[str] = (), dimensions: int = HASH_DIMENSIONS):
+        texts = list(clues) + list(hints)
+        counts = np.stack([hash_vector(text, dimensions) for text in texts]) if texts else np.zeros((0, dimensions), np.float32)
+        self._build(clues, counts)
+
+    def _build(self, clues, counts):
+        self.clues = list(clues)
+        self.dimensions = counts.shape[1]
+        self._counts = counts
+
+        # 여러 행에 공통으로 나오는 차원일수록 가중치를 낮춤
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = np.log1p(counts.shape[0] / np.maximum(document_frequency, 1)).astype(np.float32)
+        self.matrix = self._normalize(counts * self.idf)
+        self.clue_negations = [has_negation(clue) for clue in self.clues]
+
+    def to_dict(self) -> dict:
+        """직렬화 (컴파일된 에피소드 산출물용) - 행마다 0이 아닌 해시 차원과 빈도만 저장"""
+        rows = []
+        for row in self._counts:
+            columns = np.flatnonzero(row)
+            rows.append([columns.tolist(), row[columns].astype(int).tolist()])
+        return {"dimensions": self.dimensions, "rows": rows}
+
+    @classmethod
+    def from_dict(cls, clues: list[str], data: dict) -> "SimilarityIndex":
+        """to_dict 결과로 복원 (n-gram 해시 재계산 없음)"""
+        counts = np.zeros((len(data["rows"]), data["dimensions"]), dtype=np.float32)
+        for row, (columns, values) in enumerate(data["rows"]):
+            counts[row, columns] = values
+        index = cls.__new__(cls)
+        index._build(clues, counts)
+        return index
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def similarities(self, text: str):
+        """입력과 각 행(단서 다음에 힌트)의 코사인 유사도"""
+        query = self._normalize(hash_vector(text, self.dimensions) * self.idf)
+        return self.matrix @ query
+
+    def confident_match(self, text: str, threshold: float, margin: float) -> int | None:
+        """충분히 확실하게 가리키는 단서 번호 (1부터), 애매하면 None
+
+        최고 점수가 단서여야 하고, 다음으로 가까운 단서/힌트와 margin 이상 차이가 나야 한다.
+        """
+        if not self.clues:
+            return None
+        scores = self.similarities(text)
+        order = np.argsort(scores)[::-1]
+        best = int(order[0])
+        if best >= len(self.clues) or scores[best] < threshold:
+            return None
+        runner_up = float(scores[order[1]]) if len(order) > 1 else 0.0
+        if scores[best] - runner_up < margin:
+            return None
+        if has_negation(text) != self.clue_negations[best]:
+            return None
+        return best + 1
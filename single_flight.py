@@ -0,0 +1,75 @@
+import threading
+
+
+class CoalescedCallTimeout(TimeoutError):
+    """공유 호출 결과를 기다리다 제한 시간을 넘김"""
+
+
+class _Flight:
+    """진행 중인 호출 1건 (리더가 결과를 채우면 기다리던 스레드가 모두 깨어남)"""
+    __slots__ = ("done", "result", "error", "cancelled", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.waiters = 0
+
+
+class SingleFlight:
+    """같은 키의 동시 호출을 하나로 합치는 single-flight (스크립트 스레드 간 공유)
+
+    처음 온 스레드(리더)만 실제 호출을 하고, 같은 키로 뒤따라온 스레드는 결과를 기다려 공유한다.
+    리더가 예외로 끝나면 같은 예외를 공유하고, 리더가 중단되면(GeneratorExit 등) 기다리던 쪽이 다시 시도한다.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "shared": 0, "timeouts": 0, "cancelled": 0}
+
+    def begin(self, key):
+        """(호출, 리더 여부) 반환 - 리더는 반드시 finish를 호출해야 함"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.stats["leaders"] += 1
+                return flight, True
+            flight.waiters += 1
+            return flight, False
+
+    def finish(self, key, flight, result=None, error=None):
+        """리더의 결과 공유 (Exception이 아닌 예외는 중단으로 처리)"""
+        if error is not None and not isinstance(error, Exception):
+            flight.cancelled = True
+        else:
+            flight.result = result
+            flight.error = error
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+    def wait(self, flight, timeout: float):
+        """리더의 결과 반환 (리더가 중단되었으면 None, 시간 초과 시 CoalescedCallTimeout)"""
+        if not flight.done.wait(timeout):
+            with self._lock:
+                self.stats["timeouts"] += 1
+            raise CoalescedCallTimeout(f"공유 호출 결과를 {timeout:.0f}초 안에 받지 못했습니다.")
+        with self._lock:
+            self.stats["cancelled" if flight.cancelled else "shared"] += 1
+        if flight.cancelled:
+            return None
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._flights)}
+
+
+# 프로세스 전역 판정 요청 병합기 (모든 세션이 공유)
+request_coalescer = SingleFlight()
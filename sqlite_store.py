@@ -0,0 +1,65 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteDatabase:
+    """SQLite(WAL) 파일 하나에 대한 프로세스 공유 연결
+
+    Streamlit 재실행은 매번 새 스레드에서 돌기 때문에 스레드별 연결을 두면 재실행마다 연결을 새로 열고
+    PRAGMA를 다시 실행하게 된다. 대신 연결 하나를 열어 두고 잠금으로 순서대로 나눠 쓴다.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 5.0):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+
+    def execute(self, sql: str, params=()) -> int:
+        """쓰기 문 실행 후 바뀐 행 수 반환"""
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def fetchone(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @contextmanager
+    def connection(self):
+        """여러 문을 이어서 실행하는 동안 연결을 독점"""
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡은 트랜잭션 (다른 프로세스와도 원자적)"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def open_database(db_path: str) -> SQLiteDatabase:
+    """경로별 공유 연결 반환 (같은 파일을 쓰는 저장소끼리도 연결 하나를 공유)"""
+    key = os.path.abspath(db_path)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = SQLiteDatabase(db_path)
+        return database
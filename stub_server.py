@@ -0,0 +1,165 @@
+"""chat-completions API를 흉내 내는 로컬 스텁 서버 (오프라인 부하 테스트용)
+
+사용법:
+    python stub_server.py --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=sk-stub streamlit run app.py
+
+응답 규칙과 지연/오류율은 StubBackend(STUB_* 설정)를 그대로 따른다.
+"""
+import argparse
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from episodes import EPISODES
+from llm_backends import StubBackend, StubUpstreamError
+from config import (
+    STUB_LATENCY_DISTRIBUTION,
+    STUB_LATENCY_MEDIAN_MS,
+    STUB_LATENCY_SIGMA,
+    STUB_ERROR_RATE,
+    STUB_SEED,
+)
+
+
+class StubCompletionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, stub):
+        super().__init__(address, StubRequestHandler)
+        self.stub = stub
+        # 시스템 프롬프트로 에피소드를 찾기 위한 색인
+        self.episodes_by_prompt = {episode.system_prompt: episode for episode in EPISODES}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 남기면 부하 테스트 결과가 왜곡됨
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # 연결 워밍업용 모델 조회
+        if self.path.startswith("/v1/models/"):
+            model = self.path.rsplit("/", 1)[-1]
+            self._send_json(200, {"id": model, "object": "model", "created": 0, "owned_by": "stub"})
+        else:
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        if self.path != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        messages = request.get("messages", [])
+        system_prompt = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        user_input = messages[-1]["content"] if messages else ""
+        episode = self.server.episodes_by_prompt.get(system_prompt)
+        stub = self.server.stub
+
+        latency = stub.sample_latency()
+        time.sleep(latency * 0.8)
+        try:
+            stub.maybe_fail()
+        except StubUpstreamError as e:
+            self._send_json(503, {"error": {"message": str(e), "type": "server_error"}})
+            return
+
+        text = stub.answer(user_input, episode)
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "stub")
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": len(system_prompt.encode("utf-8")) // 4 + len(user_input.encode("utf-8")) // 4,
+            "completion_tokens": len(text.encode("utf-8")) // 4,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if not request.get("stream"):
+            time.sleep(latency * 0.2)
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+            return
+
+        # 스트리밍 응답 (server-sent events)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        pieces = [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+        try:
+            for index, piece in enumerate(pieces):
+                time.sleep(latency * 0.2 / len(pieces))
+                delta = {"content": piece} if index else {"role": "assistant", "content": piece}
+                self._send_event({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                })
+            self._send_event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            })
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 판정 문구 완성 후 클라이언트가 스트림을 먼저 닫은 경우
+        self.close_connection = True
+
+    def _send_event(self, payload):
+        self.wfile.write(b"data: " + json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    stub = StubBackend(
+        latency_distribution=STUB_LATENCY_DISTRIBUTION,
+        latency_median_ms=STUB_LATENCY_MEDIAN_MS,
+        latency_sigma=STUB_LATENCY_SIGMA,
+        error_rate=STUB_ERROR_RATE,
+        seed=STUB_SEED,
+    )
+    server = StubCompletionServer((args.host, args.port), stub)
+    print(f"스텁 서버 실행 중: http://{args.host}:{args.port}/v1 "
+          f"(지연 {STUB_LATENCY_DISTRIBUTION} {STUB_LATENCY_MEDIAN_MS:.0f}ms, 오류율 {STUB_ERROR_RATE:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
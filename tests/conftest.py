@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# 저장소 루트의 모듈을 바로 import할 수 있도록 경로 추가
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# 테스트가 실제 대화/세션/요청 제한 DB에 쓰지 않도록 임시 디렉토리로 돌림 (프로젝트 모듈 import 전)
+SCRATCH_DIR = tempfile.mkdtemp(prefix="turtle_tests_")
+for name, filename in (
+    ("TRANSCRIPT_DB_PATH", "transcripts.db"),
+    ("SESSION_DB_PATH", "sessions.db"),
+    ("RATE_LIMIT_DB_PATH", "rate_limit.db"),
+):
+    os.environ[name] = os.path.join(SCRATCH_DIR, filename)
+os.environ.pop("VERDICT_CACHE_DB_PATH", None)
+
+
+class ScriptedBackend:
+    """정해 둔 응답을 돌려주는 AI 백엔드 (호출 기록과 스트림 종료 여부 확인용)"""
+
+    name = "scripted"
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)  # 호출마다 앞에서부터 하나씩 사용 (문자열, 조각 목록 또는 예외)
+        self.calls = []
+        self.streams = []
+
+    def availability(self):
+        return True, ""
+
+    def warm_up(self):
+        return True
+
+    def _next(self, kind, messages, options):
+        self.calls.append({"kind": kind, "input": messages[-1]["content"], **options})
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def complete(self, messages, **options):
+        response = self._next("complete", messages, options)
+        return response if isinstance(response, str) else "".join(response)
+
+    def stream(self, messages, **options):
+        response = self._next("stream", messages, options)
+        chunks = [response] if isinstance(response, str) else list(response)
+        state = {"sent": 0, "closed": False}
+        self.streams.append(state)
+        try:
+            for chunk in chunks:
+                state["sent"] += 1
+                yield chunk
+        finally:
+            state["closed"] = True
+
+
+@pytest.fixture
+def scripted_game(monkeypatch):
+    """스크립트 백엔드와 새 보안 관리자/판정 캐시를 주입한 게임 (모델 캐스케이드와 로컬 유사도 판정은 끔)"""
+    import game_logic
+    from llm_backends import get_llm_backend, set_llm_backend
+    from model_router import ModelRouter
+    from security import SecurityManager
+    from verdict_cache import VerdictCache
+
+    backend = ScriptedBackend()
+    previous = get_llm_backend()
+    set_llm_backend(backend)
+    monkeypatch.setattr(game_logic, "security_manager", SecurityManager(max_requests_per_session=100,
+                                                                        max_requests_per_minute=100))
+    monkeypatch.setattr(game_logic, "verdict_cache", VerdictCache())
+    monkeypatch.setattr(game_logic, "model_router", ModelRouter(enabled=False))
+    monkeypatch.setattr(game_logic, "SIMILARITY_SHORTCUT_ENABLED", False)
+
+    game = game_logic.TurtleSoupGame()
+    assert game.select_episode("바다거북수프")
+    try:
+        yield game, backend
+    finally:
+        set_llm_backend(previous)
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from chat_history import ChatHistory, ChatMessage, TranscriptArchive
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return TranscriptArchive(str(tmp_path / "transcripts.db"))
+
+
+def _fill(history, count):
+    for i in range(count):
+        history.append("user" if i % 2 == 0 else "assistant", f"메시지 {i}")
+
+
+def test_ring_buffer_spills_to_archive(archive):
+    history = ChatHistory(archive, max_in_memory=4)
+    _fill(history, 10)
+
+    assert len(history) == 10
+    assert history.in_memory_count == 4
+    assert history.archived_count == 6
+    assert history.loadable_count == 10
+    # 메모리에 없는 앞부분은 보관소에서 읽어 이어 붙임
+    assert [message.content for message in history.recent(7)] == [f"메시지 {i}" for i in range(3, 10)]
+    assert list(history)[0] == ChatMessage("user", "메시지 0")
+
+
+def test_restore_reads_only_recent_messages(archive):
+    history = ChatHistory(archive, max_in_memory=4)
+    _fill(history, 9)
+
+    restored = ChatHistory.restore(archive, history.transcript_id, max_in_memory=4)
+    assert len(restored) == 9
+    assert restored.in_memory_count == 4
+    assert list(restored) == list(history)
+
+    # 복원 후 추가한 메시지는 이어지는 번호로 기록
+    restored.append("user", "메시지 9")
+    assert archive.count(history.transcript_id) == 10
+
+
+def test_clear_deletes_archived_messages(archive):
+    history = ChatHistory(archive, max_in_memory=2)
+    _fill(history, 5)
+    history.clear()
+    assert len(history) == 0
+    assert archive.count(history.transcript_id) == 0
+    assert history.recent(5) == []
+
+
+def test_without_archive_evicted_messages_are_not_loadable():
+    history = ChatHistory(None, max_in_memory=4)
+    _fill(history, 10)
+
+    assert len(history) == 10
+    assert history.loadable_count == 4
+    assert [message.content for message in history.recent(10)] == [f"메시지 {i}" for i in range(6, 10)]
+
+
+@pytest.fixture
+def stub_backend():
+    """API 키 없이도 게임 화면까지 그리도록 지연 없는 스텁 백엔드 사용"""
+    from llm_backends import StubBackend, get_llm_backend, set_llm_backend
+
+    previous = get_llm_backend()
+    set_llm_backend(StubBackend(latency_distribution="fixed", latency_median_ms=0))
+    yield
+    set_llm_backend(previous)
+
+
+def _render_with(history):
+    from streamlit.testing.v1 import AppTest
+    from game_logic import TurtleSoupGame
+
+    game = TurtleSoupGame()
+    game.select_episode("바다거북수프")
+    at = AppTest.from_file(os.path.join(ROOT_DIR, "app.py"), default_timeout=30)
+    at.session_state["game"] = game
+    at.session_state["chat_history"] = history
+    at.session_state["chat_visible_count"] = 20
+    at.run()
+    assert not at.exception
+    return [button for button in at.button if button.key == "load_older_btn"]
+
+
+def test_load_older_button_needs_older_messages_to_load(archive, stub_backend):
+    # 보관소가 없으면 메모리에서 밀려난 대화가 있어도 더 보여줄 수 없음
+    history = ChatHistory(None, max_in_memory=20)
+    _fill(history, 60)
+    assert _render_with(history) == []
+
+    history = ChatHistory(archive, max_in_memory=20)
+    _fill(history, 60)
+    buttons = _render_with(history)
+    assert len(buttons) == 1
+    assert "40개" in buttons[0].label
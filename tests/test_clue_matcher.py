@@ -0,0 +1,54 @@
+import pytest
+
+from clue_matcher import ClueIndex, char_ngrams, normalize_text, strip_suffix, tokenize
+from episodes import get_episode
+
+TURTLE_SOUP = get_episode("바다거북수프")
+NECKLACE = get_episode("할아버지의 목걸이")
+
+
+def test_tokenize_strips_particles_and_endings():
+    assert normalize_text("  남자는, 웃었나요?! ") == "남자는 웃었나요"
+    assert strip_suffix("수프를") == "수프"
+    assert strip_suffix("를") == "를"  # 어간이 남지 않으면 그대로
+    assert tokenize("할아버지는 나치 전범이었다") == ["할아버지", "나치", "전범"]
+
+
+def test_no_single_character_grams():
+    # 한 글자 어간/첫 글자는 거의 모든 단서와 겹치므로 색인하지 않음
+    assert char_ngrams("남자는 죽었나요?") == set()
+    assert all(len(gram) == 2 for gram in char_ngrams("진짜 바다거북 수프를 맛보았다"))
+
+
+@pytest.mark.parametrize("text", [
+    "남자는 죽었나요?",
+    "수프가 맛있었나요?",
+    "남자가 바다에 갔나요?",
+    "남자는 수프를 좋아하나요?",
+])
+def test_one_shared_common_word_is_not_a_clue(text):
+    assert TURTLE_SOUP.clue_index.match(text) == []
+    assert ClueIndex(TURTLE_SOUP.clues).score(text) == []
+
+
+@pytest.mark.parametrize("episode, text, expected", [
+    (TURTLE_SOUP, "남자는 과거에 조난을 당한 적이 있었다", 0),
+    (TURTLE_SOUP, "조난 상황에서 인육 수프를 먹고 살아남았다", 1),
+    (TURTLE_SOUP, "진짜 바다거북 수프를 맛보고 인육임을 깨달았다", 2),
+    (NECKLACE, "할아버지는 나치 전범이었다", 1),
+    (NECKLACE, "목걸이는 나치 훈장이었다", 0),
+])
+def test_paraphrased_clue_matches(episode, text, expected):
+    assert ClueIndex(episode.clues).match(text) == [episode.clues[expected]]
+
+
+def test_found_clues_are_excluded():
+    index = ClueIndex(NECKLACE.clues)
+    assert index.match("할아버지는 나치 전범이었다", exclude={NECKLACE.clues[1]}) == []
+
+
+def test_serialized_index_scores_the_same():
+    index = ClueIndex(TURTLE_SOUP.clues)
+    restored = ClueIndex.from_dict(TURTLE_SOUP.clues, index.to_dict())
+    text = "바다거북 수프가 인육이었다"
+    assert restored.score(text) == index.score(text)
@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from config import EPISODE_DATA_DIR
+from episode_artifact import build_artifact, load_artifact, payload_dir, validate_episode
+from episodes import EpisodeRepository
+from prompts import SYSTEM_RULES
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "episodes"
+    shutil.copytree(EPISODE_DATA_DIR, path, ignore=shutil.ignore_patterns("compiled"))
+    return str(path)
+
+
+@pytest.fixture
+def artifact_path(tmp_path, data_dir):
+    path = str(tmp_path / "compiled" / "episodes.json")
+    report = build_artifact(data_dir, path)
+    assert report["errors"] == []
+    return path
+
+
+def test_manifest_holds_only_preview_metadata(artifact_path):
+    with open(artifact_path, encoding="utf-8") as f:
+        text = f.read()
+    manifest = json.loads(text)
+    # 공통 규칙/본문/색인은 목록에 넣지 않음 (에피소드 수만큼 커지지 않도록)
+    assert SYSTEM_RULES[:40] not in text
+    for entry in manifest["episodes"]:
+        assert set(entry) == {"id", "title", "question", "clue_count", "hint_free_count", "hint_paid_count",
+                              "prompt_tokens"}
+        assert os.path.exists(os.path.join(payload_dir(artifact_path), f"{entry['id']}.json"))
+
+
+def test_repository_defers_bodies_and_indexes(data_dir, artifact_path):
+    repository = EpisodeRepository(data_dir, artifact_path)
+    assert repository.compiled
+    episode = repository.get("바다거북수프")
+    assert not episode.is_loaded
+    assert episode.prompt_tokens > 0
+    assert not episode.is_loaded  # 토큰 수는 목록에서 바로
+
+    runtime = EpisodeRepository(data_dir).get("바다거북수프")
+    text = "진짜 바다거북 수프를 맛보고 인육임을 깨달았다"
+    assert episode.clue_index.score(text) == runtime.clue_index.score(text)
+    assert episode.system_prompt == runtime.system_prompt
+    if episode.similarity_index is not None:
+        assert (episode.similarity_index.similarities(text) == runtime.similarity_index.similarities(text)).all()
+
+
+def test_stale_source_invalidates_artifact(data_dir, artifact_path):
+    assert load_artifact(data_dir, artifact_path) is not None
+    with open(os.path.join(data_dir, "ep001.json"), "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert load_artifact(data_dir, artifact_path) is None
+
+
+def test_startup_check_uses_file_stats_and_check_uses_content(data_dir, artifact_path):
+    path = os.path.join(data_dir, "ep001.json")
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        content = f.read()
+    # 크기와 수정 시각을 그대로 둔 채 내용만 바꾸면 시작 시 확인은 통과하고 --check는 잡아냄
+    with open(path, "wb") as f:
+        f.write(content[:-1] + (b"\n" if content.endswith(b" ") else b" "))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_artifact(data_dir, artifact_path) is not None
+    assert load_artifact(data_dir, artifact_path, verify_content=True) is None
+
+
+def test_rebuild_removes_deleted_episode_payloads(data_dir, artifact_path):
+    stale = os.path.join(payload_dir(artifact_path), "ep999.json")
+    with open(stale, "w", encoding="utf-8") as f:
+        f.write("{}")
+    build_artifact(data_dir, artifact_path)
+    assert not os.path.exists(stale)
+
+
+def test_validate_episode_reports_errors():
+    meta = {"title": "t", "question": "q", "clue_count": 2}
+    errors, _ = validate_episode(meta, {"clues": ["a", "a"], "answer": ""})
+    assert "중복된 단서가 있습니다." in errors
+    assert "줄거리(answer)가 없습니다." in errors
@@ -0,0 +1,77 @@
+import json
+
+import game_logic
+from game_logic import BATCH_PARSE_ERROR_MESSAGE
+from security import SecurityManager
+from verdicts import ALREADY_FOUND, CLUE_FOUND
+
+
+def _batch(*items):
+    return json.dumps({"items": [
+        {"verdict": verdict, "importance": "normal", "matched_clue_ids": list(clue_ids)}
+        for verdict, clue_ids in items
+    ]})
+
+
+def test_batch_is_judged_in_one_call(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append(_batch(("yes", ()), ("irrelevant", ()), ("clue_found", (1,))))
+
+    results = game.investigate_batch(["남자는 웃었나요?", "날씨가 맑았나요?", "남자는 바다에서 조난을 겪었다"], "s1")
+
+    clue = game.current_episode.clues[0]
+    assert results == ["네.", "아니오, 중요하지 않습니다.", f"{CLUE_FOUND}\n{clue}"]
+    assert len(backend.calls) == 1
+    call = backend.calls[0]
+    assert call["input"] == "[1] 남자는 웃었나요?\n[2] 날씨가 맑았나요?\n[3] 남자는 바다에서 조난을 겪었다"
+    assert call["response_format"]["json_schema"]["name"] == "batch_verdict"
+    assert game.question_count == 3
+    assert game.found_clues == {clue}
+    # 요청 제한은 호출 수가 아니라 항목 수만큼 집계
+    assert game_logic.security_manager.get_session_stats("s1")["total_requests"] == 3
+
+
+def test_missing_item_gets_parse_error_message(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append(_batch(("no", ())))
+
+    results = game.investigate_batch(["남자는 웃었나요?", "날씨가 맑았나요?"], "s1")
+
+    assert results == ["아니오.", BATCH_PARSE_ERROR_MESSAGE]
+    assert game.question_count == 2
+
+
+def test_same_clue_twice_in_one_batch_is_already_found(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append(_batch(("clue_found", (1,)), ("clue_found", (1,))))
+
+    results = game.investigate_batch(["남자는 조난을 당했다", "남자는 예전에 표류했다"], "s1")
+
+    assert results[1] == ALREADY_FOUND
+    assert len(game.found_clues) == 1
+
+
+def test_cached_items_are_left_out_of_the_batch(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append('{"verdict":"no","importance":"normal","matched_clue_ids":[]}')
+    assert game.investigate("남자는 웃었나요?", "s1") == "아니오."
+
+    backend.responses.append('{"verdict":"yes","importance":"normal","matched_clue_ids":[]}')
+    results = game.investigate_batch(["남자는 웃었나요?", "남자는 혼자였나요?"], "s1")
+
+    assert results == ["아니오.", "네."]
+    # 남은 항목이 하나뿐이면 묶음 형식 없이 단일 판정으로 보냄
+    assert backend.calls[-1]["input"] == "남자는 혼자였나요?"
+    assert backend.calls[-1]["response_format"]["json_schema"]["name"] == "verdict"
+
+
+def test_batch_over_the_limit_is_rejected_before_calling(scripted_game, monkeypatch):
+    game, backend = scripted_game
+    monkeypatch.setattr(game_logic, "security_manager", SecurityManager(max_requests_per_session=2,
+                                                                        max_requests_per_minute=100))
+
+    results = game.investigate_batch(["남자는 웃었나요?", "날씨가 맑았나요?", "남자는 혼자였나요?"], "s1")
+
+    assert len(results) == 1 and results[0].startswith("🚫")
+    assert backend.calls == []
+    assert game.question_count == 0
@@ -0,0 +1,49 @@
+from game_logic import CIRCUIT_OPEN_MESSAGE
+from resilience import CircuitOpenError
+from verdicts import CLUE_FOUND
+
+
+def test_fixed_phrase_is_shown_before_the_json_finishes(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append(['{"verdict":"no",', '"importance":"high",', '"matched_clue_ids":[]}'])
+
+    output = list(game.investigate_stream("남자는 웃었나요?", "s1"))
+
+    assert output == ["아니오, 아주 중요한 질문입니다."]
+    # 판정 코드와 중요도가 도착하면 나머지 JSON은 받지 않고 상위 스트림을 닫음
+    assert backend.streams == [{"sent": 2, "closed": True}]
+    assert game.question_count == 1
+    assert game.found_clues == set()
+
+
+def test_clue_found_waits_for_clue_ids(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append(['{"verdict":"clue_found",', '"importance":"normal",', '"matched_clue_ids":[1]}'])
+
+    output = "".join(game.investigate_stream("남자는 배를 탔다가 사고를 겪었나요?", "s1"))
+
+    clue = game.current_episode.clues[0]
+    assert output == f"{CLUE_FOUND}\n{clue}"
+    assert backend.streams == [{"sent": 3, "closed": True}]
+    assert game.found_clues == {clue}
+
+
+def test_repeated_question_uses_cached_verdict(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append('{"verdict":"irrelevant","importance":"normal","matched_clue_ids":[]}')
+
+    first = "".join(game.investigate_stream("날씨가 맑았나요?", "s1"))
+    second = "".join(game.investigate_stream("날씨가 맑았나요?", "s1"))
+
+    assert first == second == "아니오, 중요하지 않습니다."
+    assert len(backend.calls) == 1
+    assert backend.calls[0]["kind"] == "stream"
+    assert game.question_count == 2
+
+
+def test_open_circuit_is_reported_as_a_message(scripted_game):
+    game, backend = scripted_game
+    backend.responses.append(CircuitOpenError("open"))
+
+    assert list(game.investigate_stream("남자는 웃었나요?", "s1")) == [CIRCUIT_OPEN_MESSAGE]
+    assert game.question_count == 0
@@ -0,0 +1,76 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import llm_backends
+from llm_backends import OpenAIBackend
+from resilience import CLOSED, CircuitBreaker, DeadlineExceededError
+
+MESSAGES = [{"role": "user", "content": "남자는 웃었나요?"}]
+
+
+def _chunk(content):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class _StallingStream:
+    """조각을 보낸 뒤 닫힐 때까지 읽기가 멈춰 있는 스트림 (닫히면 연결 오류 또는 조용히 종료)"""
+
+    def __init__(self, chunks, error_on_close=True):
+        self.chunks = chunks
+        self.error_on_close = error_on_close
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for content in self.chunks:
+            yield _chunk(content)
+        if not self.closed.wait(5):
+            raise AssertionError("스트림이 닫히지 않음")
+        if self.error_on_close:
+            raise ConnectionError("stream closed")
+
+    def close(self):
+        self.closed.set()
+
+
+class _ClosableList(list):
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout_seconds=60)
+    monkeypatch.setattr(llm_backends, "llm_breaker", breaker)
+    monkeypatch.setattr(llm_backends, "LLM_CALL_DEADLINE_SECONDS", 0.2)
+    return breaker
+
+
+@pytest.mark.parametrize("error_on_close", [True, False])
+def test_stalled_read_is_cut_at_the_deadline(breaker, monkeypatch, error_on_close):
+    stream = _StallingStream(['{"verdict":', '"no"'], error_on_close)
+    monkeypatch.setattr(llm_backends, "create_chat_completion", lambda **kwargs: stream)
+
+    received = []
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        for piece in OpenAIBackend().stream(MESSAGES, model="gpt-5"):
+            received.append(piece)
+
+    # 다음 조각을 기다리는 읽기가 남은 시간을 넘기지 않음
+    assert time.monotonic() - started < 1
+    assert received == ['{"verdict":', '"no"']
+    assert stream.closed.is_set()
+    assert breaker.get_state()["consecutive_failures"] == 1
+
+
+def test_completed_stream_records_success(breaker, monkeypatch):
+    chunks = [_chunk('{"verdict":"no",'), _chunk('"importance":"normal","matched_clue_ids":[]}')]
+    monkeypatch.setattr(llm_backends, "create_chat_completion", lambda **kwargs: _ClosableList(chunks))
+
+    assert "".join(OpenAIBackend().stream(MESSAGES, model="gpt-5")).startswith('{"verdict":"no"')
+    state = breaker.get_state()
+    assert state["state"] == CLOSED
+    assert state["consecutive_failures"] == 0
@@ -0,0 +1,54 @@
+from rate_limit_store import BLOCKED, MINUTE_LIMIT, SESSION_LIMIT, RateLimits, SessionWindow
+
+LIMITS = RateLimits(max_requests_per_session=5, max_requests_per_minute=3, window_seconds=60.0)
+
+
+def test_batch_must_fit_minute_limit():
+    window = SessionWindow(now=0.0)
+    assert window.evaluate(0.0, LIMITS, count=3) is None
+    assert window.evaluate(0.0, LIMITS, count=4) == MINUTE_LIMIT
+
+    window.record(0.0, LIMITS.window_seconds, count=2)
+    assert window.evaluate(1.0, LIMITS, count=1) is None
+    assert window.evaluate(1.0, LIMITS, count=2) == MINUTE_LIMIT
+
+
+def test_batch_must_fit_session_limit_without_blocking():
+    window = SessionWindow(now=0.0, total=3)
+    assert window.evaluate(0.0, LIMITS, count=2) is None
+    # 마지막 건이 한도를 넘는 묶음만 거절하고, 세션은 막지 않음
+    assert window.evaluate(0.0, LIMITS, count=3) == SESSION_LIMIT
+    assert not window.blocked
+    assert window.evaluate(0.0, LIMITS, count=1) is None
+
+
+def test_session_limit_blocks_once_reached():
+    window = SessionWindow(now=0.0, total=5)
+    assert window.evaluate(0.0, LIMITS, count=1) == SESSION_LIMIT
+    assert window.blocked
+    assert window.evaluate(0.0, LIMITS, count=1) == BLOCKED
+
+
+def test_previous_bucket_weighted_by_overlap():
+    limits = RateLimits(max_requests_per_session=100, max_requests_per_minute=3, window_seconds=60.0)
+    window = SessionWindow(now=0.0)
+    window.record(0.0, limits.window_seconds, count=3)
+
+    # 다음 버킷 중간: 직전 버킷 3건의 절반(1.5건)만 반영
+    assert window.evaluate(90.0, limits, count=1) is None
+    assert window.window_count(90.0, limits.window_seconds) == 1.5
+    assert window.evaluate(90.0, limits, count=2) is None
+    assert window.evaluate(90.0, limits, count=3) == MINUTE_LIMIT
+
+    # 두 버킷 이상 지나면 직전 버킷도 비워짐
+    assert window.evaluate(200.0, limits, count=3) is None
+    assert window.previous == 0
+
+
+def test_record_counts_whole_batch():
+    window = SessionWindow(now=0.0)
+    window.record(0.0, LIMITS.window_seconds, count=3)
+    assert window.total == 3
+    assert window.current == 3
+    window.record(61.0, LIMITS.window_seconds, count=2)
+    assert (window.total, window.current, window.previous) == (5, 2, 3)
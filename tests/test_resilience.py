@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, call_with_retry
+
+
+class _Transient(Exception):
+    pass
+
+
+def _open_breaker(reset_timeout_seconds=0.0):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=reset_timeout_seconds)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = _open_breaker(reset_timeout_seconds=60)
+    assert breaker.get_state()["state"] == OPEN
+    assert not breaker.allow_request()
+    assert breaker.get_state()["retry_in_seconds"] > 0
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = _open_breaker()
+    assert breaker.allow_request()
+    assert breaker.get_state()["state"] == HALF_OPEN
+    # 시험 요청이 끝나기 전에는 다른 요청을 보내지 않음
+    assert not breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_probe_success_closes_circuit():
+    breaker = _open_breaker()
+    assert breaker.allow_request()
+    breaker.record_success()
+    state = breaker.get_state()
+    assert state["state"] == CLOSED
+    assert state["consecutive_failures"] == 0
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_probe_failure_reopens_circuit():
+    breaker = _open_breaker(reset_timeout_seconds=0.2)
+    time.sleep(0.25)  # 대기 시간 경과
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.get_state()["state"] == OPEN
+    assert not breaker.allow_request()
+
+
+def test_call_with_retry_rejects_while_open():
+    breaker = _open_breaker(reset_timeout_seconds=60)
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(calls.append, breaker=breaker, deadline_seconds=1, max_attempts=3,
+                        base_delay=0, max_delay=0, is_retryable=lambda e: True)
+    assert calls == []
+
+
+def test_failed_probe_stops_retries():
+    breaker = _open_breaker(reset_timeout_seconds=0.2)
+    time.sleep(0.25)  # 대기 시간 경과
+    attempts = []
+
+    def flaky(remaining):
+        attempts.append(remaining)
+        raise _Transient()
+
+    # 시험 요청 1회가 실패하면 회로가 다시 열려 남은 재시도는 보내지 않음
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(flaky, breaker=breaker, deadline_seconds=1, max_attempts=3,
+                        base_delay=0, max_delay=0, is_retryable=lambda e: isinstance(e, _Transient))
+    assert len(attempts) == 1
+    assert breaker.get_state()["state"] == OPEN
+
+
+def test_non_retryable_error_counts_as_success():
+    breaker = _open_breaker()
+
+    def bad_request(remaining):
+        raise ValueError("invalid request")
+
+    with pytest.raises(ValueError):
+        call_with_retry(bad_request, breaker=breaker, deadline_seconds=1, max_attempts=3,
+                        base_delay=0, max_delay=0, is_retryable=lambda e: False)
+    assert breaker.get_state()["state"] == CLOSED
+
+
+def test_record_success_can_be_left_to_caller():
+    breaker = _open_breaker()
+    assert call_with_retry(lambda remaining: "stream", breaker=breaker, deadline_seconds=1, max_attempts=1,
+                           base_delay=0, max_delay=0, is_retryable=lambda e: True, record_success=False) == "stream"
+    # 스트림을 다 받기 전까지는 시험 요청이 진행 중
+    assert breaker.get_state()["state"] == HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.get_state()["state"] == CLOSED
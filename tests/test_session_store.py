@@ -0,0 +1,75 @@
+import os
+import time
+
+from game_logic import TurtleSoupGame
+from session_store import SessionStore, is_valid_token, new_session_token
+
+
+def test_tokens_are_unique_and_validated():
+    first, second = new_session_token(), new_session_token()
+    assert first != second
+    assert is_valid_token(first)
+    assert not is_valid_token("short")
+    assert not is_valid_token("../../etc/passwd-xxxxxxxxxxxx")
+    assert not is_valid_token(None)
+
+
+def test_save_load_and_delete(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    token = new_session_token()
+    assert store.load(token) is None
+
+    store.save(token, {"game_state": "playing", "question_count": 3})
+    assert store.load(token) == {"game_state": "playing", "question_count": 3}
+
+    # 턴마다 같은 행을 덮어씀
+    store.save(token, {"game_state": "finished", "question_count": 4})
+    assert store.load(token) == {"game_state": "finished", "question_count": 4}
+
+    store.delete(token)
+    assert store.load(token) is None
+
+
+def test_state_survives_a_restart(tmp_path):
+    db_path = str(tmp_path / "nested" / "sessions.db")
+    token = new_session_token()
+    SessionStore(db_path).save(token, {"game_state": "playing"})
+    assert os.path.exists(db_path)
+    assert SessionStore(db_path).load(token) == {"game_state": "playing"}
+
+
+def test_expired_sessions_are_not_resumed(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"), ttl_seconds=0.05)
+    token = new_session_token()
+    store.save(token, {"game_state": "playing"})
+    time.sleep(0.1)
+    assert store.load(token) is None
+
+
+def test_game_resumes_from_stored_state(tmp_path):
+    game = TurtleSoupGame()
+    assert game.select_episode("바다거북수프")
+    clues = game.current_episode.clues
+    game.found_clues = {clues[0], clues[2]}
+    game.question_count = 7
+    game.used_paid_hints = {1}
+
+    store = SessionStore(str(tmp_path / "sessions.db"))
+    token = new_session_token()
+    store.save(token, game.to_state())
+
+    resumed = TurtleSoupGame()
+    assert resumed.restore_state(store.load(token))
+    assert resumed.current_episode.id == game.current_episode.id
+    assert resumed.found_clues == {clues[0], clues[2]}
+    assert resumed.question_count == 7
+    assert resumed.used_paid_hints == {1}
+    assert resumed.game_state == "playing"
+
+
+def test_unknown_episode_resets_the_game():
+    game = TurtleSoupGame()
+    assert game.select_episode("바다거북수프")
+    assert not game.restore_state({"episode_id": "no-such-episode", "game_state": "playing"})
+    assert game.current_episode is None
+    assert game.game_state == "episode_selection"
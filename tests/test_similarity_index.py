@@ -0,0 +1,77 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import game_logic
+from episodes import get_episode
+from similarity_index import SimilarityIndex, hash_vector
+from verdicts import ALREADY_FOUND
+
+THRESHOLD = 0.75
+MARGIN = 0.25
+
+
+@pytest.fixture(scope="module")
+def episode():
+    return get_episode("바다거북수프")
+
+
+@pytest.fixture(scope="module")
+def index(episode):
+    return SimilarityIndex(episode.clues, list(episode.hint_free) + list(episode.hint_paid))
+
+
+def test_near_verbatim_clue_is_matched(index):
+    assert index.confident_match("남자는 과거에 조난을 당한 적이 있었다", THRESHOLD, MARGIN) == 1
+
+
+def test_negated_guess_is_not_matched(index):
+    # 유사도는 높지만 부정 여부가 단서와 반대
+    assert index.similarities("남자는 과거에 조난을 당한 적이 없었다")[0] >= THRESHOLD
+    assert index.confident_match("남자는 과거에 조난을 당한 적이 없었다", THRESHOLD, MARGIN) is None
+
+
+def test_guess_closer_to_a_hint_is_not_matched(index, episode):
+    # 힌트 원문은 비교 대상일 뿐 단서가 아님
+    assert index.confident_match(episode.hint_free[0], THRESHOLD, MARGIN) is None
+
+
+def test_partial_or_unrelated_input_is_left_to_the_model(index):
+    assert index.confident_match("남자는 과거에 조난을 당했다", THRESHOLD, MARGIN) is None
+    assert index.confident_match("날씨가 맑았나요?", THRESHOLD, MARGIN) is None
+
+
+def test_margin_requires_a_clear_winner(index):
+    assert index.confident_match("남자는 과거에 조난을 당한 적이 있었다", THRESHOLD, 1.0) is None
+
+
+def test_empty_index_never_matches():
+    assert SimilarityIndex([]).confident_match("아무 말", THRESHOLD, MARGIN) is None
+
+
+def test_hash_vector_is_stable():
+    # crc32 기반이라 프로세스/실행마다 같은 벡터
+    first = hash_vector("남자는 수프를 먹었다")
+    assert np.array_equal(first, hash_vector("남자는 수프를 먹었다"))
+    assert np.count_nonzero(first) > 0
+
+
+def test_to_dict_round_trip_keeps_scores(index, episode):
+    data = index.to_dict()
+    assert data["dimensions"] == index.dimensions
+    assert len(data["rows"]) == len(episode.clues) + len(episode.hint_free) + len(episode.hint_paid)
+
+    restored = SimilarityIndex.from_dict(episode.clues, data)
+    for text in ("남자는 과거에 조난을 당한 적이 있었다", "레스토랑에서 수프를 맛보았다"):
+        assert np.allclose(restored.similarities(text), index.similarities(text))
+    assert restored.clue_negations == index.clue_negations
+
+
+def test_investigate_answers_clue_hits_and_duplicates_locally(scripted_game, monkeypatch):
+    game, backend = scripted_game
+    monkeypatch.setattr(game_logic, "SIMILARITY_SHORTCUT_ENABLED", True)
+
+    assert game.investigate("남자는 과거에 조난을 당한 적이 있었다", "s1").endswith(game.current_episode.clues[0])
+    assert game.investigate("남자는 과거에 조난을 당한 적이 있었어", "s1") == ALREADY_FOUND
+    assert backend.calls == []
+    assert game.question_count == 2
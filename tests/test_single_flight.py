@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from single_flight import CoalescedCallTimeout, SingleFlight
+
+
+def test_followers_share_leader_result():
+    flights = SingleFlight()
+    flight, is_leader = flights.begin("k")
+    assert is_leader
+    results = []
+
+    def follow():
+        shared, follower_is_leader = flights.begin("k")
+        assert not follower_is_leader
+        results.append(flights.wait(shared, timeout=5))
+
+    workers = [threading.Thread(target=follow) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    deadline = time.monotonic() + 5
+    while flight.waiters < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    flights.finish("k", flight, result="verdict")
+    for worker in workers:
+        worker.join(5)
+
+    assert results == ["verdict"] * 3
+    assert flights.get_stats() == {"leaders": 1, "shared": 3, "timeouts": 0, "cancelled": 0, "in_flight": 0}
+
+
+def test_leader_error_is_raised_to_followers():
+    flights = SingleFlight()
+    flight, _ = flights.begin("k")
+    shared, is_leader = flights.begin("k")
+    assert not is_leader
+
+    error = ValueError("upstream down")
+    flights.finish("k", flight, error=error)
+    with pytest.raises(ValueError) as raised:
+        flights.wait(shared, timeout=1)
+    assert raised.value is error
+    assert flights.get_stats()["shared"] == 1
+
+
+def test_leader_cancel_lets_followers_retry():
+    flights = SingleFlight()
+    flight, _ = flights.begin("k")
+    shared, _ = flights.begin("k")
+
+    # GeneratorExit 등 Exception이 아닌 중단은 결과를 공유하지 않음
+    flights.finish("k", flight, error=GeneratorExit())
+    assert flights.wait(shared, timeout=1) is None
+    assert flights.get_stats()["cancelled"] == 1
+
+    # 끝난 호출은 치워졌으므로 다시 시도하는 쪽이 새 리더가 됨
+    _, is_leader = flights.begin("k")
+    assert is_leader
+
+
+def test_wait_timeout():
+    flights = SingleFlight()
+    flight, _ = flights.begin("k")
+    shared, _ = flights.begin("k")
+    with pytest.raises(CoalescedCallTimeout):
+        flights.wait(shared, timeout=0.01)
+    assert flights.get_stats()["timeouts"] == 1
+    flights.finish("k", flight, result="late")
+    assert flights.get_stats()["in_flight"] == 0
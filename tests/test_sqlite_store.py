@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from sqlite_store import open_database
+
+
+def test_same_path_shares_one_connection(tmp_path):
+    db_path = str(tmp_path / "nested" / "shared.db")
+    database = open_database(db_path)
+    assert open_database(str(tmp_path / "nested" / ".." / "nested" / "shared.db")) is database
+    assert database.fetchone("PRAGMA journal_mode")[0] == "wal"
+
+
+def test_connection_is_reused_from_other_threads(tmp_path):
+    # 재실행마다 새 스레드가 써도 같은 연결을 씀 (check_same_thread 오류 없음)
+    database = open_database(str(tmp_path / "threads.db"))
+    database.execute("CREATE TABLE items (value INTEGER)")
+    workers = [
+        threading.Thread(target=database.execute, args=("INSERT INTO items VALUES (?)", (i,)))
+        for i in range(8)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(5)
+    assert database.fetchone("SELECT COUNT(*) FROM items")[0] == 8
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    database = open_database(str(tmp_path / "tx.db"))
+    database.execute("CREATE TABLE items (value INTEGER)")
+    with database.transaction() as conn:
+        conn.execute("INSERT INTO items VALUES (1)")
+    with pytest.raises(RuntimeError):
+        with database.transaction() as conn:
+            conn.execute("INSERT INTO items VALUES (2)")
+            raise RuntimeError("중단")
+    assert database.fetchall("SELECT value FROM items") == [(1,)]
+    assert database.execute("DELETE FROM items") == 1
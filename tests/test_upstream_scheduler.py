@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+import upstream_scheduler
+from upstream_scheduler import UpstreamQueueTimeout, UpstreamScheduler
+
+
+class _Stop(BaseException):
+    """재실행(StopException)처럼 대기 중인 스레드를 중단시키는 예외"""
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("조건이 제한 시간 안에 충족되지 않음")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def fast_poll(monkeypatch):
+    """대기 중인 스레드가 순번/토큰 예산을 자주 다시 확인하도록 폴링 간격을 줄임"""
+    monkeypatch.setattr(upstream_scheduler, "POSITION_POLL_SECONDS", 0.01)
+
+
+def test_round_robin_order_matches_position(fast_poll):
+    scheduler = UpstreamScheduler(max_concurrent=1, tokens_per_minute=0, queue_timeout_seconds=5)
+    positions = {}
+    granted = []
+
+    def request(name, session_id):
+        with scheduler.position_listener(lambda position: positions.__setitem__(name, position)):
+            with scheduler.slot(session_id, 0):
+                granted.append(name)
+
+    # 세션 a가 몰아 보내도 b, c는 한 바퀴 안에 차례가 옴
+    order = [("a1", "a"), ("a2", "a"), ("b1", "b"), ("a3", "a"), ("c1", "c"), ("c2", "c")]
+    expected = ["a1", "b1", "c1", "a2", "c2", "a3"]
+    workers = []
+    with scheduler.slot("holder", 0):
+        for depth, (name, session_id) in enumerate(order, start=1):
+            worker = threading.Thread(target=request, args=(name, session_id))
+            worker.start()
+            workers.append(worker)
+            _wait_until(lambda: scheduler.get_stats()["queue_depth"] == depth)
+        _wait_until(lambda: positions == {name: index for index, name in enumerate(expected, start=1)})
+        assert scheduler.get_stats()["waiting_sessions"] == 3
+    for worker in workers:
+        worker.join(5)
+
+    assert granted == expected
+    stats = scheduler.get_stats()
+    assert stats["queued"] == 6
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+
+
+def test_timeout_removes_ticket_and_keeps_running_slot():
+    scheduler = UpstreamScheduler(max_concurrent=1, tokens_per_minute=0, queue_timeout_seconds=0.05)
+    with scheduler.slot("a", 0):
+        with pytest.raises(UpstreamQueueTimeout):
+            with scheduler.slot("b", 0):
+                pass
+        stats = scheduler.get_stats()
+        assert stats["timeouts"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["waiting_sessions"] == 0
+        assert stats["in_flight"] == 1
+    assert scheduler.get_stats()["in_flight"] == 0
+
+
+def test_cancel_while_waiting_removes_ticket():
+    scheduler = UpstreamScheduler(max_concurrent=1, tokens_per_minute=0, queue_timeout_seconds=5)
+
+    def stop(position):
+        raise _Stop()
+
+    with scheduler.slot("a", 0):
+        with scheduler.position_listener(stop):
+            with pytest.raises(_Stop):
+                with scheduler.slot("b", 0):
+                    pass
+        stats = scheduler.get_stats()
+        assert stats["cancelled"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["waiting_sessions"] == 0
+
+    # 중단된 대기표가 남아 있지 않으므로 다음 요청은 바로 차례를 받음
+    with scheduler.slot("c", 0):
+        pass
+    assert scheduler.get_stats()["immediate"] == 2
+
+
+def test_waiter_is_granted_when_slot_is_released():
+    scheduler = UpstreamScheduler(max_concurrent=1, tokens_per_minute=0, queue_timeout_seconds=5)
+    positions = []
+    entered = threading.Event()
+
+    def wait_for_slot():
+        with scheduler.position_listener(positions.append):
+            with scheduler.slot("b", 0):
+                entered.set()
+
+    with scheduler.slot("a", 0):
+        worker = threading.Thread(target=wait_for_slot)
+        worker.start()
+        assert not entered.wait(0.1)
+    worker.join(5)
+    assert entered.is_set()
+    assert positions == [1]
+    assert scheduler.get_stats()["queued"] == 1
+
+
+def test_token_budget_holds_requests_until_window_passes(fast_poll, monkeypatch):
+    monkeypatch.setattr(upstream_scheduler, "TOKEN_WINDOW_SECONDS", 0.2)
+    scheduler = UpstreamScheduler(max_concurrent=10, tokens_per_minute=100, queue_timeout_seconds=0.05)
+    with scheduler.slot("a", 60):
+        pass
+    with pytest.raises(UpstreamQueueTimeout):
+        with scheduler.slot("b", 60):
+            pass
+
+    # 집계 구간이 지난 예약은 예산에서 빠지므로 기다리던 요청이 차례를 받음
+    scheduler.queue_timeout_seconds = 5
+    started = time.monotonic()
+    with scheduler.slot("b", 60):
+        assert scheduler.get_stats()["tokens_last_minute"] == 60
+    assert time.monotonic() - started < 1
+    assert scheduler.get_stats()["queued"] == 1
+
+
+def test_oversized_request_runs_when_window_is_empty():
+    scheduler = UpstreamScheduler(max_concurrent=10, tokens_per_minute=100, queue_timeout_seconds=0.05)
+    with scheduler.slot("a", 500):
+        pass
+    assert scheduler.get_stats()["immediate"] == 1
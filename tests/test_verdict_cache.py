@@ -0,0 +1,61 @@
+import time
+
+from episodes import get_episode
+from verdict_cache import VerdictCache, normalize_input
+
+EPISODE = get_episode("바다거북수프")
+
+
+def test_question_and_answer_attempt_do_not_share_key():
+    # 같은 문장이라도 질문("?")과 정답 시도는 판정이 다르므로 키가 달라야 함
+    question = VerdictCache.make_key(EPISODE, "남자는 인육을 먹었다?", set())
+    attempt = VerdictCache.make_key(EPISODE, "남자는 인육을 먹었다", set())
+    assert question != attempt
+
+
+def test_equivalent_inputs_share_key():
+    key = VerdictCache.make_key(EPISODE, "남자는 웃었나요?", set())
+    assert VerdictCache.make_key(EPISODE, "  남자는   웃었나요 ?! ", set()) == key
+    assert VerdictCache.make_key(EPISODE, "남자는 웃었나요", set()) == key
+    assert VerdictCache.make_key(EPISODE, "남자는 인육을 먹었다.", set()) == \
+        VerdictCache.make_key(EPISODE, "남자는 인육을 먹었다", set())
+
+
+def test_normalize_input():
+    assert normalize_input("ABC  Def~") == "abc def"
+    assert normalize_input("남자는 인육을 먹었다??") == "남자는 인육을 먹었다?"
+
+
+def test_found_clues_change_key():
+    empty = VerdictCache.make_key(EPISODE, "남자는 조난을 당했다", set())
+    found = VerdictCache.make_key(EPISODE, "남자는 조난을 당했다", {EPISODE.clues[0]})
+    assert empty != found
+
+
+def test_lru_eviction():
+    cache = VerdictCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # a를 최근 사용으로
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    cache = VerdictCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", "1")
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.purge_expired() == 0  # get에서 이미 지움
+
+
+def test_disk_tier_survives_memory_clear(tmp_path):
+    cache = VerdictCache(max_entries=10, ttl_seconds=60, db_path=str(tmp_path / "verdicts.db"))
+    cache.set("a", "1")
+    cache.clear()
+    assert cache.get("a") == "1"
+    other = VerdictCache(max_entries=10, ttl_seconds=60, db_path=str(tmp_path / "verdicts.db"))
+    assert other.get("a") == "1"
+    assert other.get_stats()["disk_hits"] == 1
@@ -0,0 +1,90 @@
+import pytest
+
+from verdicts import (
+    ALREADY_FOUND, CLUE_FOUND, MODEL_VERDICTS, VERDICT_SCHEMA, Verdict,
+    parse_batch_verdicts, parse_verdict, partial_verdict, response_format,
+)
+
+CLUES = ["첫 번째 단서", "두 번째 단서", "세 번째 단서"]
+
+
+def test_parse_verdict_drops_out_of_range_and_repeated_clue_ids():
+    verdict = parse_verdict('{"verdict":"clue_found","importance":"high","matched_clue_ids":[2,2,0,9,"1",3]}', 3)
+    assert verdict.verdict == "clue_found"
+    assert verdict.importance == "high"
+    assert verdict.matched_clue_ids == (2, 3)
+
+
+@pytest.mark.parametrize("text", [
+    "네.",
+    '{"verdict":"maybe","importance":"normal","matched_clue_ids":[]}',
+    '{"verdict":"clue_found","importance":"normal","matched_clue_ids":[7]}',
+    "[]",
+])
+def test_parse_verdict_rejects_malformed_output(text):
+    with pytest.raises(ValueError):
+        parse_verdict(text, 3)
+
+
+def test_unknown_importance_falls_back_to_normal():
+    assert parse_verdict('{"verdict":"yes","importance":"urgent","matched_clue_ids":[]}', 3).importance == "normal"
+
+
+def test_render_uses_fixed_phrases():
+    assert Verdict("yes").render(CLUES) == "네."
+    assert Verdict("no", "high").render(CLUES) == "아니오, 아주 중요한 질문입니다."
+    assert Verdict("irrelevant", "high").render(CLUES) == "아니오, 중요하지 않습니다."
+    assert Verdict("clue_found", "normal", [3, 1]).render(CLUES) == f"{CLUE_FOUND}\n세 번째 단서\n첫 번째 단서"
+
+
+def test_round_trip_through_json():
+    verdict = Verdict("clue_found", "high", [1, 2])
+    restored = parse_verdict(verdict.to_json(), 3)
+    assert restored.to_dict() == verdict.to_dict()
+
+
+def test_model_cannot_answer_already_found():
+    # 발견 상태는 게임 로직만 알기 때문에 스키마에서 제외
+    assert "already_found" not in MODEL_VERDICTS
+    assert "already_found" not in VERDICT_SCHEMA["properties"]["verdict"]["enum"]
+    assert Verdict("already_found").render(CLUES) == ALREADY_FOUND
+
+
+def test_response_format_selects_schema():
+    assert response_format()["json_schema"]["name"] == "verdict"
+    batch = response_format(batch=True)["json_schema"]
+    assert batch["strict"] is True
+    assert batch["schema"]["properties"]["items"]["items"] is VERDICT_SCHEMA
+
+
+def test_parse_batch_verdicts_keeps_item_order_and_marks_bad_items():
+    text = ('{"items":[{"verdict":"yes","importance":"normal","matched_clue_ids":[]},'
+            '{"verdict":"???","importance":"normal","matched_clue_ids":[]},'
+            '{"verdict":"clue_found","importance":"normal","matched_clue_ids":[2]},'
+            '{"verdict":"no","importance":"normal","matched_clue_ids":[]}]}')
+    verdicts = parse_batch_verdicts(text, 4, 3)
+    assert [verdict and verdict.verdict for verdict in verdicts] == ["yes", None, "clue_found", "no"]
+
+    # 항목이 모자라면 나머지는 None, 넘치면 버림
+    assert parse_batch_verdicts(text, 6, 3)[4:] == [None, None]
+    assert len(parse_batch_verdicts(text, 2, 3)) == 2
+
+
+def test_parse_batch_verdicts_rejects_non_batch_output():
+    with pytest.raises(ValueError):
+        parse_batch_verdicts('{"verdict":"yes","importance":"normal","matched_clue_ids":[]}', 2, 3)
+    with pytest.raises(ValueError):
+        parse_batch_verdicts("네.", 2, 3)
+
+
+def test_partial_verdict_needs_verdict_and_importance():
+    assert partial_verdict('{"verdict":"no"') is None
+    assert partial_verdict('{"verdict":"no","importance":"hi') is None
+    verdict = partial_verdict('{"verdict":"no","importance":"high",')
+    assert verdict.verdict == "no" and verdict.importance == "high"
+    assert verdict.matched_clue_ids == ()
+
+
+def test_partial_verdict_waits_for_clue_ids():
+    assert partial_verdict('{"verdict":"clue_found","importance":"normal",') is None
+    assert partial_verdict('{"verdict":"unknown","importance":"normal",') is None
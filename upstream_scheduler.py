@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from config import UPSTREAM_MAX_CONCURRENT, UPSTREAM_TOKENS_PER_MINUTE, UPSTREAM_QUEUE_TIMEOUT_SECONDS
+from metrics import UPSTREAM_QUEUE_DEPTH, UPSTREAM_IN_FLIGHT, UPSTREAM_TOKENS_LAST_MINUTE, UPSTREAM_QUEUE_WAIT_SECONDS
+
+TOKEN_WINDOW_SECONDS = 60.0  # 토큰 예산 집계 구간
+POSITION_POLL_SECONDS = 1.0  # 대기 중 순번 갱신/토큰 예산 재확인 간격
+
+
+class UpstreamQueueTimeout(TimeoutError):
+    """AI 호출 차례를 제한 시간 안에 받지 못함"""
+
+
+class _Ticket:
+    """AI 호출 1건의 대기표"""
+    __slots__ = ("session_id", "tokens", "granted")
+
+    def __init__(self, session_id, tokens):
+        self.session_id = session_id
+        self.tokens = tokens
+        self.granted = False
+
+
+class UpstreamScheduler:
+    """프로세스 전역 AI 호출 스케줄러 - 동시 호출 수 상한, 분당 토큰 예산, 세션별 라운드 로빈 대기열
+
+    빈자리와 예산이 있으면 바로 호출하고, 없으면 세션마다 따로 줄을 세워 세션 순서대로 한 건씩 차례를 준다.
+    한 세션이 요청을 몰아 보내도 다른 세션은 한 바퀴 안에 차례가 온다.
+    토큰 예산은 호출 전에 추정치(프롬프트 + 최대 출력 토큰)로 예약한다.
+    """
+
+    def __init__(self, max_concurrent=UPSTREAM_MAX_CONCURRENT, tokens_per_minute=UPSTREAM_TOKENS_PER_MINUTE,
+                 queue_timeout_seconds=UPSTREAM_QUEUE_TIMEOUT_SECONDS):
+        self.max_concurrent = max_concurrent
+        self.tokens_per_minute = tokens_per_minute
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._cond = threading.Condition()
+        self._running = 0
+        self._queues = {}  # 세션 ID -> 대기표 deque
+        self._rotation = deque()  # 대기 중인 세션 순서 (맨 앞 세션이 다음 차례)
+        self._window = deque()  # 최근 예약 [시각, 토큰 수]
+        self._local = threading.local()
+        self.stats = {"immediate": 0, "queued": 0, "timeouts": 0, "cancelled": 0}
+
+    @contextmanager
+    def position_listener(self, callback):
+        """이 스레드가 차례를 기다리는 동안 순번(1부터)이 바뀔 때마다 callback 호출 (대기 안내 표시용)"""
+        previous = getattr(self._local, "listener", None)
+        self._local.listener = callback
+        try:
+            yield
+        finally:
+            self._local.listener = previous
+
+    @contextmanager
+    def slot(self, session_id, tokens):
+        """차례를 받아 AI 호출 1회 실행 (제한 시간 안에 차례가 오지 않으면 UpstreamQueueTimeout)"""
+        self._acquire(session_id, tokens)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._dispatch()
+
+    def _acquire(self, session_id, tokens):
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.queue_timeout_seconds
+        ticket = _Ticket(session_id, tokens)
+        with self._cond:
+            queue = self._queues.get(session_id)
+            if queue is None:
+                queue = self._queues[session_id] = deque()
+                self._rotation.append(session_id)
+            queue.append(ticket)
+            self._dispatch()
+            if ticket.granted:
+                self.stats["immediate"] += 1
+        if ticket.granted:
+            UPSTREAM_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - started, outcome="immediate")
+            return
+
+        listener = getattr(self._local, "listener", None)
+        shown = None
+        try:
+            while True:
+                with self._cond:
+                    # 토큰 창이 지나 예산이 생겼을 수 있으므로 깨어날 때마다 다시 배정
+                    self._dispatch()
+                    if ticket.granted:
+                        break
+                    position = self._position(ticket)
+                if listener is not None and position != shown:
+                    shown = position
+                    listener(position)
+                with self._cond:
+                    if ticket.granted:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise UpstreamQueueTimeout(f"AI 호출 차례를 {self.queue_timeout_seconds:g}초 안에 받지 못했습니다.")
+                    self._cond.wait(min(remaining, POSITION_POLL_SECONDS))
+        except BaseException as e:
+            # 시간 초과나 재실행(StopException 등)으로 중단되면 대기표를 치우고, 이미 받은 차례는 반납
+            with self._cond:
+                if ticket.granted:
+                    self._running -= 1
+                else:
+                    self._remove(ticket)
+                self._dispatch()
+                outcome = "timeout" if isinstance(e, UpstreamQueueTimeout) else "cancelled"
+                self.stats["timeouts" if outcome == "timeout" else "cancelled"] += 1
+            UPSTREAM_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+            raise
+        with self._cond:
+            self.stats["queued"] += 1
+        UPSTREAM_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - started, outcome="queued")
+
+    def _tokens_in_window(self, now):
+        while self._window and now - self._window[0][0] >= TOKEN_WINDOW_SECONDS:
+            self._window.popleft()
+        return sum(tokens for _, tokens in self._window)
+
+    def _has_budget(self, tokens, now):
+        if not self.tokens_per_minute:
+            return True
+        # 예산보다 큰 요청 하나는 창이 비었을 때 보냄 (영원히 막히지 않도록)
+        return not self._window or self._tokens_in_window(now) + tokens <= self.tokens_per_minute
+
+    def _dispatch(self):
+        """빈자리와 예산이 허락하는 만큼 세션 순서대로 차례 배정 (잠금을 잡은 상태에서 호출)"""
+        now = time.monotonic()
+        granted = False
+        while self._rotation and self._running < self.max_concurrent:
+            session_id = self._rotation[0]
+            queue = self._queues[session_id]
+            if not self._has_budget(queue[0].tokens, now):
+                break  # 순서를 지키기 위해 맨 앞 요청이 예산을 기다리는 동안 뒤 요청도 기다림
+            self._rotation.popleft()
+            ticket = queue.popleft()
+            ticket.granted = True
+            self._running += 1
+            if self.tokens_per_minute:
+                self._window.append((now, ticket.tokens))
+            if queue:
+                self._rotation.append(session_id)
+            else:
+                del self._queues[session_id]
+            granted = True
+        if granted:
+            self._cond.notify_all()
+        UPSTREAM_QUEUE_DEPTH.set(sum(len(queue) for queue in self._queues.values()))
+        UPSTREAM_IN_FLIGHT.set(self._running)
+        UPSTREAM_TOKENS_LAST_MINUTE.set(self._tokens_in_window(now))
+
+    def _remove(self, ticket):
+        queue = self._queues.get(ticket.session_id)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[ticket.session_id]
+            self._rotation.remove(ticket.session_id)
+
+    def _position(self, ticket):
+        """대기 중인 요청의 순번 (1부터) - 세션마다 한 건씩 돌아가며 배정하는 순서 기준"""
+        rank = self._queues[ticket.session_id].index(ticket)
+        position = 1
+        before = True
+        for session_id in self._rotation:
+            length = len(self._queues[session_id])
+            if session_id == ticket.session_id:
+                before = False
+            position += min(length, rank)
+            if before and length > rank:
+                position += 1
+        return position
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {
+                **self.stats,
+                "in_flight": self._running,
+                "queue_depth": sum(len(queue) for queue in self._queues.values()),
+                "waiting_sessions": len(self._rotation),
+                "tokens_last_minute": self._tokens_in_window(time.monotonic()),
+                "max_concurrent": self.max_concurrent,
+                "tokens_per_minute": self.tokens_per_minute,
+            }
+
+
+# 프로세스 전역 AI 호출 스케줄러 (모든 세션이 공유)
+upstream_scheduler = UpstreamScheduler()
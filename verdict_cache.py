@@ -0,0 +1,166 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from config import (
+    VERDICT_CACHE_MAX_ENTRIES,
+    VERDICT_CACHE_TTL_SECONDS,
+    VERDICT_CACHE_DB_PATH,
+)
+from model_router import is_question
+from sqlite_store import open_database
+
+# 캐시 키 정규화 시 입력 끝에서 제거할 문장 부호
+_TRAILING_PUNCTUATION = "?!.~ "
+
+
+def normalize_input(user_input: str) -> str:
+    """캐시 키용 입력 정규화 (유니코드/대소문자/공백/끝 문장부호)
+
+    끝 문장부호는 지우되, 질문이면 "?" 하나를 남겨 같은 문장의 정답 시도와 키가 겹치지 않게 한다
+    ("남자는 인육을 먹었다?"는 질문, "남자는 인육을 먹었다"는 정답 시도로 판정이 다름).
+    """
+    text = unicodedata.normalize("NFC", user_input).lower()
+    text = " ".join(text.split()).rstrip(_TRAILING_PUNCTUATION)
+    return text + "?" if is_question(user_input) else text
+
+
+class VerdictCache:
+    """프로세스 전역 판정 캐시 (LRU + TTL, 선택적 SQLite 디스크 계층)"""
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 3600, db_path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._entries = OrderedDict()  # key -> (저장 시각, 응답)
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str):
+        """디스크 계층 초기화 (여러 서버 프로세스가 공유할 수 있도록 WAL 모드)"""
+        self._db = open_database(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(episode, user_input: str, found_clues) -> str:
+        """(시스템 프롬프트, 정규화된 입력, 발견한 단서 상태)로 캐시 키 생성
+
+        에피소드 내용이나 판정 규칙/출력 형식이 바뀌면 프롬프트 해시가 달라지므로 기존 디스크 캐시 항목과 겹치지 않는다.
+        """
+        found_indices = [str(i) for i, clue in enumerate(episode.clues) if clue in found_clues]
+        raw = "\x1f".join([episode.prompt_hash, normalize_input(user_input), ",".join(found_indices)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """캐시된 응답 반환 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, response = entry
+                if now - created_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return response
+                del self._entries[key]
+
+        if self._db is not None:
+            row = self._db_get(key)
+            if row is not None and now - row[1] < self.ttl_seconds:
+                with self._lock:
+                    self._store_memory(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                return row[0]
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, response: str):
+        """응답 저장 (메모리 + 디스크)"""
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, response, now)
+            self.stats["stores"] += 1
+
+        if self._db is not None:
+            self._db_set(key, response, now)
+
+    def _store_memory(self, key: str, response: str, created_at: float):
+        self._entries[key] = (created_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _db_get(self, key: str):
+        try:
+            return self._db.fetchone("SELECT response, created_at FROM verdicts WHERE key = ?", (key,))
+        except sqlite3.Error:
+            return None
+
+    def _db_set(self, key: str, response: str, created_at: float):
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO verdicts (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, created_at),
+            )
+        except sqlite3.Error:
+            pass  # 디스크 캐시 실패는 게임 진행에 영향을 주지 않음
+
+    def purge_expired(self) -> int:
+        """만료된 항목 삭제 후 삭제 개수 반환"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [key for key, (created_at, _) in self._entries.items() if created_at <= cutoff]
+            for key in expired:
+                del self._entries[key]
+        removed = len(expired)
+
+        if self._db is not None:
+            try:
+                removed += self._db.execute("DELETE FROM verdicts WHERE created_at <= ?", (cutoff,))
+            except sqlite3.Error:
+                pass
+        return removed
+
+    def clear(self):
+        """메모리 캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """캐시 통계 반환"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["persistent"] = self._db is not None
+        return stats
+
+
+# 전역 판정 캐시 인스턴스 (모든 Streamlit 세션이 공유)
+verdict_cache = VerdictCache(
+    max_entries=VERDICT_CACHE_MAX_ENTRIES,
+    ttl_seconds=VERDICT_CACHE_TTL_SECONDS,
+    db_path=VERDICT_CACHE_DB_PATH,
+)
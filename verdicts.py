@@ -0,0 +1,154 @@
+import json
+import re
+
+# 모델은 판정 코드(JSON)만 출력하고, 화면에 보이는 고정 문구는 여기서 렌더링한다.
+
+CLUE_FOUND = "단서를 찾았습니다!"
+ALREADY_FOUND = "이미 찾은 단서입니다."
+
+# 판정 코드 -> 고정 문구
+VERDICT_PHRASES = {
+    "yes": "네.",
+    "no": "아니오.",
+    "likely": "그럴 가능성이 높습니다.",
+    "unlikely": "아닐 가능성이 높습니다.",
+    "irrelevant": "아니오, 중요하지 않습니다.",
+    "not_yes_no": "예/아니오로 대답할 수 없습니다.",
+    "ambiguous": "애매합니다.",
+    "clue_found": CLUE_FOUND,
+    "already_found": ALREADY_FOUND,
+    "almost": "거의 찾았어요!",
+    "wrong": "추리에 실패했습니다.",
+}
+
+# importance가 high인 예/아니오 판정
+IMPORTANT_PHRASES = {
+    "yes": "네, 아주 중요한 질문입니다.",
+    "no": "아니오, 아주 중요한 질문입니다.",
+}
+
+IMPORTANCE_LEVELS = ("normal", "high")
+
+# 모델이 출력할 수 있는 판정 코드 (모델은 발견 상태를 모르므로 중복 단서 판정은 게임 로직이 내림)
+MODEL_VERDICTS = [code for code in VERDICT_PHRASES if code != "already_found"]
+
+# 단일 판정 스키마 (strict 모드는 속성 순서대로 생성하므로 verdict가 가장 먼저 도착)
+VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "string", "enum": MODEL_VERDICTS},
+        "importance": {"type": "string", "enum": list(IMPORTANCE_LEVELS)},
+        "matched_clue_ids": {"type": "array", "items": {"type": "integer"}},
+    },
+    "required": ["verdict", "importance", "matched_clue_ids"],
+    "additionalProperties": False,
+}
+
+# 묶음 판정 스키마 (입력 항목 순서대로)
+BATCH_VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {"items": {"type": "array", "items": VERDICT_SCHEMA}},
+    "required": ["items"],
+    "additionalProperties": False,
+}
+
+# 스트리밍 중 판정 코드와 중요도가 도착했는지 확인
+_PARTIAL_VERDICT = re.compile(r'"verdict"\s*:\s*"(\w+)"\s*,\s*"importance"\s*:\s*"(\w+)"')
+
+
+def response_format(batch: bool = False) -> dict:
+    """chat.completions response_format (strict JSON 스키마)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "batch_verdict" if batch else "verdict",
+            "strict": True,
+            "schema": BATCH_VERDICT_SCHEMA if batch else VERDICT_SCHEMA,
+        },
+    }
+
+
+class Verdict:
+    """구조화된 판정 (matched_clue_ids는 시스템 프롬프트의 정답 번호, 1부터 시작)"""
+    __slots__ = ("verdict", "importance", "matched_clue_ids")
+
+    def __init__(self, verdict, importance="normal", matched_clue_ids=()):
+        self.verdict = verdict
+        self.importance = importance
+        self.matched_clue_ids = tuple(matched_clue_ids)
+
+    @classmethod
+    def from_dict(cls, data, clue_count: int) -> "Verdict":
+        """스키마 검증 후 생성 (범위를 벗어난 단서 번호는 버림)"""
+        if not isinstance(data, dict) or data.get("verdict") not in VERDICT_PHRASES:
+            raise ValueError(f"알 수 없는 판정입니다: {data!r}")
+        importance = data.get("importance", "normal")
+        if importance not in IMPORTANCE_LEVELS:
+            importance = "normal"
+        clue_ids = []
+        for clue_id in data.get("matched_clue_ids") or ():
+            if isinstance(clue_id, int) and 1 <= clue_id <= clue_count and clue_id not in clue_ids:
+                clue_ids.append(clue_id)
+        if data["verdict"] == "clue_found" and not clue_ids:
+            raise ValueError("단서 번호 없이 단서 발견 판정이 왔습니다.")
+        return cls(data["verdict"], importance, clue_ids)
+
+    def to_dict(self) -> dict:
+        return {
+            "verdict": self.verdict,
+            "importance": self.importance,
+            "matched_clue_ids": list(self.matched_clue_ids),
+        }
+
+    def to_json(self) -> str:
+        """캐시 저장용 압축 JSON"""
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def phrase(self) -> str:
+        """고정 판정 문구"""
+        if self.importance == "high" and self.verdict in IMPORTANT_PHRASES:
+            return IMPORTANT_PHRASES[self.verdict]
+        return VERDICT_PHRASES[self.verdict]
+
+    def render(self, clues) -> str:
+        """화면에 표시할 응답 (단서 발견이면 일치한 단서 원문을 줄바꿈으로 나열)"""
+        if self.verdict == "clue_found":
+            return "\n".join([CLUE_FOUND] + [clues[clue_id - 1] for clue_id in self.matched_clue_ids])
+        return self.phrase()
+
+
+def parse_verdict(text: str, clue_count: int) -> Verdict:
+    """모델 출력(JSON)을 판정으로 변환 (형식이 맞지 않으면 ValueError)"""
+    try:
+        data = json.loads(text)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"판정 JSON을 해석할 수 없습니다: {e}") from e
+    return Verdict.from_dict(data, clue_count)
+
+
+def parse_batch_verdicts(text: str, count: int, clue_count: int) -> list[Verdict | None]:
+    """묶음 출력을 항목별 판정으로 변환 (빠지거나 잘못된 항목은 None)"""
+    try:
+        items = json.loads(text)["items"]
+    except (TypeError, KeyError, json.JSONDecodeError) as e:
+        raise ValueError(f"묶음 판정 JSON을 해석할 수 없습니다: {e}") from e
+
+    verdicts = [None] * count
+    for index, item in enumerate(items[:count]):
+        try:
+            verdicts[index] = Verdict.from_dict(item, clue_count)
+        except ValueError:
+            pass
+    return verdicts
+
+
+def partial_verdict(partial_text: str) -> Verdict | None:
+    """스트리밍 중인 JSON에서 판정을 먼저 확정할 수 있으면 반환 (단서 번호가 필요한 판정은 제외)
+
+    단서 발견이 아닌 판정은 matched_clue_ids가 빈 목록이므로 코드와 중요도만으로 완성된다.
+    """
+    match = _PARTIAL_VERDICT.search(partial_text)
+    if match is None or match.group(1) not in VERDICT_PHRASES or match.group(1) in ("clue_found", "already_found"):
+        return None
+    importance = match.group(2) if match.group(2) in IMPORTANCE_LEVELS else "normal"
+    return Verdict(match.group(1), importance)